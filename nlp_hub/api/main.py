@@ -9,6 +9,7 @@ from typing import List, Optional
 from ..config.settings import settings
 from ..chatbot.manager import ChatbotManager
 from ..utils.logger import get_logger
+from ..utils.metrics import metrics
 
 
 logger = get_logger(__name__, level=settings.log_level)
@@ -28,6 +29,8 @@ class ChatResponse(BaseModel):
     response: str
     intent: Optional[str] = None
     entities: dict = {}
+    skipped_stages: List[str] = []
+    degradations: List[str] = []
 
 
 class HealthResponse(BaseModel):
@@ -50,6 +53,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down NLP Hub API")
+    chatbot_manager.close()
 
 
 def create_app() -> FastAPI:
@@ -76,6 +80,12 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         return HealthResponse(status="healthy", version="1.0.0")
     
+    # Metrics endpoint
+    @app.get("/metrics")
+    async def get_metrics():
+        """In-process metrics snapshot."""
+        return metrics.snapshot()
+    
     # Chat endpoint
     @app.post("/chat", response_model=ChatResponse)
     async def chat(request: ChatRequest):
@@ -97,6 +107,8 @@ def create_app() -> FastAPI:
                 response=response,
                 intent=context.intent if context else None,
                 entities=context.entities if context else {},
+                skipped_stages=context.metadata.get("skipped_stages", []) if context else [],
+                degradations=context.metadata.get("degradations", []) if context else [],
             )
         except Exception as e:
             logger.error(f"Chat endpoint error: {str(e)}")
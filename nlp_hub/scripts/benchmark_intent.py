@@ -0,0 +1,104 @@
+"""
+Compare intent classifiers on accuracy and latency.
+
+The evaluation set is a JSON list of {"text": ..., "intent": ...} objects;
+a small built-in set is used when none is given.
+
+Example:
+    python scripts/benchmark_intent.py --classifiers embedding transformer --data eval.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.intent import get_intent_classifier
+
+
+SAMPLE_DATA = [
+    {"text": "Hi, good evening!", "intent": "greeting"},
+    {"text": "Hello there, nice to meet you", "intent": "greeting"},
+    {"text": "What are your opening hours?", "intent": "question"},
+    {"text": "How do I reset my password?", "intent": "question"},
+    {"text": "Can you send me a copy of the invoice?", "intent": "request"},
+    {"text": "Please book a table for two", "intent": "request"},
+    {"text": "I moved to Lagos last year", "intent": "statement"},
+    {"text": "The package was damaged", "intent": "statement"},
+    {"text": "Delete my account", "intent": "command"},
+    {"text": "Turn on dark mode", "intent": "command"},
+]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def evaluate(classifier_type, data, batch_size):
+    """Measure accuracy, per-message latency and batch throughput."""
+    start = time.perf_counter()
+    classifier = get_intent_classifier(classifier_type)
+    load_time = time.perf_counter() - start
+    # Measure the model, not the prediction cache
+    classifier.cache_size = 0
+    classifier.clear_cache()
+    texts = [item["text"] for item in data]
+    
+    classifier.classify(texts[0])  # warm up
+    
+    latencies = []
+    correct = 0
+    for item in data:
+        start = time.perf_counter()
+        intent = classifier.classify(item["text"])
+        latencies.append(time.perf_counter() - start)
+        correct += intent.name == item["intent"]
+    
+    start = time.perf_counter()
+    classifier.batch_classify(texts, batch_size=batch_size)
+    batch_time = time.perf_counter() - start
+    
+    return {
+        "load_s": load_time,
+        "accuracy": correct / len(data),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "batch_per_s": len(texts) / batch_time if batch_time else float("inf"),
+    }
+
+
+def main():
+    """Run the intent benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark intent classifiers")
+    parser.add_argument("--classifiers", nargs="+", default=["embedding", "transformer"])
+    parser.add_argument("--data", help="JSON list of {text, intent} objects")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    
+    data = json.loads(Path(args.data).read_text(encoding="utf-8")) if args.data else SAMPLE_DATA
+    
+    print(
+        f"{'classifier':<12} {'load s':>8} {'accuracy':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'batch/s':>9}"
+    )
+    for classifier_type in args.classifiers:
+        try:
+            result = evaluate(classifier_type, data, args.batch_size)
+        except Exception as e:
+            print(f"{classifier_type:<12} failed: {e}")
+            continue
+        print(
+            f"{classifier_type:<12} {result['load_s']:>8.2f} {result['accuracy']:>9.2%} "
+            f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['batch_per_s']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure the memory footprint of live chatbot conversations.
+
+Example:
+    python scripts/benchmark_memory.py --conversations 10000 --turns 10
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.chatbot.manager import ChatContext, ChatMessage
+
+
+def build_conversations(count, turns, message_chars):
+    """Create conversations filled with alternating user/assistant turns."""
+    text = "x" * message_chars
+    conversations = {}
+    for i in range(count):
+        context = ChatContext(f"conv_{i}")
+        for _ in range(turns):
+            context.add_message(ChatMessage(role="user", content=text))
+            context.add_message(ChatMessage(role="assistant", content=text))
+        context.get_conversation_history()
+        conversations[context.conversation_id] = context
+    return conversations
+
+
+def main():
+    """Run the memory benchmark."""
+    parser = argparse.ArgumentParser(description="Measure per-conversation memory")
+    parser.add_argument("--conversations", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--message-chars", type=int, default=0,
+                        help="Message length (0 shares one empty string to isolate overhead)")
+    args = parser.parse_args()
+    
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    conversations = build_conversations(args.conversations, args.turns, args.message_chars)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    messages = sum(len(context.messages) for context in conversations.values())
+    
+    print(f"Conversations:      {len(conversations)}")
+    print(f"Messages retained:  {messages}")
+    print(f"Total allocated:    {total / 1024 / 1024:.1f} MiB")
+    print(f"Per conversation:   {total / len(conversations):.0f} bytes")
+    print(f"Per message:        {total / max(messages, 1):.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
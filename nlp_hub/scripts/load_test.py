@@ -0,0 +1,101 @@
+"""
+Offline load test of ChatbotManager against the local mock LLM server.
+
+Example:
+    python scripts/load_test.py --provider openai --conversations 50 --turns 3 --ttft 0.3
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings
+from src.llm.mock_server import MockLLMProfile, MockLLMServer
+
+
+def percentile(values, q):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description="Load test ChatbotManager with a mock LLM")
+    parser.add_argument("--provider", choices=["openai", "anthropic"], default="openai")
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    args = parser.parse_args()
+    
+    profile = MockLLMProfile(
+        time_to_first_token=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        max_concurrency=args.max_concurrency,
+        seed=0,
+    )
+    
+    with MockLLMServer(profile) as server:
+        settings.llm.base_url = f"{server.url}/v1" if args.provider == "openai" else server.url
+        settings.llm.api_key = settings.llm.api_key or "mock-key"
+        
+        from src.chatbot.manager import ChatbotManager
+        from src.llm.manager import get_llm_manager
+        
+        chatbot = ChatbotManager(llm_manager=get_llm_manager(args.provider))
+        latencies = []
+        errors = 0
+        
+        def run_conversation(index):
+            conversation_id = chatbot.create_conversation(f"load_{index}")
+            results = []
+            for turn in range(args.turns):
+                start = time.perf_counter()
+                try:
+                    chatbot.process_user_message(
+                        conversation_id,
+                        f"Question {turn} from conversation {index}: how does this work?",
+                        use_rag=False,
+                    )
+                    results.append(time.perf_counter() - start)
+                except Exception:
+                    results.append(None)
+            return results
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for results in executor.map(run_conversation, range(args.conversations)):
+                for latency in results:
+                    if latency is None:
+                        errors += 1
+                    else:
+                        latencies.append(latency)
+        elapsed = time.perf_counter() - start
+        
+        total = args.conversations * args.turns
+        print(f"Provider:     {args.provider} (mock at {server.url})")
+        print(f"Turns:        {total} ({errors} failed) in {elapsed:.2f}s")
+        print(f"Throughput:   {total / elapsed:.1f} turns/s")
+        if latencies:
+            print(
+                f"Latency (s):  p50={percentile(latencies, 50):.3f} "
+                f"p95={percentile(latencies, 95):.3f} p99={percentile(latencies, 99):.3f}"
+            )
+        print(f"Server stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Train the hashed n-gram linear intent model.
+
+Training data is a CSV file with `text` and `intent` columns or a JSONL
+file with one {"text": ..., "intent": ...} object per line. The trained
+model is written as an .npz artifact for the 'linear' intent classifier.
+
+Example:
+    python scripts/train_intent.py data/intents.csv --output models/intent_linear.npz
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings
+from src.intent.linear import LinearIntentModel, load_training_data
+
+
+def main():
+    """Train and save the model."""
+    parser = argparse.ArgumentParser(description="Train the linear intent model")
+    parser.add_argument("data", help="Training data (.csv or .jsonl)")
+    parser.add_argument("--output", default=settings.intent.linear_model_path)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--holdout", type=float, default=0.1,
+                        help="Fraction of examples held out to report accuracy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    texts, labels = load_training_data(args.data)
+    examples = list(zip(texts, labels))
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout)) if len(examples) > 1 else len(examples)
+    train, test = examples[:split], examples[split:]
+    
+    start = time.perf_counter()
+    model = LinearIntentModel.train(
+        [text for text, _ in train], [label for _, label in train],
+        n_features=args.n_features, epochs=args.epochs,
+        learning_rate=args.learning_rate, l2=args.l2, seed=args.seed,
+    )
+    print(f"Trained on {len(train)} examples in {time.perf_counter() - start:.2f}s")
+    print(f"Intents: {', '.join(model.classes)}")
+    
+    if test:
+        start = time.perf_counter()
+        probs = model.predict_proba([text for text, _ in test])
+        elapsed = time.perf_counter() - start
+        predicted = [model.classes[i] for i in probs.argmax(axis=1)]
+        correct = sum(guess == label for guess, (_, label) in zip(predicted, test))
+        print(f"Holdout accuracy: {correct / len(test):.3f} ({len(test)} examples)")
+        print(f"Batch latency:    {elapsed / len(test) * 1e6:.1f} us/message")
+    
+    output = Path(args.output).with_suffix(".npz")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    model.save(output)
+    print(f"Saved model to {output} ({output.stat().st_size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
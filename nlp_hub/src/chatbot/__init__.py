@@ -1,5 +1,29 @@
 """Chatbot module."""
 
-from .manager import ChatbotManager, ChatMessage, ChatContext
+from .manager import BatchTurnResult, ChatbotManager, ChatMessage, ChatContext
+from .prompt import PromptBuilder, Tokenizer, get_tokenizer
+from .templates import SystemPromptTemplate, get_system_prompt_template
+from .store import (
+    ConversationStore,
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+    TieredConversationStore,
+    get_conversation_store,
+)
 
-__all__ = ["ChatbotManager", "ChatMessage", "ChatContext"]
+__all__ = [
+    "ChatbotManager",
+    "ChatMessage",
+    "ChatContext",
+    "BatchTurnResult",
+    "PromptBuilder",
+    "Tokenizer",
+    "get_tokenizer",
+    "SystemPromptTemplate",
+    "get_system_prompt_template",
+    "ConversationStore",
+    "InMemoryConversationStore",
+    "SQLiteConversationStore",
+    "TieredConversationStore",
+    "get_conversation_store",
+]
@@ -0,0 +1,139 @@
+"""Turn-level answer cache for repeated first-turn questions."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from ..utils.logger import get_logger
+from ..utils.metrics import metrics
+from ..config.settings import settings
+from ..rag.retriever import RetrievalResult
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+CacheKey = Tuple[str, Optional[str], Tuple[Tuple[str, str], ...], Tuple[str, ...], str]
+
+
+def normalize_message(text: str) -> str:
+    """Normalize a message for cache lookup (case, whitespace, end punctuation)."""
+    return " ".join(text.lower().split()).rstrip("?!. ")
+
+
+class AnswerCache:
+    """
+    Cache of complete assistant answers for first turns.
+    
+    Entries are keyed on the normalized user message, detected intent,
+    extracted entities, retrieved document IDs and personality, so an answer is only reused
+    when the LLM would have seen the same inputs. Entries expire after
+    `ttl` seconds and the whole cache is dropped when the RAG corpus
+    version changes.
+    """
+    
+    def __init__(
+        self,
+        ttl: float = None,
+        max_entries: int = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize answer cache.
+        
+        Args:
+            ttl: Seconds an answer stays valid
+            max_entries: Maximum cached answers (least recently used evicted)
+            clock: Monotonic time source
+        """
+        self.ttl = settings.chatbot.answer_cache_ttl if ttl is None else ttl
+        self.max_entries = (
+            settings.chatbot.answer_cache_size if max_entries is None else max_entries
+        )
+        self.clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[str, float]]" = OrderedDict()
+        self._corpus_version = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(
+        message: str,
+        intent: Optional[str],
+        rag_results: List[RetrievalResult],
+        personality: str,
+        entities: Optional[Dict[str, str]] = None,
+    ) -> CacheKey:
+        """
+        Build the cache key for a turn.
+        
+        Args:
+            message: User message
+            intent: Detected intent name
+            rag_results: Documents retrieved for the turn
+            personality: Chatbot personality
+            entities: Extracted entities (label to text) rendered into the prompt
+        
+        Returns:
+            Hashable cache key
+        """
+        doc_ids = tuple(str(r.metadata.get("id", r.source)) for r in rag_results)
+        entity_items = tuple(sorted((str(k), str(v)) for k, v in (entities or {}).items()))
+        return (normalize_message(message), intent, entity_items, doc_ids, personality)
+    
+    def _check_corpus(self, corpus_version: int):
+        if corpus_version != self._corpus_version:
+            if self._entries:
+                logger.info("RAG corpus changed; clearing answer cache")
+            self._entries.clear()
+            self._corpus_version = corpus_version
+    
+    def get(self, key: CacheKey, corpus_version: int = 0) -> Optional[str]:
+        """
+        Look up a cached answer.
+        
+        Args:
+            key: Cache key from `make_key`
+            corpus_version: Current RAG corpus version
+        
+        Returns:
+            Cached answer, or None
+        """
+        with self._lock:
+            self._check_corpus(corpus_version)
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                metrics.counter("chatbot_answer_cache_total", result="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+        
+        metrics.counter("chatbot_answer_cache_total", result="hit").inc()
+        return entry[0]
+    
+    def put(self, key: CacheKey, answer: str, corpus_version: int = 0):
+        """
+        Store an answer.
+        
+        Args:
+            key: Cache key from `make_key`
+            answer: Assistant response
+            corpus_version: RAG corpus version the answer was produced with
+        """
+        with self._lock:
+            if self._corpus_version is not None and corpus_version < self._corpus_version:
+                return  # produced from a corpus that has since changed
+            self._check_corpus(corpus_version)
+            self._entries[key] = (answer, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached answers."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,32 +1,112 @@
 """Chatbot manager module."""
 
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from ..utils.logger import get_logger
 from ..utils.validators import validate_text
-from ..utils.exceptions import ChatbotError
+from ..utils.exceptions import BatchProcessingError, ChatbotError
+from ..utils.metrics import metrics
 from ..config.settings import settings
 from ..intent.classifier import IntentClassifier, get_intent_classifier
 from ..entity.extractor import EntityExtractor, get_entity_extractor
 from ..llm.manager import LLMManager, Message, get_llm_manager
-from ..rag.retriever import RAGRetriever, get_rag_retriever
+from ..rag.retriever import RAGRetriever, RetrievalResult, get_rag_retriever
+from .prompt import PromptBuilder
+from .summarizer import ConversationSummarizer
+from .pipeline import ChatPipeline, Deadline, StageRun, load_pipeline
+from .store import ConversationStore, get_conversation_store
+from .templates import get_system_prompt_template
+from .answer_cache import AnswerCache
 
 
 logger = get_logger(__name__, level=settings.log_level)
 
 
-@dataclass
-class ChatMessage:
-    """Chat message with metadata."""
-    role: str  # "user" or "assistant"
-    content: str
-    timestamp: datetime = field(default_factory=datetime.now)
-    metadata: Dict = None
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+class ChatMessage(Message):
+    """
+    Chat message with metadata.
+    
+    A ChatMessage is also the LLM `Message` for its turn, so the history
+    can be handed to the LLM without conversion. Messages are slotted,
+    store their creation time as a float, and only allocate a metadata
+    dict when it is first used.
+    """
+    __slots__ = ("created_at", "_metadata")
+    
+    def __init__(
+        self,
+        role: str,  # "user" or "assistant"
+        content: str,
+        timestamp: Union[datetime, float, None] = None,
+        metadata: Dict = None,
+    ):
+        self.role = role
+        self.content = content
+        if timestamp is None:
+            self.created_at = time.time()
+        elif isinstance(timestamp, datetime):
+            self.created_at = timestamp.timestamp()
+        else:
+            self.created_at = float(timestamp)
+        self._metadata = metadata or None
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a local datetime."""
+        return datetime.fromtimestamp(self.created_at)
+    
+    @property
+    def metadata(self) -> Dict:
+        """Message metadata (created on first access)."""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Dict):
+        self._metadata = value
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ChatMessage):
+            return NotImplemented
+        return (
+            self.role == other.role
+            and self.content == other.content
+            and self.created_at == other.created_at
+            and (self._metadata or {}) == (other._metadata or {})
+        )
+    
+    def __repr__(self) -> str:
+        return (
+            f"ChatMessage(role={self.role!r}, content={self.content!r}, "
+            f"timestamp={self.timestamp!r})"
+        )
+    
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.created_at,
+            "metadata": self._metadata or {},
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ChatMessage":
+        """Create a message from `to_dict` output."""
+        timestamp = data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(
+            role=data["role"],
+            content=data["content"],
+            timestamp=timestamp,
+            metadata=data.get("metadata"),
+        )
 
 
 @dataclass
@@ -36,23 +116,55 @@ class ChatContext:
     messages: List[ChatMessage] = field(default_factory=list)
     entities: Dict = field(default_factory=dict)
     intent: Optional[str] = None
+    summary: Optional[str] = None
     metadata: Dict = field(default_factory=dict)
     
     def add_message(self, message: ChatMessage):
         """Add message to context."""
         self.messages.append(message)
         
-        # Keep only recent messages (maintain context window)
-        max_messages = settings.chatbot.max_history
-        if len(self.messages) > max_messages:
-            self.messages = self.messages[-max_messages:]
+        # Keep only recent messages (trimmed in place, without re-slicing)
+        overflow = len(self.messages) - settings.chatbot.max_history
+        if overflow > 0:
+            del self.messages[:overflow]
     
     def get_conversation_history(self) -> List[Message]:
         """Get conversation history formatted for LLM."""
-        return [
-            Message(role=msg.role, content=msg.content)
-            for msg in self.messages
-        ]
+        # ChatMessage is a Message, so this is a shallow copy, not a rebuild
+        return list(self.messages)
+    
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "conversation_id": self.conversation_id,
+            "messages": [msg.to_dict() for msg in self.messages],
+            "entities": self.entities,
+            "intent": self.intent,
+            "summary": self.summary,
+            "metadata": self.metadata,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ChatContext":
+        """Create a context from `to_dict` output."""
+        return cls(
+            conversation_id=data["conversation_id"],
+            messages=[ChatMessage.from_dict(msg) for msg in data.get("messages", [])],
+            entities=data.get("entities") or {},
+            intent=data.get("intent"),
+            summary=data.get("summary"),
+            metadata=data.get("metadata") or {},
+        )
+
+
+@dataclass
+class BatchTurnResult:
+    """Outcome of one item in `ChatbotManager.process_batch`."""
+    conversation_id: str
+    response: Optional[str] = None
+    intent: Optional[str] = None
+    entities: Dict = field(default_factory=dict)
+    error: Optional[str] = None
 
 
 class ChatbotManager:
@@ -64,6 +176,11 @@ class ChatbotManager:
         intent_classifier: IntentClassifier = None,
         entity_extractor: EntityExtractor = None,
         rag_retriever: RAGRetriever = None,
+        prompt_builder: PromptBuilder = None,
+        summarizer: ConversationSummarizer = None,
+        pipeline: ChatPipeline = None,
+        conversation_store: ConversationStore = None,
+        answer_cache: AnswerCache = None,
     ):
         """
         Initialize chatbot manager.
@@ -73,6 +190,14 @@ class ChatbotManager:
             intent_classifier: Intent classifier instance
             entity_extractor: Entity extractor instance
             rag_retriever: RAG retriever instance
+            prompt_builder: Token-budgeted prompt builder
+            summarizer: Rolling history summarizer (created from settings
+                when summarization is enabled)
+            pipeline: Intent-gated stage rules (loaded from settings by default)
+            conversation_store: Conversation storage (bounded in-memory store
+                from settings by default)
+            answer_cache: First-turn answer cache (created from settings when
+                enabled)
         """
         logger.info("Initializing ChatbotManager")
         
@@ -80,8 +205,33 @@ class ChatbotManager:
         self.intent_classifier = intent_classifier or get_intent_classifier("dummy")
         self.entity_extractor = entity_extractor or get_entity_extractor("dummy")
         self.rag_retriever = rag_retriever or get_rag_retriever("dummy")
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.pipeline = pipeline or load_pipeline()
+        self.prompt_template = get_system_prompt_template(settings.chatbot.personality)
+        self.answer_cache = answer_cache
+        if self.answer_cache is None and settings.chatbot.enable_answer_cache:
+            self.answer_cache = AnswerCache()
+        self.summarizer = summarizer
+        if self.summarizer is None and settings.chatbot.enable_summarization:
+            self.summarizer = ConversationSummarizer(
+                self.llm_manager, self.prompt_builder.tokenizer
+            )
+        
+        self.conversations: ConversationStore = (
+            conversation_store
+            if conversation_store is not None
+            else get_conversation_store(on_evict=self._on_conversation_evicted)
+        )
         
-        self.conversations: Dict[str, ChatContext] = {}
+        self._stage_executor = None
+        if settings.chatbot.parallel_stages:
+            self._stage_executor = ThreadPoolExecutor(
+                max_workers=settings.chatbot.stage_workers,
+                thread_name_prefix="chatbot-stage",
+            )
+        # Stages left running past their deadline, each holding a worker
+        self._abandoned_stages = 0
+        self._abandoned_lock = threading.Lock()
     
     def create_conversation(self, conversation_id: str = None) -> str:
         """
@@ -106,14 +256,22 @@ class ChatbotManager:
         conversation_id: str,
         user_message: str,
         use_rag: bool = True,
+        timeout: float = None,
     ) -> str:
         """
         Process user message and generate response.
         
+        The turn runs against a deadline. Stages that cannot finish within
+        their share of the remaining budget are dropped (no intent, no
+        entities, no RAG context) and the LLM's max_tokens is reduced to
+        what can be generated in the time left. Degradations are recorded
+        in the conversation metadata.
+        
         Args:
             conversation_id: Conversation ID
             user_message: User input message
             use_rag: Whether to use RAG for context
+            timeout: Turn deadline in seconds (defaults to response_timeout)
         
         Returns:
             Assistant response
@@ -122,109 +280,575 @@ class ChatbotManager:
             ChatbotError: If processing fails
         """
         try:
+            deadline = Deadline(timeout or settings.chatbot.response_timeout)
+            
             # Validate input
             user_message = validate_text(user_message)
             
-            # Get or create conversation
-            if conversation_id not in self.conversations:
-                self.create_conversation(conversation_id)
-            
-            context = self.conversations[conversation_id]
+            context = self._open_conversation(conversation_id)
             
             # Add user message to context
             context.add_message(ChatMessage(role="user", content=user_message))
             
-            # Extract intent
-            if settings.enable_intent_recognition:
-                intent_result = self.intent_classifier.classify(user_message)
-                context.intent = intent_result.name
-                logger.debug(f"Detected intent: {intent_result.name}")
-            
-            # Extract entities
-            if settings.enable_entity_extraction:
-                extraction_result = self.entity_extractor.extract(user_message)
-                context.entities = {
-                    entity.label: entity.text
-                    for entity in extraction_result.entities
-                }
-                logger.debug(f"Extracted entities: {context.entities}")
+            # Run intent, entity and RAG stages (concurrently when enabled)
+            run = self._run_stages(user_message, use_rag, deadline)
             
-            # Retrieve relevant documents with RAG
-            rag_context = ""
-            if use_rag and settings.enable_rag:
+            return self._complete_turn(
+                context,
+                user_message,
+                run,
+                lambda run: self._llm_budget(deadline, run),
+            )
+        except Exception as e:
+            logger.error(f"Message processing failed: {str(e)}")
+            raise ChatbotError(f"Message processing failed: {str(e)}")
+    
+    def process_batch(
+        self,
+        items: List[Tuple[str, str]],
+        use_rag: bool = True,
+        max_concurrency: int = None,
+    ) -> List[BatchTurnResult]:
+        """
+        Process many messages for offline replay and evaluation.
+        
+        Intent, entity and RAG stages run once over the whole batch using
+        the components' batch APIs. LLM calls then run concurrently across
+        conversations at "batch" priority; messages for the same
+        conversation are processed in their input order. A failing item
+        does not fail the batch.
+        
+        Args:
+            items: (conversation_id, message) pairs
+            use_rag: Whether to use RAG for context
+            max_concurrency: Conversations processed at once
+                (defaults to settings)
+        
+        Returns:
+            One result per item, in input order
+        
+        Raises:
+            ChatbotError: If a batched stage fails
+        """
+        results: List[Optional[BatchTurnResult]] = [None] * len(items)
+        
+        valid = []
+        for index, (conversation_id, message) in enumerate(items):
+            try:
+                valid.append((index, conversation_id, validate_text(message)))
+            except Exception as e:
+                results[index] = BatchTurnResult(conversation_id=conversation_id, error=str(e))
+        
+        try:
+            runs = self._run_batch_stages([message for _, _, message in valid], use_rag)
+        except Exception as e:
+            logger.error(f"Batch processing failed: {str(e)}")
+            raise ChatbotError(f"Batch processing failed: {str(e)}")
+        
+        turns: Dict[str, List[Tuple[int, str, StageRun]]] = {}
+        for (index, conversation_id, message), run in zip(valid, runs):
+            turns.setdefault(conversation_id, []).append((index, message, run))
+        
+        def run_conversation(conversation_id: str) -> List[Tuple[int, BatchTurnResult]]:
+            completed = []
+            for index, message, run in turns[conversation_id]:
                 try:
-                    retrieval_results = self.rag_retriever.search(user_message)
-                    if retrieval_results:
-                        rag_context = "\n".join(
-                            f"Source: {r.source}\n{r.content}"
-                            for r in retrieval_results[:3]
-                        )
-                        logger.debug(f"Retrieved {len(retrieval_results)} documents")
+                    context = self._open_conversation(conversation_id)
+                    context.add_message(ChatMessage(role="user", content=message))
+                    response = self._complete_turn(
+                        context,
+                        message,
+                        run,
+                        lambda run: {"priority": "batch"},
+                    )
+                    result = BatchTurnResult(
+                        conversation_id=conversation_id,
+                        response=response,
+                        intent=context.intent,
+                        entities=dict(context.entities),
+                    )
                 except Exception as e:
-                    logger.warning(f"RAG retrieval failed: {str(e)}")
-            
-            # Build system prompt
-            system_prompt = self._build_system_prompt(context, rag_context)
-            
-            # Prepare messages for LLM
-            messages = [Message(role="system", content=system_prompt)]
-            messages.extend(context.get_conversation_history())
-            
-            # Generate response
-            llm_response = self.llm_manager.chat(messages)
-            assistant_message = llm_response.content
-            
-            # Add assistant response to context
-            context.add_message(ChatMessage(role="assistant", content=assistant_message))
-            
+                    logger.warning(f"Batch item {index} failed: {str(e)}")
+                    result = BatchTurnResult(conversation_id=conversation_id, error=str(e))
+                completed.append((index, result))
+            return completed
+        
+        if turns:
+            workers = min(max_concurrency or settings.chatbot.batch_concurrency, len(turns))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="chatbot-batch"
+            ) as executor:
+                for completed in executor.map(run_conversation, list(turns)):
+                    for index, result in completed:
+                        results[index] = result
+        
+        logger.info(
+            f"Processed chatbot batch",
+            extra={
+                "num_items": len(items),
+                "num_conversations": len(turns),
+                "num_errors": sum(1 for r in results if r.error is not None),
+            }
+        )
+        
+        return results
+    
+    def _open_conversation(self, conversation_id: str) -> ChatContext:
+        """Get or create a conversation and fold in any finished summary."""
+        context = self.conversations.get(conversation_id)
+        if context is None:
+            context = ChatContext(conversation_id)
+            self.conversations[conversation_id] = context
+            logger.info(f"Created conversation: {conversation_id}")
+        
+        # Fold in any summary finished since the last turn
+        if self.summarizer is not None:
+            self.summarizer.apply_pending(context)
+        
+        return context
+    
+    def _complete_turn(
+        self,
+        context: ChatContext,
+        user_message: str,
+        run: StageRun,
+        llm_options: Callable[[StageRun], Dict[str, Any]],
+    ) -> str:
+        """
+        Apply stage results to the context and produce the assistant reply.
+        
+        Args:
+            context: Conversation context, ending with the user message
+            user_message: Validated user message
+            run: Outcome of the pre-LLM stages
+            llm_options: Returns LLM call keyword arguments for the turn
+        
+        Returns:
+            Assistant response
+        """
+        conversation_id = context.conversation_id
+        stage_timings = run.timings
+        context.metadata["stage_timings_ms"] = stage_timings
+        context.metadata["skipped_stages"] = run.skipped
+        context.metadata["degradations"] = run.degraded
+        
+        intent_result = run.results.get("intent")
+        if intent_result is not None:
+            context.intent = intent_result.name
+            logger.debug(f"Detected intent: {intent_result.name}")
+        elif "intent" in run.degraded:
+            context.intent = None
+        
+        extraction_result = run.results.get("entities")
+        if extraction_result is not None:
+            context.entities = {
+                entity.label: entity.text
+                for entity in extraction_result.entities
+            }
+            logger.debug(f"Extracted entities: {context.entities}")
+        elif "entities" in run.skipped or "entities" in run.degraded:
+            context.entities = {}
+        
+        rag_results = run.results.get("rag") or []
+        
+        # Answer from the rule's template when it skips the LLM
+        if "llm" in run.skipped:
+            context.add_message(ChatMessage(role="assistant", content=run.rule.response))
+            self.conversations.save(conversation_id, context)
             logger.info(
-                f"Generated chatbot response",
+                f"Answered from pipeline rule",
                 extra={
                     "conversation_id": conversation_id,
-                    "message_length": len(user_message),
-                    "response_length": len(assistant_message),
+                    "rule": run.rule.name,
+                    "skipped_stages": run.skipped,
                 }
             )
-            
-            return assistant_message
+            return run.rule.response
+        
+        # Reuse the answer to an identical first-turn question. Degraded turns
+        # (missing context, shortened output) neither read nor fill the cache.
+        cache_key = None
+        first_turn = len(context.messages) == 1 and not context.summary
+        if self.answer_cache is not None and first_turn and not run.degraded:
+            cache_key = AnswerCache.make_key(
+                user_message,
+                context.intent,
+                rag_results,
+                self.prompt_template.personality,
+                context.entities,
+            )
+            corpus_version = self.rag_retriever.corpus_version
+            cached = self.answer_cache.get(cache_key, corpus_version)
+            context.metadata["answer_cache"] = "miss" if cached is None else "hit"
+            if cached is not None:
+                context.add_message(ChatMessage(role="assistant", content=cached))
+                self.conversations.save(conversation_id, context)
+                logger.info(
+                    f"Answered from answer cache",
+                    extra={"conversation_id": conversation_id},
+                )
+                return cached
+        
+        # Build system prompt
+        system_prompt = self._build_system_prompt(context)
+        context.metadata["stable_prefix_tokens"] = self._stable_prefix_tokens
+        
+        # Prepare messages for LLM within the token budget
+        prompt = self.prompt_builder.build(
+            system_prompt,
+            context.get_conversation_history(),
+            rag_results,
+            turn_notes=self.prompt_template.render_turn_notes(context.intent, context.entities),
+        )
+        logger.debug(
+            f"Assembled prompt",
+            extra={
+                "prompt_tokens": prompt.total_tokens,
+                "stable_prefix_tokens": self._stable_prefix_tokens,
+                "dropped": prompt.dropped,
+                "truncated": prompt.truncated,
+            }
+        )
+        
+        # Generate response
+        llm_kwargs = llm_options(run)
+        llm_start = time.perf_counter()
+        llm_response = self.llm_manager.chat(prompt.messages, **llm_kwargs)
+        assistant_message = llm_response.content
+        stage_timings["llm"] = (time.perf_counter() - llm_start) * 1000
+        metrics.histogram("chatbot_stage_seconds", stage="llm").observe(
+            stage_timings["llm"] / 1000
+        )
+        
+        # Add assistant response to context
+        context.add_message(ChatMessage(role="assistant", content=assistant_message))
+        
+        # Re-check: the LLM budget may have shortened this answer
+        if cache_key is not None and not run.degraded:
+            self.answer_cache.put(cache_key, assistant_message, corpus_version)
+        
+        self.conversations.save(conversation_id, context)
+        
+        # Compact older turns in the background once history grows
+        if self.summarizer is not None:
+            self.summarizer.maybe_summarize(context)
+        
+        logger.info(
+            f"Generated chatbot response",
+            extra={
+                "conversation_id": conversation_id,
+                "message_length": len(user_message),
+                "response_length": len(assistant_message),
+                "stage_timings_ms": stage_timings,
+                "skipped_stages": run.skipped,
+                "degradations": run.degraded,
+            }
+        )
+        
+        return assistant_message
+    
+    def _retrieve(self, user_message: str) -> List[RetrievalResult]:
+        """Retrieve RAG documents; retrieval failures degrade to no context."""
+        try:
+            retrieval_results = self.rag_retriever.search(user_message)
         except Exception as e:
-            logger.error(f"Message processing failed: {str(e)}")
-            raise ChatbotError(f"Message processing failed: {str(e)}")
+            logger.warning(f"RAG retrieval failed: {str(e)}")
+            return []
+        
+        logger.debug(f"Retrieved {len(retrieval_results)} documents")
+        return retrieval_results[:settings.chatbot.rag_max_documents]
+    
+    def _retrieve_many(self, messages: List[str]) -> List[List[RetrievalResult]]:
+        """Batched counterpart of `_retrieve`."""
+        try:
+            results = self.rag_retriever.search_many(messages)
+        except Exception as e:
+            logger.warning(f"RAG batch retrieval failed: {str(e)}")
+            return [[] for _ in messages]
+        return [r[:settings.chatbot.rag_max_documents] for r in results]
     
-    def _build_system_prompt(self, context: ChatContext, rag_context: str = "") -> str:
+    def _run_stages(self, user_message: str, use_rag: bool, deadline: Deadline = None) -> StageRun:
         """
-        Build system prompt with personality and context.
+        Run the pre-LLM stages for a message.
+        
+        Intent, entity and RAG stages only depend on the user message, so
+        they are submitted together to the stage executor and joined before
+        prompt assembly; pre-LLM latency is then the slowest stage rather
+        than the sum of all three. When the pipeline has intent rules, the
+        other stages still start alongside intent; once the intent is known,
+        a matching rule drops the stages it skips, cancelling those not yet
+        started and discarding the results of the rest. If the intent stage
+        raises, no rule can be matched: the error propagates and every stage
+        started alongside it is dropped the same way.
+        
+        Stages still running when their share of the deadline runs out are
+        abandoned and recorded as degraded. Python threads cannot be
+        interrupted, so an abandoned stage keeps its worker until it
+        returns; while abandoned stages hold every worker, new stages are
+        degraded at once instead of queueing behind them.
+        
+        Without the stage executor, stages run in order (intent first, so
+        skipped stages never start) and the deadline is only checked between
+        them: a slow stage is not interrupted, but the stages after it are
+        skipped and degraded.
         
         Args:
-            context: Chat context
-            rag_context: Retrieved RAG context
+            user_message: Validated user message
+            use_rag: Whether to run RAG retrieval
+            deadline: Turn deadline (defaults to response_timeout from now)
         
         Returns:
-            System prompt
+            Stage results keyed by stage name ('intent', 'entities', 'rag'),
+            per-stage wall time in milliseconds, skipped and degraded stages
+        """
+        deadline = deadline or Deadline(settings.chatbot.response_timeout)
+        stage_budget = deadline.share(settings.chatbot.stage_budget_fraction)
+        stage_deadline = Deadline(stage_budget, clock=deadline.clock)
+        
+        stages = {}
+        if settings.enable_intent_recognition:
+            stages["intent"] = self.intent_classifier.classify
+        if settings.enable_entity_extraction:
+            stages["entities"] = self.entity_extractor.extract
+        if use_rag and settings.enable_rag:
+            stages["rag"] = self._retrieve
+        
+        run = StageRun()
+        start = time.perf_counter()
+        
+        def apply_rule() -> List[str]:
+            run.rule = self.pipeline.match(run.results.get("intent"))
+            if run.rule is None:
+                return []
+            for name in run.rule.skip:
+                if name in stages or name == "llm":
+                    run.skipped.append(name)
+                    metrics.counter("chatbot_stage_skipped_total", stage=name).inc()
+            return [name for name in run.rule.skip if name in stages]
+        
+        on_intent = apply_rule if "intent" in stages and self.pipeline.gates_on_intent else None
+        self._execute_stages(stages, user_message, run, stage_deadline, on_intent)
+        run.timings["pre_llm"] = (time.perf_counter() - start) * 1000
+        
+        return run
+    
+    def _run_batch_stages(self, messages: List[str], use_rag: bool) -> List[StageRun]:
+        """
+        Run the pre-LLM stages for a batch of messages.
+        
+        Intents are classified first so pipeline rules can drop entity and
+        RAG work for the items they skip; entities and RAG then run as one
+        batch call each, concurrently when the stage executor is enabled.
+        Timings record the wall time of each batched stage.
+        
+        Args:
+            messages: Validated user messages
+            use_rag: Whether to run RAG retrieval
+        
+        Returns:
+            One stage run per message, in order
         """
-        personality_prompts = {
-            "professional": "You are a professional, helpful AI assistant.",
-            "friendly": "You are a friendly and conversational AI assistant.",
-            "formal": "You are a formal and respectful AI assistant.",
+        runs = [StageRun() for _ in messages]
+        if not messages:
+            return runs
+        
+        def timed(name: str, stage: Callable[[List[str]], List[Any]], indices: List[int]):
+            start = time.perf_counter()
+            try:
+                outputs = stage([messages[i] for i in indices])
+            except BatchProcessingError as e:
+                # Items that failed continue without this stage
+                logger.warning(f"Batch stage '{name}' failed for {len(e.errors)} items")
+                outputs = e.results
+            elapsed = time.perf_counter() - start
+            metrics.histogram("chatbot_batch_stage_seconds", stage=name).observe(elapsed)
+            for i, output in zip(indices, outputs):
+                runs[i].timings[name] = elapsed * 1000
+                if output is None:
+                    runs[i].degraded.append(name)
+                else:
+                    runs[i].results[name] = output
+        
+        everything = list(range(len(messages)))
+        if settings.enable_intent_recognition:
+            timed("intent", self.intent_classifier.batch_classify, everything)
+            if self.pipeline.gates_on_intent:
+                for run in runs:
+                    run.rule = self.pipeline.match(run.results.get("intent"))
+                    if run.rule is not None:
+                        run.skipped = list(run.rule.skip)
+                        for name in run.skipped:
+                            metrics.counter("chatbot_stage_skipped_total", stage=name).inc()
+        
+        stages = {}
+        if settings.enable_entity_extraction:
+            stages["entities"] = self.entity_extractor.batch_extract
+        if use_rag and settings.enable_rag:
+            stages["rag"] = self._retrieve_many
+        
+        jobs = []
+        for name, stage in stages.items():
+            indices = [i for i in everything if name not in runs[i].skipped]
+            if indices:
+                jobs.append((name, stage, indices))
+        
+        if self._stage_executor is not None and len(jobs) > 1:
+            futures = [self._stage_executor.submit(timed, *job) for job in jobs]
+            for future in futures:
+                future.result()
+        else:
+            for job in jobs:
+                timed(*job)
+        
+        return runs
+    
+    def _execute_stages(
+        self,
+        stages: Dict[str, Callable[[str], Any]],
+        user_message: str,
+        run: StageRun,
+        deadline: Deadline,
+        on_intent: Optional[Callable[[], List[str]]] = None,
+    ):
+        """
+        Run stages concurrently (or in order) until the stage deadline.
+        
+        Args:
+            stages: Stage callables by name, intent first
+            user_message: Validated user message
+            run: Stage outcome to fill in
+            deadline: Stage deadline
+            on_intent: Called once the intent result is in `run`; returns the
+                names of stages to drop
+        """
+        # Abandoned stages finish after the join, so they time into a local
+        # dict and only stages that were joined are copied into the run
+        timings = {}
+        
+        def timed(name: str, stage: Callable[[str], Any]) -> Any:
+            start = time.perf_counter()
+            try:
+                return stage(user_message)
+            finally:
+                elapsed = time.perf_counter() - start
+                timings[name] = elapsed * 1000
+                metrics.histogram("chatbot_stage_seconds", stage=name).observe(elapsed)
+        
+        def degrade(name: str):
+            run.degraded.append(name)
+            metrics.counter("chatbot_degradations_total", stage=name).inc()
+            logger.warning(f"Stage '{name}' exceeded its deadline budget; continuing without it")
+        
+        if self._stage_executor is None:
+            dropped = set()
+            for name, stage in stages.items():
+                if name in dropped:
+                    continue
+                if deadline.expired:
+                    degrade(name)
+                    continue
+                run.results[name] = timed(name, stage)
+                run.timings[name] = timings[name]
+                if name == "intent" and on_intent is not None:
+                    dropped.update(on_intent())
+            return
+        
+        if stages and self._abandoned_stages >= settings.chatbot.stage_workers:
+            logger.warning("All stage workers are busy with abandoned stages")
+            for name in stages:
+                degrade(name)
+            return
+        
+        futures = {
+            name: self._stage_executor.submit(timed, name, stage)
+            for name, stage in stages.items()
         }
+        try:
+            intent = futures.get("intent")
+            if intent is not None and on_intent is not None:
+                wait([intent], timeout=deadline.remaining())
+                if intent.done():
+                    del futures["intent"]
+                    run.timings["intent"] = timings["intent"]
+                    run.results["intent"] = intent.result()
+                    for name in on_intent():
+                        self._drop_stage(futures.pop(name))
+            
+            wait(futures.values(), timeout=deadline.remaining())
+            for name, future in list(futures.items()):
+                if future.done():
+                    del futures[name]
+                    run.timings[name] = timings[name]
+                    run.results[name] = future.result()
+            for name in futures:
+                degrade(name)
+        finally:
+            # Stages that missed the deadline, or that were still running when
+            # another stage raised, must not keep running untracked
+            for future in futures.values():
+                self._drop_stage(future)
+    
+    def _drop_stage(self, future: Future):
+        """Cancel a stage future, or track it as abandoned if it already started."""
+        if not future.cancel() and not future.done():
+            self._track_abandoned(future)
+    
+    def _track_abandoned(self, future: Future):
+        """Count a stage left running past its deadline until it returns."""
+        def release(_):
+            with self._abandoned_lock:
+                self._abandoned_stages -= 1
+            metrics.gauge("chatbot_abandoned_stages").dec()
         
-        personality = settings.chatbot.personality
-        base_prompt = personality_prompts.get(personality, personality_prompts["professional"])
+        with self._abandoned_lock:
+            self._abandoned_stages += 1
+        metrics.gauge("chatbot_abandoned_stages").inc()
+        future.add_done_callback(release)
+    
+    def _llm_budget(self, deadline: Deadline, run: StageRun) -> Dict[str, Any]:
+        """
+        LLM call parameters that fit the remaining deadline.
         
-        system_prompt = base_prompt
+        Args:
+            deadline: Turn deadline
+            run: Stage outcome, updated with any LLM degradation
         
-        if context.intent:
-            system_prompt += f"\nThe user's intent is: {context.intent}"
+        Returns:
+            Keyword arguments for LLMManager.chat
+        """
+        remaining = deadline.remaining()
+        generation_time = remaining - settings.chatbot.llm_first_token_seconds
+        affordable = int(generation_time * settings.chatbot.llm_tokens_per_second)
+        max_tokens = settings.llm.max_tokens
         
-        if context.entities:
-            system_prompt += f"\nExtracted entities: {context.entities}"
+        if affordable < max_tokens:
+            max_tokens = max(settings.chatbot.min_llm_tokens, affordable)
+            run.degraded.append("llm_max_tokens")
+            metrics.counter("chatbot_degradations_total", stage="llm_max_tokens").inc()
+            logger.warning(f"Reduced LLM max_tokens to {max_tokens} to meet the turn deadline")
         
-        if rag_context:
-            system_prompt += f"\n\nRelevant context:\n{rag_context}"
+        return {"max_tokens": max_tokens, "timeout": max(remaining, 0.001)}
+    
+    @property
+    def _stable_prefix_tokens(self) -> int:
+        """Tokens in the system prompt prefix shared by every turn."""
+        return self.prompt_builder.tokenizer.count_tokens(self.prompt_template.stable_prefix)
+    
+    def _build_system_prompt(self, context: ChatContext) -> str:
+        """
+        Build system prompt with personality and summary.
         
-        system_prompt += "\n\nProvide helpful, accurate, and relevant responses."
+        The personality template's stable prefix comes first so it is
+        identical across turns; the intent, entities and retrieved
+        documents go in the latest user message via the prompt builder.
         
-        return system_prompt
+        Args:
+            context: Chat context
+        
+        Returns:
+            System prompt
+        """
+        return self.prompt_template.render(summary=context.summary)
     
     def get_conversation_history(self, conversation_id: str) -> List[ChatMessage]:
         """
@@ -236,10 +860,11 @@ class ChatbotManager:
         Returns:
             List of chat messages
         """
-        if conversation_id not in self.conversations:
+        context = self.conversations.get(conversation_id)
+        if context is None:
             return []
         
-        return self.conversations[conversation_id].messages
+        return list(context.messages)
     
     def delete_conversation(self, conversation_id: str):
         """
@@ -248,11 +873,25 @@ class ChatbotManager:
         Args:
             conversation_id: Conversation ID to delete
         """
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
+        if self.conversations.pop(conversation_id, None) is not None:
+            if self.summarizer is not None:
+                self.summarizer.discard(conversation_id)
             logger.info(f"Deleted conversation: {conversation_id}")
     
+    def _on_conversation_evicted(self, conversation_id: str):
+        """Drop per-conversation state when the store evicts a conversation."""
+        if self.summarizer is not None:
+            self.summarizer.discard(conversation_id)
+    
     def clear_all_conversations(self):
         """Clear all conversations."""
         self.conversations.clear()
         logger.info("Cleared all conversations")
+    
+    def close(self):
+        """Release worker threads held by the manager."""
+        if self._stage_executor is not None:
+            self._stage_executor.shutdown(wait=False)
+        if self.summarizer is not None:
+            self.summarizer.shutdown(wait=False)
+        self.conversations.close()
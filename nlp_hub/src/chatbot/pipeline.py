@@ -0,0 +1,215 @@
+"""Declarative, intent-gated chatbot pipeline configuration."""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+from ..utils.logger import get_logger
+from ..utils.exceptions import ConfigurationError
+from ..config.settings import settings
+from ..intent.classifier import Intent
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+# Stages that rules may skip; intent always runs because rules depend on it
+SKIPPABLE_STAGES = ("entities", "rag", "llm")
+
+
+@dataclass
+class StageCondition:
+    """
+    Condition on the detected intent.
+    
+    `min_confidence` is an inclusive lower bound: an intent detected with
+    exactly that confidence matches.
+    """
+    intents: List[str] = field(default_factory=list)  # empty matches any intent
+    min_confidence: float = 0.0
+    
+    def matches(self, intent: Optional[Intent]) -> bool:
+        """Check whether the intent satisfies this condition."""
+        if intent is None:
+            return False
+        if self.intents and intent.name not in self.intents:
+            return False
+        return intent.confidence >= self.min_confidence
+
+
+@dataclass
+class PipelineRule:
+    """Stages to skip when a condition holds."""
+    name: str
+    when: StageCondition
+    skip: List[str]
+    response: Optional[str] = None  # canned answer, required when skipping the LLM
+    
+    def __post_init__(self):
+        unknown = set(self.skip) - set(SKIPPABLE_STAGES)
+        if unknown:
+            raise ConfigurationError(
+                f"Pipeline rule '{self.name}' skips unknown stages: {sorted(unknown)}"
+            )
+        if "llm" in self.skip and not self.response:
+            raise ConfigurationError(
+                f"Pipeline rule '{self.name}' skips the LLM but has no response template"
+            )
+
+
+@dataclass
+class StageRun:
+    """Outcome of the pre-LLM stages for one turn."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)  # milliseconds
+    skipped: List[str] = field(default_factory=list)
+    degraded: List[str] = field(default_factory=list)
+    rule: Optional[PipelineRule] = None
+
+
+class Deadline:
+    """End-to-end time budget for a single chatbot turn."""
+    
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize deadline.
+        
+        Args:
+            timeout: Seconds from now until the deadline
+            clock: Monotonic time source
+        """
+        self.clock = clock
+        self.timeout = timeout
+        self.expires_at = clock() + timeout
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - self.clock())
+    
+    def share(self, fraction: float) -> float:
+        """Seconds available to a stage allowed `fraction` of what is left."""
+        return self.remaining() * fraction
+    
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed."""
+        return self.remaining() <= 0
+
+
+class ChatPipeline:
+    """
+    Ordered list of rules evaluated against the detected intent.
+    
+    The first matching rule wins. Example configuration, skipping
+    everything for greetings detected with confidence of at least 0.9::
+        
+        {
+            "rules": [
+                {
+                    "name": "greeting",
+                    "when": {"intents": ["greeting"], "min_confidence": 0.9},
+                    "skip": ["entities", "rag", "llm"],
+                    "response": "Hello! How can I help you today?"
+                }
+            ]
+        }
+    """
+    
+    def __init__(self, rules: List[PipelineRule] = None):
+        """
+        Initialize pipeline.
+        
+        Args:
+            rules: Rules in evaluation order
+        """
+        self.rules = rules or []
+    
+    @classmethod
+    def from_dict(cls, config: Dict) -> "ChatPipeline":
+        """
+        Build a pipeline from a configuration dictionary.
+        
+        Args:
+            config: Dictionary with a "rules" list
+        
+        Returns:
+            ChatPipeline instance
+        
+        Raises:
+            ConfigurationError: If the configuration is invalid
+        """
+        rules = []
+        for i, rule in enumerate(config.get("rules", [])):
+            try:
+                when = rule.get("when", {})
+                rules.append(
+                    PipelineRule(
+                        name=rule.get("name", f"rule_{i}"),
+                        when=StageCondition(
+                            intents=list(when.get("intents", [])),
+                            min_confidence=float(when.get("min_confidence", 0.0)),
+                        ),
+                        skip=list(rule.get("skip", [])),
+                        response=rule.get("response"),
+                    )
+                )
+            except (AttributeError, TypeError, ValueError) as e:
+                raise ConfigurationError(f"Invalid pipeline rule #{i}: {str(e)}")
+        return cls(rules)
+    
+    @classmethod
+    def from_file(cls, path: str) -> "ChatPipeline":
+        """
+        Load a pipeline from a JSON file.
+        
+        Args:
+            path: Path to the JSON configuration
+        
+        Returns:
+            ChatPipeline instance
+        """
+        try:
+            config = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise ConfigurationError(f"Failed to load pipeline config {path}: {str(e)}")
+        
+        pipeline = cls.from_dict(config)
+        logger.info(f"Loaded {len(pipeline.rules)} pipeline rules from {path}")
+        return pipeline
+    
+    @property
+    def gates_on_intent(self) -> bool:
+        """True if any stage depends on the intent result."""
+        return bool(self.rules)
+    
+    def match(self, intent: Optional[Intent]) -> Optional[PipelineRule]:
+        """
+        Find the first rule whose condition holds.
+        
+        Args:
+            intent: Detected intent
+        
+        Returns:
+            Matching rule, or None
+        """
+        for rule in self.rules:
+            if rule.when.matches(intent):
+                return rule
+        return None
+
+
+def load_pipeline(path: str = None) -> ChatPipeline:
+    """
+    Load the deployment's pipeline configuration.
+    
+    Args:
+        path: JSON config path (defaults to settings; empty means no rules)
+    
+    Returns:
+        ChatPipeline instance
+    """
+    path = path if path is not None else settings.chatbot.pipeline_config
+    if not path:
+        return ChatPipeline()
+    return ChatPipeline.from_file(path)
@@ -0,0 +1,292 @@
+"""Token counting and budgeted prompt assembly for the chatbot."""
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List
+from dataclasses import dataclass, field
+from ..utils.logger import get_logger
+from ..utils.exceptions import ModelNotFoundError
+from ..config.settings import settings
+from ..llm.manager import Message
+from ..rag.retriever import RetrievalResult
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+class Tokenizer(ABC):
+    """Base class for prompt token counting."""
+    
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize tokenizer.
+        
+        Args:
+            cache_size: Number of token counts memoized per tokenizer
+        """
+        self.count_tokens = lru_cache(maxsize=cache_size)(self._count)
+    
+    @abstractmethod
+    def _count(self, text: str) -> int:
+        """Count tokens in text."""
+        pass
+    
+    @abstractmethod
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncate text to at most `max_tokens` tokens."""
+        pass
+
+
+class ApproximateTokenizer(Tokenizer):
+    """Dependency-free estimate of roughly four characters per token."""
+    
+    CHARS_PER_TOKEN = 4
+    
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        return (len(text) + self.CHARS_PER_TOKEN - 1) // self.CHARS_PER_TOKEN
+    
+    def truncate(self, text: str, max_tokens: int) -> str:
+        max_chars = max(0, max_tokens) * self.CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        
+        # Cut on a word boundary when one is reasonably close
+        cut = text.rfind(" ", 0, max_chars + 1)
+        if cut < max_chars // 2:
+            cut = max_chars
+        return text[:cut].rstrip()
+
+
+class HuggingFaceTokenizer(Tokenizer):
+    """Exact token counts using a Hugging Face tokenizer."""
+    
+    def __init__(self, model_name: str = None, cache_size: int = 4096):
+        """
+        Initialize Hugging Face tokenizer.
+        
+        Args:
+            model_name: Tokenizer name or path
+            cache_size: Number of token counts memoized
+        """
+        try:
+            from transformers import AutoTokenizer
+            
+            self.model_name = model_name or settings.chatbot.tokenizer_name
+            logger.info(f"Loading prompt tokenizer: {self.model_name}")
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        except ImportError:
+            raise ModelNotFoundError(
+                "Transformers library not installed. Install with: pip install transformers"
+            )
+        except Exception as e:
+            raise ModelNotFoundError(f"Failed to load tokenizer {model_name}: {str(e)}")
+        
+        super().__init__(cache_size)
+    
+    def _count(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+    
+    def truncate(self, text: str, max_tokens: int) -> str:
+        token_ids = self.tokenizer.encode(text, add_special_tokens=False)
+        if len(token_ids) <= max_tokens:
+            return text
+        return self.tokenizer.decode(token_ids[:max(0, max_tokens)]).rstrip()
+
+
+def get_tokenizer(tokenizer_type: str = None) -> Tokenizer:
+    """
+    Factory function to get prompt tokenizer.
+    
+    Args:
+        tokenizer_type: Type of tokenizer ('approximate' or 'huggingface')
+    
+    Returns:
+        Tokenizer instance
+    """
+    tokenizer_type = tokenizer_type or settings.chatbot.tokenizer
+    
+    if tokenizer_type == "approximate":
+        return ApproximateTokenizer()
+    elif tokenizer_type == "huggingface":
+        return HuggingFaceTokenizer()
+    else:
+        raise ValueError(f"Unknown tokenizer type: {tokenizer_type}")
+
+
+@dataclass
+class PromptBuildResult:
+    """Assembled prompt with token accounting."""
+    messages: List[Message]
+    total_tokens: int
+    dropped: Dict[str, int] = field(default_factory=dict)
+    truncated: List[str] = field(default_factory=list)
+
+
+class PromptBuilder:
+    """
+    Fill a token budget with prompt parts in priority order.
+    
+    Parts are admitted as: system prompt, latest user turn, turn notes,
+    RAG chunks in retrieval order, then older history from newest to
+    oldest. A RAG chunk that does not fit is truncated if enough budget
+    remains, otherwise it and all lower-ranked chunks are dropped. History
+    is kept contiguous: the first older message that does not fit is
+    dropped along with everything before it.
+    
+    Turn notes and RAG context change every turn, so they are sent in the
+    latest user message rather than the system message. The system
+    message and the history then stay byte-identical from one turn to the
+    next, which keeps provider-side prompt prefix caching effective.
+    """
+    
+    RAG_HEADER = "Relevant context:\n"
+    SECTION_SEPARATOR = "\n\n"
+    
+    def __init__(
+        self,
+        tokenizer: Tokenizer = None,
+        token_budget: int = None,
+        max_history_messages: int = None,
+        min_chunk_tokens: int = 32,
+        message_overhead: int = 4,
+    ):
+        """
+        Initialize prompt builder.
+        
+        Args:
+            tokenizer: Tokenizer used for counting (defaults to settings)
+            token_budget: Maximum prompt tokens
+            max_history_messages: Maximum older history messages to include
+            min_chunk_tokens: Smallest truncated RAG chunk worth sending
+            message_overhead: Tokens charged per message for role framing
+        """
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.token_budget = token_budget or settings.chatbot.prompt_token_budget
+        self.max_history_messages = (
+            settings.chatbot.context_window if max_history_messages is None
+            else max_history_messages
+        )
+        self.min_chunk_tokens = min_chunk_tokens
+        self.message_overhead = message_overhead
+    
+    def _cost(self, text: str) -> int:
+        return self.tokenizer.count_tokens(text) + self.message_overhead
+    
+    def build(
+        self,
+        system_prompt: str,
+        history: List[Message],
+        rag_results: List[RetrievalResult] = None,
+        turn_notes: str = "",
+    ) -> PromptBuildResult:
+        """
+        Assemble LLM messages within the token budget.
+        
+        Args:
+            system_prompt: System prompt text
+            history: Conversation history ending with the latest user turn
+            rag_results: Retrieved documents in ranking order
+            turn_notes: Per-turn notes (intent, entities) for the latest turn
+        
+        Returns:
+            Prompt build result with messages and accounting
+        """
+        count = self.tokenizer.count_tokens
+        rag_results = rag_results or []
+        truncated = []
+        dropped = {"rag": 0, "history": 0}
+        
+        # 1. System prompt (never allowed more than half the budget)
+        system_limit = self.token_budget // 2
+        if count(system_prompt) > system_limit:
+            system_prompt = self.tokenizer.truncate(system_prompt, system_limit)
+            truncated.append("system")
+        used = self._cost(system_prompt)
+        
+        # 2. Latest turn
+        latest = history[-1] if history else None
+        older = history[:-1] if history else []
+        if latest is not None:
+            remaining = self.token_budget - used - self.message_overhead
+            if count(latest.content) > remaining:
+                latest = Message(
+                    role=latest.role,
+                    content=self.tokenizer.truncate(latest.content, remaining),
+                )
+                truncated.append("latest_turn")
+            used += self._cost(latest.content)
+        
+        # 3. Turn notes, truncated like the latest turn
+        sections = []
+        separator = count(self.SECTION_SEPARATOR)
+        if turn_notes:
+            remaining = self.token_budget - used - separator
+            if count(turn_notes) > remaining:
+                turn_notes = self.tokenizer.truncate(turn_notes, remaining)
+                truncated.append("turn_notes")
+            if turn_notes:
+                sections.append(turn_notes)
+                used += count(turn_notes) + separator
+        
+        # 4. RAG chunks
+        chunks = []
+        if rag_results:
+            used += count(self.RAG_HEADER) + separator
+        for i, result in enumerate(rag_results):
+            chunk = f"Source: {result.source}\n{result.content}"
+            cost = count(chunk) + 1  # joining newline
+            remaining = self.token_budget - used
+            if cost <= remaining:
+                chunks.append(chunk)
+                used += cost
+                continue
+            
+            if remaining - 1 >= self.min_chunk_tokens:
+                chunk = self.tokenizer.truncate(chunk, remaining - 1)
+                chunks.append(chunk)
+                used += count(chunk) + 1
+                truncated.append(f"rag:{i}")
+                dropped["rag"] = len(rag_results) - i - 1
+            else:
+                dropped["rag"] = len(rag_results) - i
+            break
+        
+        if chunks:
+            sections.append(self.RAG_HEADER + "\n".join(chunks))
+        elif rag_results:
+            used -= count(self.RAG_HEADER) + separator
+        
+        # The user's own words come last, after the notes and context
+        if sections:
+            if latest is not None:
+                sections.append(latest.content)
+            else:
+                used += self.message_overhead
+            latest = Message(role="user", content=self.SECTION_SEPARATOR.join(sections))
+        
+        # 5. Older history, newest first, contiguous
+        kept_history = []
+        candidates = older[-self.max_history_messages:] if self.max_history_messages else []
+        dropped["history"] = len(older) - len(candidates)
+        for message in reversed(candidates):
+            cost = self._cost(message.content)
+            if used + cost > self.token_budget:
+                dropped["history"] += len(candidates) - len(kept_history)
+                break
+            kept_history.append(message)
+            used += cost
+        kept_history.reverse()
+        
+        messages = [Message(role="system", content=system_prompt)]
+        messages.extend(kept_history)
+        if latest is not None:
+            messages.append(latest)
+        
+        return PromptBuildResult(
+            messages=messages,
+            total_tokens=used,
+            dropped=dropped,
+            truncated=truncated,
+        )
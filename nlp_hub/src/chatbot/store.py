@@ -0,0 +1,892 @@
+"""Conversation storage backends for the chatbot."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+from ..utils.logger import get_logger
+from ..utils.exceptions import ChatbotError
+from ..utils.metrics import metrics
+from ..config.settings import settings
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+# Rough fixed cost of a context and of each message (objects, dicts, timestamp)
+CONTEXT_OVERHEAD_BYTES = 512
+MESSAGE_OVERHEAD_BYTES = 128
+
+
+def estimate_context_bytes(context) -> int:
+    """
+    Estimate the memory held by a conversation context.
+    
+    Args:
+        context: Chat context
+    
+    Returns:
+        Approximate size in bytes
+    """
+    size = CONTEXT_OVERHEAD_BYTES
+    for message in context.messages:
+        size += MESSAGE_OVERHEAD_BYTES + len(message.content)
+    size += len(context.summary or "")
+    size += sum(len(str(k)) + len(str(v)) for k, v in context.entities.items())
+    return size
+
+
+class ConversationStore(MutableMapping):
+    """
+    Base class for conversation storage.
+    
+    Stores behave like a dict of conversation ID to ChatContext. Contexts
+    are mutated in place during a turn, so the manager calls `save` once a
+    turn has finished to let the store account for (or persist) the change.
+    """
+    
+    def save(self, conversation_id: str, context):
+        """Record that a context was updated in place."""
+        self[conversation_id] = context
+    
+    def sweep(self) -> int:
+        """
+        Evict expired conversations.
+        
+        Returns:
+            Number of conversations evicted
+        """
+        return 0
+    
+    def close(self):
+        """Release resources held by the store."""
+        pass
+
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    Bounded in-process store with LRU, size and idle-TTL eviction.
+    
+    Expired conversations are evicted lazily when looked up and by a sweep
+    that runs at most every `sweep_interval` seconds as part of normal
+    store operations. When the store is over its count or byte limit the
+    least recently used conversations are evicted first; the conversation
+    being written is never evicted by its own write.
+    """
+    
+    def __init__(
+        self,
+        max_conversations: int = None,
+        max_bytes: int = None,
+        idle_ttl: float = None,
+        sweep_interval: float = None,
+        on_evict: Callable[[str], None] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize in-memory store.
+        
+        Args:
+            max_conversations: Maximum live conversations (0 for no limit)
+            max_bytes: Maximum estimated bytes held (0 for no limit)
+            idle_ttl: Seconds without access before a conversation expires
+                (0 disables expiry)
+            sweep_interval: Minimum seconds between expiry sweeps
+            on_evict: Called with the ID of every evicted conversation
+            clock: Monotonic time source
+        """
+        config = settings.chatbot
+        self.max_conversations = (
+            config.store_max_conversations if max_conversations is None else max_conversations
+        )
+        self.max_bytes = config.store_max_bytes if max_bytes is None else max_bytes
+        self.idle_ttl = config.store_idle_ttl if idle_ttl is None else idle_ttl
+        self.sweep_interval = (
+            config.store_sweep_interval if sweep_interval is None else sweep_interval
+        )
+        self.on_evict = on_evict
+        self.clock = clock
+        
+        # conversation_id -> (context, last_access, size); ordered oldest access first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = clock()
+        self._lock = threading.RLock()
+        self._live = metrics.gauge("chatbot_conversations_live")
+        self._bytes_gauge = metrics.gauge("chatbot_conversations_bytes")
+    
+    @property
+    def total_bytes(self) -> int:
+        """Estimated bytes held by live conversations."""
+        return self._bytes
+    
+    def _expired(self, last_access: float, now: float) -> bool:
+        return self.idle_ttl > 0 and now - last_access > self.idle_ttl
+    
+    def _remove(self, conversation_id: str, reason: Optional[str] = None):
+        _, _, size = self._entries.pop(conversation_id)
+        self._bytes -= size
+        if reason is not None:
+            metrics.counter("chatbot_conversations_evicted_total", reason=reason).inc()
+            logger.debug(f"Evicted conversation {conversation_id} ({reason})")
+            if self.on_evict is not None:
+                self.on_evict(conversation_id)
+    
+    def _update_gauges(self):
+        self._live.set(len(self._entries))
+        self._bytes_gauge.set(self._bytes)
+    
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+    
+    def _sweep(self, now: float) -> int:
+        self._last_sweep = now
+        expired = [
+            conversation_id
+            for conversation_id, (_, last_access, _) in self._entries.items()
+            if self._expired(last_access, now)
+        ]
+        for conversation_id in expired:
+            self._remove(conversation_id, reason="ttl")
+        return len(expired)
+    
+    def _enforce_limits(self, keep: str):
+        while len(self._entries) > 1 and (
+            (self.max_conversations and len(self._entries) > self.max_conversations)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            reason = (
+                "capacity"
+                if self.max_conversations and len(self._entries) > self.max_conversations
+                else "memory"
+            )
+            self._remove(oldest, reason=reason)
+    
+    def __getitem__(self, conversation_id: str):
+        with self._lock:
+            now = self.clock()
+            self._maybe_sweep(now)
+            context, last_access, size = self._entries[conversation_id]
+            if self._expired(last_access, now):
+                self._remove(conversation_id, reason="ttl")
+                self._update_gauges()
+                raise KeyError(conversation_id)
+            self._entries[conversation_id] = (context, now, size)
+            self._entries.move_to_end(conversation_id)
+            return context
+    
+    def __setitem__(self, conversation_id: str, context):
+        with self._lock:
+            now = self.clock()
+            if conversation_id in self._entries:
+                self._remove(conversation_id)
+            size = estimate_context_bytes(context)
+            self._entries[conversation_id] = (context, now, size)
+            self._bytes += size
+            self._maybe_sweep(now)
+            self._enforce_limits(keep=conversation_id)
+            self._update_gauges()
+    
+    def __delitem__(self, conversation_id: str):
+        with self._lock:
+            self._remove(conversation_id)
+            self._update_gauges()
+    
+    def __contains__(self, conversation_id) -> bool:
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is None:
+                return False
+            if self._expired(entry[1], self.clock()):
+                self._remove(conversation_id, reason="ttl")
+                self._update_gauges()
+                return False
+            return True
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._update_gauges()
+    
+    def sweep(self) -> int:
+        with self._lock:
+            evicted = self._sweep(self.clock())
+            self._update_gauges()
+            return evicted
+    
+    def stats(self) -> Dict:
+        """Get store occupancy."""
+        return {
+            "conversations": len(self._entries),
+            "bytes": self._bytes,
+            "max_conversations": self.max_conversations,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class _WriteBatch:
+    """Writes committed together in one transaction."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Conversation store shared by all local API workers through SQLite.
+    
+    The database runs in WAL mode so readers never block the writer. Each
+    process keeps a hot LRU cache of decoded contexts tagged with the row
+    version; a read costs one indexed lookup that returns the row data only
+    if another worker has written a newer version. Writes are serialized on
+    the caller's thread and handed to a background writer that commits
+    everything queued within `flush_interval` in one transaction (group
+    commit). With `synchronous=True` (default) `save` returns once its
+    batch is committed, so the next turn is visible to every worker and no
+    sticky routing is needed; with `synchronous=False` writes are fully
+    write-behind and only this process sees them until the batch commits.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """
+    
+    def __init__(
+        self,
+        path: str = None,
+        cache_size: int = None,
+        flush_interval: float = None,
+        synchronous: bool = True,
+        idle_ttl: float = None,
+        sweep_interval: float = None,
+        on_evict: Callable[[str], None] = None,
+    ):
+        """
+        Initialize SQLite store.
+        
+        Args:
+            path: Database file shared by the workers
+            cache_size: Contexts kept decoded in this process
+            flush_interval: Seconds the writer waits to group writes
+            synchronous: Whether `save` waits for its batch to commit
+            idle_ttl: Seconds without a write before a conversation expires
+                (0 disables expiry)
+            sweep_interval: Seconds between expiry sweeps
+            on_evict: Called with the ID of every expired conversation
+        """
+        config = settings.chatbot
+        self.path = str(path or config.store_path or settings.data_dir / "conversations.db")
+        self.cache_size = config.store_cache_size if cache_size is None else cache_size
+        self.flush_interval = (
+            config.store_flush_interval if flush_interval is None else flush_interval
+        )
+        self.synchronous = synchronous
+        self.idle_ttl = config.store_idle_ttl if idle_ttl is None else idle_ttl
+        self.sweep_interval = (
+            config.store_sweep_interval if sweep_interval is None else sweep_interval
+        )
+        self.on_evict = on_evict
+        
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Tuple[Optional[int], object]]" = OrderedDict()
+        
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        # Taken from _pending by the writer, committed version not yet cached
+        self._committing: Set[str] = set()
+        self._batch = _WriteBatch()
+        self._closed = False
+        self._last_sweep = time.monotonic()
+        
+        self._connection().execute(self.SCHEMA)
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="conversation-store-writer",
+            daemon=True,
+        )
+        self._writer.start()
+        logger.info(f"Opened SQLite conversation store: {self.path}")
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    @staticmethod
+    def _decode(data: str):
+        from .manager import ChatContext
+        
+        return ChatContext.from_dict(json.loads(data))
+    
+    def _cache_put(self, conversation_id: str, version: Optional[int], context):
+        with self._lock:
+            self._cache[conversation_id] = (version, context)
+            self._cache.move_to_end(conversation_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _expired_before(self) -> float:
+        return time.time() - self.idle_ttl if self.idle_ttl > 0 else float("-inf")
+    
+    def __getitem__(self, conversation_id: str):
+        with self._lock:
+            cached = self._cache.get(conversation_id)
+            # Unflushed or in-flight local writes are newer than anything the
+            # database may return
+            if cached is not None and (
+                conversation_id in self._pending or conversation_id in self._committing
+            ):
+                self._cache.move_to_end(conversation_id)
+                return cached[1]
+        
+        cached_version = cached[0] if cached is not None and cached[0] is not None else -1
+        row = self._connection().execute(
+            "SELECT version, CASE WHEN version = ? THEN NULL ELSE data END "
+            "FROM conversations WHERE id = ? AND updated_at >= ?",
+            (cached_version, conversation_id, self._expired_before()),
+        ).fetchone()
+        
+        if row is None:
+            with self._lock:
+                self._cache.pop(conversation_id, None)
+            metrics.counter("chatbot_store_reads_total", result="miss").inc()
+            raise KeyError(conversation_id)
+        
+        version, data = row
+        if data is None:
+            metrics.counter("chatbot_store_reads_total", result="hit").inc()
+            with self._lock:
+                if conversation_id in self._cache:
+                    self._cache.move_to_end(conversation_id)
+            return cached[1]
+        
+        metrics.counter("chatbot_store_reads_total", result="load").inc()
+        context = self._decode(data)
+        self._cache_put(conversation_id, version, context)
+        return context
+    
+    def __setitem__(self, conversation_id: str, context):
+        self.save(conversation_id, context)
+    
+    def save(self, conversation_id: str, context):
+        """
+        Queue a context for the next group commit.
+        
+        Raises:
+            ChatbotError: If the store is closed or the commit fails
+        """
+        data = json.dumps(context.to_dict())
+        self._cache_put(conversation_id, None, context)
+        with self._cond:
+            if self._closed:
+                raise ChatbotError("Conversation store is closed")
+            self._pending[conversation_id] = (data, time.time())
+            batch = self._batch
+            self._cond.notify()
+        
+        if self.synchronous:
+            self._wait(batch)
+    
+    def _wait(self, batch: _WriteBatch):
+        batch.done.wait()
+        if batch.error is not None:
+            raise ChatbotError(f"Failed to save conversation: {str(batch.error)}")
+    
+    def flush(self):
+        """Wait until every queued write is committed."""
+        with self._cond:
+            if not self._pending:
+                return
+            batch = self._batch
+            self._cond.notify()
+        self._wait(batch)
+    
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait(timeout=self.sweep_interval)
+                    if time.monotonic() - self._last_sweep >= self.sweep_interval:
+                        break
+                if self._closed and not self._pending:
+                    return
+            
+            if self._pending and self.flush_interval > 0 and not self._closed:
+                time.sleep(self.flush_interval)  # let concurrent writes join the batch
+            
+            with self._cond, self._lock:
+                pending, self._pending = self._pending, {}
+                self._committing.update(pending)
+                batch, self._batch = self._batch, _WriteBatch()
+            
+            if pending:
+                self._commit(pending, batch)
+            if time.monotonic() - self._last_sweep >= self.sweep_interval:
+                try:
+                    self.sweep()
+                except sqlite3.Error as e:
+                    logger.warning(f"Conversation store sweep failed: {str(e)}")
+    
+    def _commit(self, pending: Dict[str, Tuple[str, float]], batch: _WriteBatch):
+        conn = self._connection()
+        versions = {}
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for conversation_id, (data, updated_at) in pending.items():
+                conn.execute(
+                    "INSERT INTO conversations (id, version, data, updated_at) VALUES (?, 1, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET version = version + 1, "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    (conversation_id, data, updated_at),
+                )
+                versions[conversation_id] = conn.execute(
+                    "SELECT version FROM conversations WHERE id = ?", (conversation_id,)
+                ).fetchone()[0]
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Conversation store commit failed: {str(e)}")
+            batch.error = e
+            with self._lock:
+                # The uncommitted contexts are not in the database; reload
+                # them from there unless a newer write is already queued
+                for conversation_id in pending:
+                    cached = self._cache.get(conversation_id)
+                    if cached is not None and cached[0] is None:
+                        if conversation_id not in self._pending:
+                            self._cache.pop(conversation_id)
+                self._committing.difference_update(pending)
+        else:
+            metrics.counter("chatbot_store_commits_total").inc()
+            metrics.histogram("chatbot_store_batch_size").observe(len(pending))
+            with self._lock:
+                for conversation_id, version in versions.items():
+                    cached = self._cache.get(conversation_id)
+                    # A context saved again during the commit is newer than this version
+                    if cached is not None and cached[0] is None and (
+                        conversation_id not in self._pending
+                    ):
+                        self._cache[conversation_id] = (version, cached[1])
+                self._committing.difference_update(pending)
+        finally:
+            batch.done.set()
+    
+    def __delitem__(self, conversation_id: str):
+        with self._cond:
+            was_pending = self._pending.pop(conversation_id, None) is not None
+        with self._lock:
+            self._cache.pop(conversation_id, None)
+        cursor = self._connection().execute(
+            "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+        )
+        if cursor.rowcount == 0 and not was_pending:
+            raise KeyError(conversation_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        self.flush()
+        rows = self._connection().execute(
+            "SELECT id FROM conversations WHERE updated_at >= ?", (self._expired_before(),)
+        ).fetchall()
+        return iter([row[0] for row in rows])
+    
+    def __len__(self) -> int:
+        self.flush()
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM conversations WHERE updated_at >= ?", (self._expired_before(),)
+        ).fetchone()[0]
+    
+    def clear(self):
+        with self._cond:
+            self._pending.clear()
+        with self._lock:
+            self._cache.clear()
+        self._connection().execute("DELETE FROM conversations")
+    
+    def sweep(self) -> int:
+        self._last_sweep = time.monotonic()
+        if self.idle_ttl <= 0:
+            return 0
+        
+        conn = self._connection()
+        cutoff = self._expired_before()
+        expired = [
+            row[0] for row in conn.execute(
+                "SELECT id FROM conversations WHERE updated_at < ?", (cutoff,)
+            ).fetchall()
+        ]
+        if not expired:
+            return 0
+        
+        conn.execute("DELETE FROM conversations WHERE updated_at < ?", (cutoff,))
+        for conversation_id in expired:
+            with self._lock:
+                self._cache.pop(conversation_id, None)
+            metrics.counter("chatbot_conversations_evicted_total", reason="ttl").inc()
+            if self.on_evict is not None:
+                self.on_evict(conversation_id)
+        return len(expired)
+    
+    def close(self):
+        """Commit queued writes and close database connections."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class _Codec:
+    """Compress serialized contexts with zlib or, when installed, zstd."""
+    
+    def __init__(self, name: str = "zlib", level: int = 3):
+        self.name = name
+        if name == "zstd":
+            try:
+                import zstandard
+                
+                self._compressor = zstandard.ZstdCompressor(level=level)
+                self._decompressor = zstandard.ZstdDecompressor()
+            except ImportError:
+                logger.warning("zstandard not installed (pip install zstandard); using zlib")
+                self.name = "zlib"
+        elif name != "zlib":
+            raise ValueError(f"Unknown compression: {name}")
+        self.level = level
+    
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self._compressor.compress(data)
+        return zlib.compress(data, self.level)
+    
+    def decompress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self._decompressor.decompress(data)
+        return zlib.decompress(data)
+
+
+class TieredConversationStore(ConversationStore):
+    """
+    Store that compresses idle conversations and spills them to disk.
+    
+    Conversations live in three tiers:
+    
+    - hot: live ChatContext objects, at most `max_conversations`
+    - warm: compressed JSON held in memory, up to `warm_max_bytes`
+    - cold: compressed JSON in a local SQLite file
+    
+    Conversations idle for `hot_idle` seconds (or pushed out of a full hot
+    tier) are compressed into the warm tier; when the warm tier is over its
+    byte limit the least recently used entries are spilled to disk. Any
+    lookup rehydrates the conversation back into the hot tier, so callers
+    see an ordinary mapping. Demotion happens in sweeps that run at most
+    every `sweep_interval` seconds as part of normal store operations.
+    """
+    
+    def __init__(
+        self,
+        max_conversations: int = None,
+        hot_idle: float = None,
+        warm_max_bytes: int = None,
+        spill_path: str = None,
+        compression: str = None,
+        sweep_interval: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize tiered store.
+        
+        Args:
+            max_conversations: Maximum live contexts in the hot tier (0 for no limit)
+            hot_idle: Seconds without access before a context is compressed
+            warm_max_bytes: Compressed bytes kept in memory before spilling
+                to disk (0 for no limit)
+            spill_path: SQLite file for spilled conversations ("{pid}" in
+                the configured path is replaced by the process ID)
+            compression: 'zlib' or 'zstd'
+            sweep_interval: Minimum seconds between demotion sweeps
+            clock: Monotonic time source
+        """
+        config = settings.chatbot
+        self.max_conversations = (
+            config.store_max_conversations if max_conversations is None else max_conversations
+        )
+        self.hot_idle = config.store_hot_idle if hot_idle is None else hot_idle
+        self.warm_max_bytes = (
+            config.store_warm_max_bytes if warm_max_bytes is None else warm_max_bytes
+        )
+        # Spilled data is private to this process, so each worker gets its own file
+        self.spill_path = str(
+            spill_path
+            or config.store_spill_path.format(pid=os.getpid())
+            or settings.data_dir / f"conversations_spill_{os.getpid()}.db"
+        )
+        self.sweep_interval = (
+            config.store_sweep_interval if sweep_interval is None else sweep_interval
+        )
+        self.codec = _Codec(compression or config.store_compression)
+        self.clock = clock
+        
+        self._hot: "OrderedDict[str, Tuple[object, float]]" = OrderedDict()
+        self._warm: "OrderedDict[str, bytes]" = OrderedDict()
+        self._warm_bytes = 0
+        self._cold = None  # opened on first spill
+        self._cold_count = 0
+        self._last_sweep = clock()
+        self._lock = threading.RLock()
+    
+    def _cold_db(self) -> sqlite3.Connection:
+        if self._cold is None:
+            Path(self.spill_path).parent.mkdir(parents=True, exist_ok=True)
+            self._cold = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._cold.execute(
+                "CREATE TABLE IF NOT EXISTS spilled (id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+            self._cold.execute("DELETE FROM spilled")  # contents belong to a previous process
+            self._cold.commit()
+            logger.info(f"Spilling idle conversations to {self.spill_path}")
+        return self._cold
+    
+    def _encode(self, context) -> bytes:
+        return self.codec.compress(json.dumps(context.to_dict()).encode("utf-8"))
+    
+    def _decode(self, data: bytes):
+        from .manager import ChatContext
+        
+        return ChatContext.from_dict(json.loads(self.codec.decompress(data)))
+    
+    def _moved(self, source: str, target: str, count: int = 1):
+        metrics.counter("chatbot_store_tier_moves_total", source=source, target=target).inc(count)
+    
+    def _update_gauges(self):
+        metrics.gauge("chatbot_conversations_live", tier="hot").set(len(self._hot))
+        metrics.gauge("chatbot_conversations_live", tier="warm").set(len(self._warm))
+        metrics.gauge("chatbot_conversations_live", tier="cold").set(self._cold_count)
+        metrics.gauge("chatbot_conversations_bytes", tier="warm").set(self._warm_bytes)
+    
+    def _demote(self, conversation_id: str):
+        context, _ = self._hot.pop(conversation_id)
+        data = self._encode(context)
+        self._warm[conversation_id] = data
+        self._warm_bytes += len(data)
+        self._moved("hot", "warm")
+    
+    def _spill(self):
+        spilled = []
+        while self.warm_max_bytes and self._warm_bytes > self.warm_max_bytes and self._warm:
+            conversation_id, data = self._warm.popitem(last=False)
+            self._warm_bytes -= len(data)
+            spilled.append((conversation_id, data))
+        if spilled:
+            db = self._cold_db()
+            db.executemany("INSERT OR REPLACE INTO spilled (id, data) VALUES (?, ?)", spilled)
+            db.commit()
+            self._cold_count += len(spilled)
+            self._moved("warm", "cold", len(spilled))
+    
+    def _take_cold(self, conversation_id: str) -> Optional[bytes]:
+        if not self._cold_count:
+            return None
+        db = self._cold_db()
+        row = db.execute("SELECT data FROM spilled WHERE id = ?", (conversation_id,)).fetchone()
+        if row is None:
+            return None
+        db.execute("DELETE FROM spilled WHERE id = ?", (conversation_id,))
+        db.commit()
+        self._cold_count -= 1
+        return row[0]
+    
+    def _sweep(self, now: float) -> int:
+        self._last_sweep = now
+        idle = [
+            conversation_id
+            for conversation_id, (_, last_access) in self._hot.items()
+            if self.hot_idle > 0 and now - last_access > self.hot_idle
+        ]
+        for conversation_id in idle:
+            self._demote(conversation_id)
+        self._spill()
+        self._update_gauges()
+        return len(idle)
+    
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+    
+    def __getitem__(self, conversation_id: str):
+        with self._lock:
+            now = self.clock()
+            entry = self._hot.get(conversation_id)
+            if entry is not None:
+                self._hot[conversation_id] = (entry[0], now)
+                self._hot.move_to_end(conversation_id)
+                self._maybe_sweep(now)
+                return entry[0]
+            
+            data = self._warm.pop(conversation_id, None)
+            if data is not None:
+                self._warm_bytes -= len(data)
+                self._moved("warm", "hot")
+            else:
+                data = self._take_cold(conversation_id)
+                if data is None:
+                    raise KeyError(conversation_id)
+                self._moved("cold", "hot")
+            
+            context = self._decode(data)
+            self._put_hot(conversation_id, context, now)
+            return context
+    
+    def _put_hot(self, conversation_id: str, context, now: float):
+        self._hot[conversation_id] = (context, now)
+        self._hot.move_to_end(conversation_id)
+        while self.max_conversations and len(self._hot) > self.max_conversations:
+            self._demote(next(iter(self._hot)))
+        self._maybe_sweep(now)
+        self._spill()
+        self._update_gauges()
+    
+    def __setitem__(self, conversation_id: str, context):
+        with self._lock:
+            self._discard_cold_copies(conversation_id)
+            self._put_hot(conversation_id, context, self.clock())
+    
+    def _discard_cold_copies(self, conversation_id: str) -> bool:
+        data = self._warm.pop(conversation_id, None)
+        if data is not None:
+            self._warm_bytes -= len(data)
+            return True
+        return self._take_cold(conversation_id) is not None
+    
+    def __delitem__(self, conversation_id: str):
+        with self._lock:
+            found = self._hot.pop(conversation_id, None) is not None
+            found = self._discard_cold_copies(conversation_id) or found
+            self._update_gauges()
+            if not found:
+                raise KeyError(conversation_id)
+    
+    def __contains__(self, conversation_id) -> bool:
+        with self._lock:
+            if conversation_id in self._hot or conversation_id in self._warm:
+                return True
+            if not self._cold_count:
+                return False
+            return self._cold_db().execute(
+                "SELECT 1 FROM spilled WHERE id = ?", (conversation_id,)
+            ).fetchone() is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            ids = list(self._hot) + list(self._warm)
+            if self._cold_count:
+                ids.extend(row[0] for row in self._cold_db().execute("SELECT id FROM spilled"))
+            return iter(ids)
+    
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._warm) + self._cold_count
+    
+    def clear(self):
+        with self._lock:
+            self._hot.clear()
+            self._warm.clear()
+            self._warm_bytes = 0
+            if self._cold is not None:
+                self._cold.execute("DELETE FROM spilled")
+                self._cold.commit()
+            self._cold_count = 0
+            self._update_gauges()
+    
+    def sweep(self) -> int:
+        """
+        Compress idle conversations and spill the warm tier if over budget.
+        
+        Returns:
+            Number of conversations moved out of the hot tier
+        """
+        with self._lock:
+            return self._sweep(self.clock())
+    
+    def stats(self) -> Dict:
+        """Get per-tier occupancy."""
+        return {
+            "hot": len(self._hot),
+            "warm": len(self._warm),
+            "warm_bytes": self._warm_bytes,
+            "cold": self._cold_count,
+            "compression": self.codec.name,
+        }
+    
+    def close(self):
+        """Close the spill database."""
+        with self._lock:
+            if self._cold is not None:
+                self._cold.close()
+                self._cold = None
+
+
+def get_conversation_store(store_type: str = None, **kwargs) -> ConversationStore:
+    """
+    Factory function to get conversation store.
+    
+    Args:
+        store_type: Type of store ('memory', 'sqlite' or 'tiered')
+        **kwargs: Store-specific options (`on_evict` is ignored by the
+            tiered store, which never evicts)
+    
+    Returns:
+        ConversationStore instance
+    """
+    store_type = store_type or settings.chatbot.store_type
+    
+    if store_type == "memory":
+        return InMemoryConversationStore(**kwargs)
+    elif store_type == "sqlite":
+        return SQLiteConversationStore(**kwargs)
+    elif store_type == "tiered":
+        # Tiered stores never drop conversations, so there is nothing to report
+        kwargs.pop("on_evict", None)
+        return TieredConversationStore(**kwargs)
+    else:
+        raise ValueError(f"Unknown conversation store type: {store_type}")
@@ -0,0 +1,161 @@
+"""Rolling conversation summarization."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from ..utils.logger import get_logger
+from ..config.settings import settings
+from ..llm.manager import LLMManager, Message
+from .prompt import Tokenizer, get_tokenizer
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below in a few sentences. Keep names, facts, "
+    "decisions, and open questions; drop pleasantries. If a previous summary "
+    "is given, fold it into the new one."
+)
+
+
+def _message_key(message) -> Tuple:
+    return (message.role, message.content, message.created_at)
+
+
+class ConversationSummarizer:
+    """
+    Compact older conversation turns into a running summary.
+    
+    Once a conversation's history passes the token threshold, all but the
+    most recent messages are summarized by the LLM in a background thread.
+    The result is applied at the start of the conversation's next turn,
+    on the request thread, so the context is never mutated concurrently.
+    """
+    
+    def __init__(
+        self,
+        llm_manager: LLMManager,
+        tokenizer: Tokenizer = None,
+        trigger_tokens: int = None,
+        keep_recent: int = None,
+        max_workers: int = 2,
+    ):
+        """
+        Initialize summarizer.
+        
+        Args:
+            llm_manager: LLM manager used to write summaries
+            tokenizer: Tokenizer used to measure history size
+            trigger_tokens: History size that triggers summarization
+            keep_recent: Number of recent messages never summarized
+            max_workers: Background summarization threads
+        """
+        self.llm_manager = llm_manager
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.trigger_tokens = trigger_tokens or settings.chatbot.summary_trigger_tokens
+        self.keep_recent = keep_recent or settings.chatbot.summary_keep_recent
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="summarizer",
+        )
+        self._pending: Dict[str, Tuple[Future, List]] = {}
+        self._lock = threading.Lock()
+    
+    def history_tokens(self, context) -> int:
+        """Count tokens in a context's summary and messages."""
+        count = self.tokenizer.count_tokens
+        return count(context.summary or "") + sum(count(msg.content) for msg in context.messages)
+    
+    def maybe_summarize(self, context) -> Optional[Future]:
+        """
+        Schedule summarization if the history has grown past the threshold.
+        
+        Args:
+            context: Chat context to check
+        
+        Returns:
+            Future for the scheduled summary, or None if nothing was scheduled
+        """
+        if len(context.messages) <= self.keep_recent:
+            return None
+        
+        over_budget = self.history_tokens(context) > self.trigger_tokens
+        # Summarize before max_history trimming would silently drop turns
+        near_cap = len(context.messages) >= settings.chatbot.max_history
+        if not (over_budget or near_cap):
+            return None
+        
+        with self._lock:
+            if context.conversation_id in self._pending:
+                return None
+            
+            older = list(context.messages)[:-self.keep_recent]
+            future = self._executor.submit(self._summarize, context.summary, older)
+            self._pending[context.conversation_id] = (future, older)
+        
+        logger.debug(
+            f"Scheduled conversation summary",
+            extra={"conversation_id": context.conversation_id, "num_messages": len(older)},
+        )
+        return future
+    
+    def apply_pending(self, context) -> bool:
+        """
+        Apply a finished summary to the context.
+        
+        Args:
+            context: Chat context to update
+        
+        Returns:
+            True if the context was compacted
+        """
+        with self._lock:
+            pending = self._pending.get(context.conversation_id)
+            if pending is None or not pending[0].done():
+                return False
+            del self._pending[context.conversation_id]
+        
+        future, summarized = pending
+        try:
+            summary = future.result()
+        except Exception as e:
+            logger.warning(f"Conversation summarization failed: {str(e)}")
+            return False
+        
+        # Some of these may already have been trimmed by max_history. Match by
+        # value: a shared store may have reloaded the context since scheduling.
+        summarized_keys = {_message_key(msg) for msg in summarized}
+        remaining = [msg for msg in context.messages if _message_key(msg) not in summarized_keys]
+        context.messages.clear()
+        context.messages.extend(remaining)
+        context.summary = summary
+        return True
+    
+    def discard(self, conversation_id: str):
+        """Forget any pending summary for a conversation."""
+        with self._lock:
+            pending = self._pending.pop(conversation_id, None)
+        if pending is not None:
+            pending[0].cancel()
+    
+    def _summarize(self, previous_summary: Optional[str], messages: List) -> str:
+        """Write a new running summary with the LLM."""
+        transcript = "\n".join(f"{msg.role}: {msg.content}" for msg in messages)
+        prompt = f"Conversation:\n{transcript}"
+        if previous_summary:
+            prompt = f"Previous summary:\n{previous_summary}\n\n{prompt}"
+        
+        response = self.llm_manager.chat(
+            [
+                Message(role="system", content=SUMMARY_INSTRUCTIONS),
+                Message(role="user", content=prompt),
+            ],
+            max_tokens=settings.chatbot.summary_max_tokens,
+            priority="batch",
+        )
+        return response.content.strip()
+    
+    def shutdown(self, wait: bool = True):
+        """Stop background summarization threads."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,89 @@
+"""Precompiled system prompt templates for the chatbot."""
+
+from functools import lru_cache
+from typing import Dict, Optional
+from dataclasses import dataclass
+
+
+PERSONALITY_PROMPTS = {
+    "professional": "You are a professional, helpful AI assistant.",
+    "friendly": "You are a friendly and conversational AI assistant.",
+    "formal": "You are a formal and respectful AI assistant.",
+}
+
+RESPONSE_INSTRUCTIONS = "Provide helpful, accurate, and relevant responses."
+
+
+@dataclass(frozen=True)
+class SystemPromptTemplate:
+    """
+    System prompt split into a stable prefix and slower-changing sections.
+    
+    The prefix (personality and instructions) is byte-identical for every
+    turn of every conversation with the same personality, so providers
+    that cache prompt prefixes can reuse it. Only the running summary
+    follows it in the system message; it changes when older turns are
+    compacted, not on every turn. The detected intent and entities change
+    every turn, so they are rendered as turn notes that the prompt builder
+    places in the latest user message, after the history, along with the
+    retrieved documents.
+    """
+    personality: str
+    stable_prefix: str
+    
+    @property
+    def stable_prefix_length(self) -> int:
+        """Length of the stable prefix in characters."""
+        return len(self.stable_prefix)
+    
+    def render(self, summary: Optional[str] = None) -> str:
+        """
+        Render the system prompt.
+        
+        Args:
+            summary: Summary of the earlier conversation
+        
+        Returns:
+            System prompt starting with `stable_prefix`
+        """
+        if summary:
+            return f"{self.stable_prefix}\n\nSummary of the earlier conversation:\n{summary}"
+        return self.stable_prefix
+    
+    @staticmethod
+    def render_turn_notes(intent: Optional[str] = None, entities: Optional[Dict] = None) -> str:
+        """
+        Render the per-turn notes sent with the latest user message.
+        
+        Args:
+            intent: Detected intent
+            entities: Extracted entities
+        
+        Returns:
+            Notes text (empty when there is nothing to note)
+        """
+        parts = []
+        if intent:
+            parts.append(f"The user's intent is: {intent}")
+        if entities:
+            parts.append(f"Extracted entities: {entities}")
+        return "\n".join(parts)
+
+
+@lru_cache(maxsize=None)
+def get_system_prompt_template(personality: str) -> SystemPromptTemplate:
+    """
+    Get the compiled template for a personality.
+    
+    Args:
+        personality: Personality name (unknown names use 'professional')
+    
+    Returns:
+        SystemPromptTemplate instance
+    """
+    if personality not in PERSONALITY_PROMPTS:
+        personality = "professional"
+    return SystemPromptTemplate(
+        personality=personality,
+        stable_prefix=f"{PERSONALITY_PROMPTS[personality]}\n\n{RESPONSE_INSTRUCTIONS}",
+    )
@@ -5,7 +5,7 @@ Supports environment-based configuration for development, staging, and productio
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from pathlib import Path
 
 
@@ -28,10 +28,51 @@ class LLMConfig:
     provider: str = os.getenv("LLM_PROVIDER", "openai")  # openai, anthropic, local
     model_name: str = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
     api_key: str = os.getenv("LLM_API_KEY", "")
+    base_url: str = os.getenv("LLM_BASE_URL", "")  # e.g. a local mock server
+    # Per-provider overrides (LLM_<PROVIDER>_API_KEY / LLM_<PROVIDER>_BASE_URL) so
+    # routed backends can each use their own account and endpoint
+    provider_api_keys: Dict[str, str] = field(default_factory=lambda: {
+        provider: os.getenv(f"LLM_{provider.upper()}_API_KEY", "")
+        for provider in ("openai", "anthropic")
+    })
+    provider_base_urls: Dict[str, str] = field(default_factory=lambda: {
+        provider: os.getenv(f"LLM_{provider.upper()}_BASE_URL", "")
+        for provider in ("openai", "anthropic")
+    })
     temperature: float = 0.7
     max_tokens: int = 2048
     top_p: float = 0.9
     timeout: int = 30
+    # Multi-provider routing ("provider" or "provider:model" entries)
+    routing_providers: List[str] = field(default_factory=lambda: [
+        p.strip() for p in os.getenv("LLM_ROUTING_PROVIDERS", "openai,anthropic").split(",")
+        if p.strip()
+    ])
+    routing_weights: Dict[str, float] = field(default_factory=dict)
+    routing_ewma_alpha: float = 0.2
+    routing_error_penalty: float = 4.0
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    # Client-side rate limits shared by all managers (0 disables)
+    requests_per_minute: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", 0))
+    tokens_per_minute: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", 0))
+    scheduler_max_queue: int = 256
+    
+    def credentials(self, provider: str) -> Tuple[str, str]:
+        """
+        Get the API key and base URL for a provider.
+        
+        Args:
+            provider: Provider name ('openai', 'anthropic')
+        
+        Returns:
+            (api_key, base_url), falling back to LLM_API_KEY / LLM_BASE_URL
+            for values the provider does not override
+        """
+        return (
+            self.provider_api_keys.get(provider) or self.api_key,
+            self.provider_base_urls.get(provider) or self.base_url,
+        )
 
 
 @dataclass
@@ -75,6 +116,31 @@ class IntentConfig:
     num_labels: int = 10
     confidence_threshold: float = 0.5
     batch_size: int = 32
+    # LRU cache of predictions keyed on normalized text (0 disables)
+    cache_size: int = int(os.getenv("INTENT_CACHE_SIZE", "4096"))
+    # Labels scored by zero-shot classification
+    candidate_labels: List[str] = field(default_factory=lambda: [
+        label.strip()
+        for label in os.getenv(
+            "INTENT_LABELS", "greeting,question,request,statement,command"
+        ).split(",")
+        if label.strip()
+    ])
+    hypothesis_template: str = "This example is {}."
+    # Score each label independently and report all labels above confidence_threshold
+    multi_label: bool = os.getenv("INTENT_MULTI_LABEL", "false").lower() == "true"
+    # Embedding classifier: example utterances per intent (JSON) and encoder
+    embedding_model: str = os.getenv(
+        "INTENT_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+    )
+    examples_path: str = os.getenv("INTENT_EXAMPLES_PATH", "")
+    similarity_temperature: float = 0.05
+    # Linear classifier: .npz artifact written by scripts/train_intent.py
+    linear_model_path: str = os.getenv("INTENT_LINEAR_MODEL_PATH", "models/intent_linear.npz")
+    # Dummy classifier keyword rules (JSON: intent -> keywords, highest priority first)
+    rules_path: str = os.getenv("INTENT_RULES_PATH", "")
+    # Cascade classifier: fast first stage, transformer for low-confidence messages
+    cascade_first_stage: str = os.getenv("INTENT_CASCADE_FIRST_STAGE", "dummy")
 
 
 @dataclass
@@ -82,10 +148,23 @@ class EntityConfig:
     """Entity extraction configuration."""
     model_type: str = os.getenv("ENTITY_MODEL", "transformer")  # transformer, spacy
     model_name: str = os.getenv("ENTITY_MODEL_NAME", "distilbert-base-uncased")
+    # Requested entity types; with only structured types the hybrid extractor skips the model
     entity_types: List[str] = field(default_factory=lambda: [
-        "PERSON", "ORG", "GPE", "DATE", "TIME", "MONEY", "QUANTITY", "LOCATION"
+        label.strip()
+        for label in os.getenv(
+            "ENTITY_TYPES", "PERSON,ORG,GPE,DATE,TIME,MONEY,QUANTITY,LOCATION,EMAIL,URL"
+        ).split(",")
+        if label.strip()
     ])
+    # Locale of the structured entity patterns (en, fr, de)
+    locale: str = os.getenv("ENTITY_LOCALE", "en")
     confidence_threshold: float = 0.5
+    batch_size: int = int(os.getenv("ENTITY_BATCH_SIZE", "32"))
+    # Long documents: tokens per window and tokens shared by neighbouring windows
+    window_tokens: int = int(os.getenv("ENTITY_WINDOW_TOKENS", "384"))
+    window_overlap: int = int(os.getenv("ENTITY_WINDOW_OVERLAP", "64"))
+    # Dummy extractor gazetteer (JSON: label -> terms)
+    rules_path: str = os.getenv("ENTITY_RULES_PATH", "")
 
 
 @dataclass
@@ -93,9 +172,55 @@ class ChatbotConfig:
     """Chatbot configuration."""
     max_history: int = 10
     context_window: int = 5
-    response_timeout: int = 30
+    response_timeout: float = float(os.getenv("CHATBOT_RESPONSE_TIMEOUT", 30))
+    # Deadline handling: share of the remaining budget for intent/entity/RAG,
+    # and the generation speed used to size max_tokens for the time left. The
+    # defaults fit llm.max_tokens within response_timeout, so only turns whose
+    # stages ran long generate shorter answers
+    stage_budget_fraction: float = 0.3
+    llm_first_token_seconds: float = 1.0
+    llm_tokens_per_second: float = float(os.getenv("CHATBOT_LLM_TOKENS_PER_SECOND", 100))
+    min_llm_tokens: int = 32
     enable_logging: bool = True
     personality: str = "professional"  # professional, friendly, formal
+    # JSON file with intent-gated stage rules (see src/chatbot/pipeline.py)
+    pipeline_config: str = os.getenv("CHATBOT_PIPELINE_CONFIG", "")
+    # Run intent, entity and RAG stages concurrently
+    parallel_stages: bool = os.getenv("CHATBOT_PARALLEL_STAGES", "true").lower() == "true"
+    stage_workers: int = 8
+    # Reuse answers to identical first-turn questions
+    enable_answer_cache: bool = os.getenv("CHATBOT_ENABLE_ANSWER_CACHE", "false").lower() == "true"
+    answer_cache_ttl: float = float(os.getenv("CHATBOT_ANSWER_CACHE_TTL", 3600))
+    answer_cache_size: int = 1024
+    # Conversations processed concurrently by ChatbotManager.process_batch
+    batch_concurrency: int = int(os.getenv("CHATBOT_BATCH_CONCURRENCY", 8))
+    # Prompt assembly (context_window caps older history messages per prompt)
+    prompt_token_budget: int = int(os.getenv("CHATBOT_PROMPT_TOKEN_BUDGET", 3000))
+    rag_max_documents: int = 3
+    tokenizer: str = os.getenv("CHATBOT_TOKENIZER", "approximate")  # approximate, huggingface
+    tokenizer_name: str = os.getenv("CHATBOT_TOKENIZER_NAME", "gpt2")
+    # Rolling summarization of older turns
+    enable_summarization: bool = (
+        os.getenv("CHATBOT_ENABLE_SUMMARIZATION", "false").lower() == "true"
+    )
+    summary_trigger_tokens: int = 1000
+    summary_keep_recent: int = 4
+    summary_max_tokens: int = 256
+    # Conversation store (0 disables a limit)
+    store_type: str = os.getenv("CHATBOT_STORE", "memory")  # memory, sqlite, tiered
+    store_max_conversations: int = int(os.getenv("CHATBOT_STORE_MAX_CONVERSATIONS", 10000))
+    store_max_bytes: int = int(os.getenv("CHATBOT_STORE_MAX_BYTES", 256 * 1024 * 1024))
+    store_idle_ttl: float = float(os.getenv("CHATBOT_STORE_IDLE_TTL", 3600))
+    store_sweep_interval: float = 60.0
+    # SQLite store shared by API workers (defaults to data/conversations.db)
+    store_path: str = os.getenv("CHATBOT_STORE_PATH", "")
+    store_cache_size: int = 1000
+    store_flush_interval: float = 0.005
+    # Tiered store: compress idle conversations, spill to disk past warm_max_bytes
+    store_hot_idle: float = float(os.getenv("CHATBOT_STORE_HOT_IDLE", 300))
+    store_warm_max_bytes: int = int(os.getenv("CHATBOT_STORE_WARM_MAX_BYTES", 256 * 1024 * 1024))
+    store_compression: str = os.getenv("CHATBOT_STORE_COMPRESSION", "zlib")  # zlib, zstd
+    store_spill_path: str = os.getenv("CHATBOT_STORE_SPILL_PATH", "")
 
 
 @dataclass
@@ -1,17 +1,28 @@
 """Entity extraction and Named Entity Recognition (NER) module."""
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from ..utils.logger import get_logger
 from ..utils.validators import validate_text
-from ..utils.exceptions import ProcessingError, ModelNotFoundError
+from ..utils.exceptions import BatchProcessingError, ProcessingError, ModelNotFoundError
+from ..preprocessing.keywords import KeywordMatcher, load_keyword_rules
+from .patterns import STRUCTURED_LABELS, compile_patterns, find_structured
 from ..config.settings import settings
 
 
 logger = get_logger(__name__, level=settings.log_level)
 
 
+# Gazetteer for the dummy extractor
+DEFAULT_ENTITY_KEYWORDS = {
+    "PERSON": ["john", "mary", "bob", "alice"],
+    "ORG": ["company", "corporation", "microsoft", "apple"],
+    "GPE": ["new york", "london", "paris", "tokyo"],
+}
+
+
 @dataclass
 class Entity:
     """Extracted entity."""
@@ -34,6 +45,15 @@ class ExtractionResult:
             self.metadata = {}
 
 
+@dataclass
+class _Window:
+    """A slice of a long document and the offsets whose entities it owns."""
+    offset: int
+    text: str
+    own_start: int
+    own_end: Optional[int]
+
+
 class EntityExtractor(ABC):
     """Base class for entity extraction."""
     
@@ -90,17 +110,250 @@ class EntityExtractor(ABC):
             logger.error(f"Entity extraction failed: {str(e)}")
             raise ProcessingError(f"Entity extraction failed: {str(e)}")
     
-    def batch_extract(self, texts: List[str]) -> List[ExtractionResult]:
+    def _extract_batch(self, texts: List[str]) -> List[ExtractionResult]:
+        """Extract entities for a batch of validated texts (override to batch)."""
+        return [self._extract(text) for text in texts]
+    
+    def batch_extract(self, texts: List[str], batch_size: int = None) -> List[ExtractionResult]:
         """
         Extract entities from multiple texts.
         
+        Texts are validated up front and grouped into length buckets:
+        sorted by length and cut into batches of `batch_size`, so each
+        model batch holds similarly sized inputs (less padding). Results are
+        returned in input order with offsets relative to each input. If a
+        batch fails, its items are retried one by one so a bad input only
+        fails itself.
+        
         Args:
             texts: List of input texts
+            batch_size: Texts per model call (defaults to settings)
         
         Returns:
             List of extraction results
+        
+        Raises:
+            BatchProcessingError: If any item fails; `results` holds the
+                extractions for the other items and `errors` the failures
+        """
+        batch_size = batch_size or settings.entity.batch_size
+        results: List[ExtractionResult] = [None] * len(texts)
+        errors = {}
+        
+        valid = []
+        for index, text in enumerate(texts):
+            try:
+                valid.append((index, validate_text(text)))
+            except Exception as e:
+                errors[index] = e
+        valid.sort(key=lambda item: len(item[1]))
+        
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            try:
+                extractions = self._extract_batch([text for _, text in chunk])
+                for (index, _), result in zip(chunk, extractions):
+                    results[index] = result
+            except Exception as e:
+                logger.warning(f"Entity batch failed, retrying items individually: {str(e)}")
+                for index, text in chunk:
+                    try:
+                        results[index] = self._extract(text)
+                    except Exception as item_error:
+                        errors[index] = item_error
+        
+        logger.info(
+            f"Batch entity extraction completed",
+            extra={
+                "num_texts": len(texts),
+                "batch_size": batch_size,
+                "num_errors": len(errors),
+            }
+        )
+        
+        if errors:
+            raise BatchProcessingError(
+                f"Entity extraction failed for {len(errors)} of {len(texts)} texts",
+                results=results,
+                errors=errors,
+            )
+        return results
+    
+    # Documents are read in pieces of this many characters when windowing
+    DOCUMENT_CHUNK_CHARS = 65536
+    
+    def _token_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Character offsets of the tokens used to size windows (override per model)."""
+        return [match.span() for match in re.finditer(r"\S+", text)]
+    
+    def _windows(
+        self, chunks: Iterable[str], window_tokens: int, overlap_tokens: int
+    ) -> Iterator[_Window]:
+        """
+        Cut a stream of text into overlapping token windows.
+        
+        Only a tail shorter than one window is buffered between chunks.
+        Overlaps are split at their middle token: each window owns the
+        entities that start between its two split points.
+        """
+        step = window_tokens - overlap_tokens
+        buffer, buffer_offset, own_start = "", 0, 0
+        chunks = iter(chunks)
+        final = False
+        
+        while not final:
+            chunk = next(chunks, None)
+            final = chunk is None
+            buffer += chunk or ""
+            spans = self._token_spans(buffer)
+            if not final and spans and spans[-1][1] == len(buffer):
+                spans.pop()  # may continue in the next chunk
+            
+            i = 0
+            while len(spans) - i >= window_tokens or (final and i < len(spans)):
+                j = min(i + window_tokens, len(spans))
+                last = final and j == len(spans)
+                own_end = None
+                if not last:
+                    middle = (i + step + j) // 2
+                    # Without overlap the split point is the window end
+                    split = spans[middle][0] if middle < j else spans[j - 1][1]
+                    own_end = buffer_offset + split
+                yield _Window(
+                    offset=buffer_offset + spans[i][0],
+                    text=buffer[spans[i][0]:spans[j - 1][1]],
+                    own_start=own_start,
+                    own_end=own_end,
+                )
+                if last:
+                    break
+                own_start = own_end
+                i += step
+            
+            if i:
+                # Keep only the text the next window starts from
+                cut = spans[i][0] if i < len(spans) else spans[-1][1]
+                buffer, buffer_offset = buffer[cut:], buffer_offset + cut
+    
+    @staticmethod
+    def _merge(previous: Entity, entity: Entity) -> Entity:
+        """
+        Resolve two overlapping spans from neighbouring windows.
+        
+        Both texts are source slices at their offsets, so the merged text
+        is the document text between the merged offsets.
+        """
+        if previous.label != entity.label:
+            return previous if previous.confidence >= entity.confidence else entity
+        if entity.end <= previous.end:
+            return Entity(
+                previous.text, previous.label, previous.start, previous.end,
+                max(previous.confidence, entity.confidence),
+            )
+        return Entity(
+            text=previous.text + entity.text[previous.end - entity.start:],
+            label=previous.label,
+            start=previous.start,
+            end=entity.end,
+            confidence=max(previous.confidence, entity.confidence),
+        )
+    
+    def stream_entities(
+        self,
+        document: Union[str, Iterable[str]],
+        window_tokens: int = None,
+        overlap_tokens: int = None,
+        batch_size: int = None,
+    ) -> Iterator[Entity]:
+        """
+        Extract entities from a document of any size.
+        
+        The document is split into overlapping token windows, which are
+        extracted `batch_size` windows at a time. Entities get document
+        offsets; duplicates from overlap regions are dropped and spans cut
+        by a window edge are merged. Entities are yielded in document order
+        as soon as their windows are done, so memory stays bounded.
+        
+        Args:
+            document: Full text, or an iterable of text pieces (e.g. a file)
+            window_tokens: Tokens per window (defaults to settings)
+            overlap_tokens: Tokens shared by neighbouring windows (defaults to settings)
+            batch_size: Windows per model call (defaults to settings)
+        
+        Yields:
+            Entities with document-level offsets
+        
+        Raises:
+            ProcessingError: If extraction fails
+        """
+        window_tokens = window_tokens or settings.entity.window_tokens
+        if overlap_tokens is None:
+            overlap_tokens = settings.entity.window_overlap
+        batch_size = batch_size or settings.entity.batch_size
+        if not 0 <= overlap_tokens < window_tokens:
+            raise ValueError("overlap_tokens must be smaller than window_tokens")
+        chunks = document
+        if isinstance(document, str):
+            size = self.DOCUMENT_CHUNK_CHARS
+            chunks = (document[i:i + size] for i in range(0, len(document), size))
+        
+        def run(batch: List[_Window]) -> List[Entity]:
+            try:
+                results = self._extract_batch([window.text for window in batch])
+            except Exception as e:
+                logger.error(f"Document entity extraction failed: {str(e)}")
+                raise ProcessingError(f"Document entity extraction failed: {str(e)}")
+            owned = []
+            for window, result in zip(batch, results):
+                for entity in result.entities:
+                    start = window.offset + entity.start
+                    if start < window.own_start or (
+                        window.own_end is not None and start >= window.own_end
+                    ):
+                        continue
+                    # Take the text from the source so that merging spans cut
+                    # by a window edge stays aligned with the offsets
+                    owned.append(Entity(
+                        window.text[entity.start:entity.end], entity.label, start,
+                        window.offset + entity.end, entity.confidence,
+                    ))
+            return sorted(owned, key=lambda e: (e.start, -e.end))
+        
+        previous = None
+        batch: List[_Window] = []
+        windows = self._windows(chunks, window_tokens, overlap_tokens)
+        while True:
+            window = next(windows, None)
+            if window is not None:
+                batch.append(window)
+                if len(batch) < batch_size:
+                    continue
+            for entity in run(batch) if batch else []:
+                if previous is not None and entity.start < previous.end:
+                    previous = self._merge(previous, entity)
+                    continue
+                if previous is not None:
+                    yield previous
+                previous = entity
+            batch = []
+            if window is None:
+                break
+        
+        if previous is not None:
+            yield previous
+    
+    def extract_document(self, text: str, **kwargs) -> ExtractionResult:
         """
-        return [self.extract(text) for text in texts]
+        Extract entities from a long document (no length limit).
+        
+        Args:
+            text: Document text
+            **kwargs: Window options for `stream_entities`
+        
+        Returns:
+            Extraction result with document-level offsets
+        """
+        return ExtractionResult(text, list(self.stream_entities(text, **kwargs)))
 
 
 class TransformerEntityExtractor(EntityExtractor):
@@ -125,79 +378,215 @@ class TransformerEntityExtractor(EntityExtractor):
         except Exception as e:
             raise ModelNotFoundError(f"Failed to load model {self.model_name}: {str(e)}")
     
+    def _token_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Character offsets of the model's tokens (needs a fast tokenizer)."""
+        encoding = self.model.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True
+        )
+        return [tuple(span) for span in encoding["offset_mapping"]]
+    
     def _extract(self, text: str) -> ExtractionResult:
         """Extract entities using transformer model."""
-        entities = []
-        
+        return self._extract_batch([text])[0]
+    
+    def _extract_batch(self, texts: List[str]) -> List[ExtractionResult]:
+        """Run the NER pipeline once over a batch and filter spans by score."""
         if not self.model:
-            return ExtractionResult(text, entities)
-        
-        predictions = self.model(text)
-        
-        for pred in predictions:
-            # Filter by confidence threshold
-            if pred.get("score", 0) >= settings.entity.confidence_threshold:
-                entities.append(
-                    Entity(
-                        text=pred["word"].strip(),
-                        label=pred["entity_group"],
-                        start=pred.get("start", 0),
-                        end=pred.get("end", 0),
-                        confidence=pred.get("score", 1.0),
-                    )
+            return [ExtractionResult(text, []) for text in texts]
+        
+        import numpy as np
+        
+        predictions = self.model(texts, batch_size=len(texts))
+        if len(texts) == 1 and predictions and isinstance(predictions[0], dict):
+            predictions = [predictions]
+        
+        # Flatten all spans so the threshold is applied in one vector op
+        spans = [(row, pred) for row, preds in enumerate(predictions) for pred in preds]
+        scores = np.fromiter(
+            (pred.get("score", 0.0) for _, pred in spans), dtype=np.float32, count=len(spans)
+        )
+        keep = np.flatnonzero(scores >= settings.entity.confidence_threshold)
+        
+        entities: List[List[Entity]] = [[] for _ in texts]
+        for i in keep:
+            row, pred = spans[i]
+            start, end = pred.get("start"), pred.get("end")
+            # Offsets are relative to this input; prefer the source text over
+            # the detokenized word, which loses casing and spacing
+            word = texts[row][start:end] if start is not None and end is not None else pred["word"]
+            entities[row].append(
+                Entity(
+                    text=word.strip(),
+                    label=pred["entity_group"],
+                    start=start or 0,
+                    end=end or 0,
+                    confidence=float(scores[i]),
                 )
+            )
         
-        return ExtractionResult(text, entities)
+        return [ExtractionResult(text, found) for text, found in zip(texts, entities)]
 
 
 class DummyEntityExtractor(EntityExtractor):
     """Dummy entity extractor for testing/development."""
     
     def _load_model(self):
-        """Initialize dummy model."""
+        """Compile the gazetteer."""
         logger.info("Using dummy entity extractor")
-        self.model = None
+        self.model = KeywordMatcher(
+            load_keyword_rules(settings.entity.rules_path, DEFAULT_ENTITY_KEYWORDS)
+        )
     
     def _extract(self, text: str) -> ExtractionResult:
-        """Extract entities using simple pattern matching."""
-        entities = []
-        
-        # Simple keyword-based extraction
-        keywords = {
-            "PERSON": ["john", "mary", "bob", "alice"],
-            "ORG": ["company", "corporation", "microsoft", "apple"],
-            "GPE": ["new york", "london", "paris", "tokyo"],
-        }
-        
-        for label, words in keywords.items():
-            for word in words:
-                if word.lower() in text.lower():
-                    start = text.lower().find(word.lower())
-                    entities.append(
-                        Entity(
-                            text=word,
-                            label=label,
-                            start=start,
-                            end=start + len(word),
-                            confidence=0.8,
-                        )
-                    )
+        """Extract entities by gazetteer lookup (longest non-overlapping matches)."""
+        entities = [
+            Entity(
+                text=text[match.start:match.end],
+                label=match.label,
+                start=match.start,
+                end=match.end,
+                confidence=0.8,
+            )
+            for match in self.model.find_all(text, overlapping=False)
+        ]
+        return ExtractionResult(text, entities)
+
+
+class RegexEntityExtractor(EntityExtractor):
+    """
+    Extractor for structured entities (DATE, TIME, MONEY, QUANTITY, EMAIL, URL).
+    
+    Uses precompiled, locale-specific regular expressions; only the
+    structured labels among `labels` are extracted.
+    """
+    
+    def __init__(self, locale: str = None, labels: List[str] = None):
+        """
+        Initialize regex extractor.
         
+        Args:
+            locale: Pattern locale (defaults to settings)
+            labels: Requested entity types (defaults to settings)
+        """
+        self.locale = locale or settings.entity.locale
+        requested = labels or settings.entity.entity_types
+        self.labels = [label for label in STRUCTURED_LABELS if label in requested]
+        super().__init__()
+    
+    def _load_model(self):
+        """Compile the patterns for the locale."""
+        self.model = compile_patterns(self.locale)
+    
+    def _extract(self, text: str) -> ExtractionResult:
+        """Extract structured entities."""
+        entities = [
+            Entity(text=text[start:end], label=label, start=start, end=end)
+            for label, start, end in find_structured(text, self.model, self.labels)
+        ]
         return ExtractionResult(text, entities)
 
 
+class HybridEntityExtractor(EntityExtractor):
+    """
+    Regex pre-extraction combined with a model-based extractor.
+    
+    Structured entities come from RegexEntityExtractor and the other
+    requested types from the model (model spans with structured or
+    unrequested labels are discarded); overlapping spans are resolved leftmost-longest, then by
+    confidence. When every requested entity type is structured, the model
+    is never loaded or called.
+    """
+    
+    def __init__(
+        self,
+        extractor: EntityExtractor = None,
+        labels: List[str] = None,
+        locale: str = None,
+    ):
+        """
+        Initialize hybrid extractor.
+        
+        Args:
+            extractor: Model-based extractor (defaults to transformer)
+            labels: Requested entity types (defaults to settings)
+            locale: Pattern locale (defaults to settings)
+        """
+        self.extractor = extractor
+        self.requested = list(labels or settings.entity.entity_types)
+        self.structured = RegexEntityExtractor(locale, self.requested)
+        super().__init__()
+    
+    @property
+    def structured_only(self) -> bool:
+        """Whether all requested entity types are handled by the patterns."""
+        return set(self.requested) <= set(STRUCTURED_LABELS)
+    
+    def _load_model(self):
+        """Load the model-based extractor unless it is not needed."""
+        if self.structured_only:
+            logger.info("Only structured entity types requested; skipping the NER model")
+            self.model = None
+        else:
+            self.model = self.extractor or TransformerEntityExtractor()
+    
+    def _token_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Size windows with the model's tokenizer when there is one."""
+        if self.model is None:
+            return super()._token_spans(text)
+        return self.model._token_spans(text)
+    
+    @staticmethod
+    def _resolve_overlaps(entities: List[Entity]) -> List[Entity]:
+        ordered = sorted(entities, key=lambda e: (e.start, e.start - e.end, -e.confidence))
+        selected, last_end = [], 0
+        for entity in ordered:
+            if entity.start >= last_end:
+                selected.append(entity)
+                last_end = entity.end
+        return selected
+    
+    def _extract(self, text: str) -> ExtractionResult:
+        """Extract structured and model entities."""
+        return self._extract_batch([text])[0]
+    
+    def _extract_batch(self, texts: List[str]) -> List[ExtractionResult]:
+        """Run the patterns and, if needed, one batched model call."""
+        structured = self.structured._extract_batch(texts)
+        if self.model is None:
+            return structured
+        
+        # The patterns own the structured labels; the model only adds the
+        # other requested types
+        wanted = set(self.requested) - set(STRUCTURED_LABELS)
+        predicted = self.model._extract_batch(texts)
+        return [
+            ExtractionResult(
+                text,
+                self._resolve_overlaps(
+                    ours.entities + [e for e in theirs.entities if e.label in wanted]
+                ),
+            )
+            for text, ours, theirs in zip(texts, structured, predicted)
+        ]
+
+
 def get_entity_extractor(extractor_type: str = "transformer") -> EntityExtractor:
     """
     Factory function to get entity extractor.
     
     Args:
-        extractor_type: Type of extractor ('transformer' or 'dummy')
+        extractor_type: Type of extractor ('transformer', 'hybrid', 'regex'
+            or 'dummy')
     
     Returns:
         EntityExtractor instance
     """
     if extractor_type == "transformer":
         return TransformerEntityExtractor()
+    elif extractor_type == "hybrid":
+        return HybridEntityExtractor()
+    elif extractor_type == "regex":
+        return RegexEntityExtractor()
     elif extractor_type == "dummy":
         return DummyEntityExtractor()
     else:
@@ -0,0 +1,176 @@
+"""Precompiled regular expressions for structured entities."""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Pattern, Tuple
+from ..utils.exceptions import ConfigurationError
+
+
+# Labels the patterns can produce, highest priority first (wins ties on overlap)
+STRUCTURED_LABELS = ("EMAIL", "URL", "MONEY", "DATE", "TIME", "QUANTITY")
+
+_LOCALES = {
+    "en": {
+        "months": (
+            "january|february|march|april|may|june|july|august|september|october|"
+            "november|december|jan|feb|mar|apr|jun|jul|aug|sept|sep|oct|nov|dec"
+        ),
+        # 1,234.56
+        "number": r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?",
+        "dates": [
+            r"(?:{months})\.? \d{{1,2}}(?:st|nd|rd|th)?(?:,? \d{{4}})?",
+            r"\d{{1,2}}(?:st|nd|rd|th)? (?:of )?(?:{months})\.?(?:,? \d{{4}})?",
+            r"(?:today|tomorrow|yesterday)",
+        ],
+        "times": [
+            r"(?:[01]?\d|2[0-3]):[0-5]\d(?::[0-5]\d)?(?:\s?(?:[ap]\.m\.|[ap]m))?",
+            r"(?:1[0-2]|0?[1-9])\s?(?:[ap]\.m\.|[ap]m)",
+            r"(?:noon|midnight)",
+        ],
+        "currency_words": r"dollars?|euros?|pounds?|cents?",
+        "scale": r"thousand|million|billion|trillion|k|m|bn",
+    },
+    "fr": {
+        "months": (
+            "janvier|février|fevrier|mars|avril|mai|juin|juillet|août|aout|"
+            "septembre|octobre|novembre|décembre|decembre"
+        ),
+        # 1 234,56 / 1.234,56
+        "number": r"\d{1,3}(?:[ .\u00a0\u202f]\d{3})+(?:,\d+)?|\d+(?:,\d+)?",
+        "dates": [
+            r"\d{{1,2}}(?:er)? (?:{months})(?: \d{{4}})?",
+            r"(?:aujourd'hui|demain|hier)",
+        ],
+        "times": [
+            r"(?:[01]?\d|2[0-3])\s?[h:][0-5]\d",
+            r"(?:[01]?\d|2[0-3])\s?h",
+            r"(?:midi|minuit)",
+        ],
+        "currency_words": r"euros?|dollars?|centimes?|francs?|nairas?",
+        "scale": r"mille|millions?|milliards?|k",
+    },
+    "de": {
+        "months": (
+            "januar|jänner|februar|märz|maerz|april|mai|juni|juli|august|"
+            "september|oktober|november|dezember|jan|feb|mär|apr|jun|jul|aug|sep|okt|nov|dez"
+        ),
+        # 1.234,56
+        "number": r"\d{1,3}(?:[.\u00a0\u202f]\d{3})+(?:,\d+)?|\d+(?:,\d+)?",
+        "dates": [
+            r"\d{{1,2}}\. ?(?:{months})\.?(?: \d{{4}})?",
+            r"(?:heute|morgen|gestern)",
+        ],
+        "times": [
+            # Not part of a dotted number sequence such as a version string
+            r"(?<!\d[.:])(?:[01]?\d|2[0-3])[:.][0-5]\d(?![.:]\d)(?:\s?uhr)?",
+            r"(?:[01]?\d|2[0-3])\s?uhr",
+        ],
+        "currency_words": r"euros?|dollars?|cents?",
+        "scale": r"tausend|mio\.?|millionen|million|mrd\.?|milliarden|k",
+    },
+}
+
+# Day and month fields of a numeric date (either order, it differs by locale)
+_DAY = r"(?:0?[1-9]|[12]\d|3[01])"
+_NUM_MONTH = r"(?:0?[1-9]|1[0-2])"
+# Two-digit month of an ISO date
+_MONTH = r"(?:0[1-9]|1[0-2])"
+
+_CURRENCY_SYMBOLS = r"[$€£¥₦]|usd|eur|gbp|jpy|ngn|chf"
+
+_UNITS = (
+    r"%|percent|per ?cent|pour ?cent|prozent|kg|mg|g|km|cm|mm|m|mi|ft|lbs?|oz|ml|l|"
+    r"kilograms?|grams?|kilometers?|kilometres?|meters?|metres?|miles?|feet|foot|inches|"
+    r"liters?|litres?|hours?|hrs?|mins?|minutes?|seconds?|days?|weeks?|months?|years?|"
+    r"heures?|jours?|semaines?|mois|ans|stunden?|tage?|wochen?|monate?|jahre?"
+)
+
+
+def _compile(pattern: str) -> Pattern:
+    # Structured entities never start or end inside a word
+    return re.compile(rf"(?<!\w)(?:{pattern})(?!\w)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def compile_patterns(locale: str = "en") -> Dict[str, Pattern]:
+    """
+    Compile the structured entity patterns for a locale.
+    
+    Args:
+        locale: Language code ('en', 'fr' or 'de'); region suffixes such
+            as 'en-US' are ignored
+    
+    Returns:
+        Dictionary of label to compiled pattern, in priority order
+    
+    Raises:
+        ConfigurationError: If the locale is not supported
+    """
+    language = locale.split("-")[0].split("_")[0].lower()
+    if language not in _LOCALES:
+        raise ConfigurationError(
+            f"Unsupported entity locale: {locale} (supported: {', '.join(_LOCALES)})"
+        )
+    spec = _LOCALES[language]
+    number = f"(?:{spec['number']})"
+    scale = rf"(?:\s?(?:{spec['scale']}))?"
+    currency = f"(?:{_CURRENCY_SYMBOLS})"
+    
+    dates = [
+        rf"\d{{4}}-{_MONTH}-(?:0[1-9]|[12]\d|3[01])",
+        # 12/05/24, 5-3-2024; the separator must repeat and the date must not
+        # be part of a longer dotted/slashed number sequence
+        rf"(?<!\d[./-])(?:{_DAY}(?P<dm>[/-]){_NUM_MONTH}|{_NUM_MONTH}(?P<md>[/-]){_DAY})"
+        rf"(?(dm)(?P=dm)|(?P=md))(?:\d{{4}}|\d{{2}})(?![./-]\d)",
+        # 05.01.2024; dotted dates need a four-digit year so that version
+        # strings such as 1.2.10 are not taken for dates
+        rf"(?<!\d[./-])(?:{_DAY}\.{_NUM_MONTH}|{_NUM_MONTH}\.{_DAY})\.\d{{4}}(?![./-]\d)",
+    ]
+    dates += [date.format(months=spec["months"]) for date in spec["dates"]]
+    
+    patterns = {
+        "EMAIL": r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+        "URL": r"(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)\]]",
+        "MONEY": "|".join([
+            rf"{currency}\s?{number}{scale}",
+            rf"{number}{scale}\s?(?:{currency}|{spec['currency_words']})",
+        ]),
+        "DATE": "|".join(dates),
+        "TIME": "|".join(spec["times"]),
+        "QUANTITY": rf"{number}\s?(?:{_UNITS})",
+    }
+    return {label: _compile(pattern) for label, pattern in patterns.items()}
+
+
+def find_structured(
+    text: str,
+    patterns: Dict[str, Pattern],
+    labels: Iterable[str] = STRUCTURED_LABELS,
+) -> List[Tuple[str, int, int]]:
+    """
+    Find non-overlapping structured entity spans.
+    
+    Overlaps are resolved leftmost-longest, then by label priority.
+    
+    Args:
+        text: Input text
+        patterns: Compiled patterns from `compile_patterns`
+        labels: Labels to look for
+    
+    Returns:
+        (label, start, end) tuples ordered by start offset
+    """
+    priority = {label: rank for rank, label in enumerate(STRUCTURED_LABELS)}
+    spans = [
+        (match.start(), -match.end(), priority[label], label)
+        for label in labels
+        for match in patterns[label].finditer(text)
+    ]
+    spans.sort()
+    
+    selected, last_end = [], 0
+    for start, negative_end, _, label in spans:
+        if start >= last_end:
+            selected.append((label, start, -negative_end))
+            last_end = -negative_end
+    return selected
@@ -1,17 +1,108 @@
 """Intent classification module."""
 
+import copy
+import json
+import math
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
+from dataclasses import dataclass, replace
 from ..utils.logger import get_logger
+from ..utils.metrics import metrics
+from ..preprocessing.keywords import KeywordMatcher, load_keyword_rules
 from ..utils.validators import validate_text, validate_confidence_score
-from ..utils.exceptions import ProcessingError, ModelNotFoundError
+from ..utils.exceptions import (
+    BatchProcessingError,
+    ConfigurationError,
+    ModelNotFoundError,
+    ProcessingError,
+)
 from ..config.settings import settings
 
 
 logger = get_logger(__name__, level=settings.log_level)
 
 
+# Example utterances for the embedding classifier when no examples file is set
+DEFAULT_INTENT_EXAMPLES = {
+    "greeting": [
+        "Hello",
+        "Hi there",
+        "Good morning",
+        "Hey, how are you?",
+    ],
+    "question": [
+        "What is natural language processing?",
+        "How does this work?",
+        "When does the store open?",
+        "Why is the sky blue?",
+    ],
+    "request": [
+        "Please send me the report",
+        "Can you help me book a flight?",
+        "Could you translate this for me?",
+        "I would like to change my password",
+    ],
+    "statement": [
+        "I live in Paris",
+        "The weather is nice today",
+        "My order arrived yesterday",
+        "I work as an engineer",
+    ],
+    "command": [
+        "Cancel my subscription",
+        "Turn off the notifications",
+        "Show me my account balance",
+        "Stop the timer",
+    ],
+}
+
+
+# Keyword rules for the dummy classifier, highest priority first
+DEFAULT_INTENT_KEYWORDS = {
+    "greeting": ["hello", "hi", "hey", "greetings"],
+    "question": ["what", "when", "where", "how", "why", "?"],
+    "request": ["please", "can", "could", "would"],
+}
+
+
+def load_intent_examples(path: str = None) -> Dict[str, List[str]]:
+    """
+    Load example utterances per intent.
+    
+    Args:
+        path: JSON file mapping intent names to example lists (defaults to
+            settings; built-in examples are used when unset)
+    
+    Returns:
+        Dictionary of intent name to example utterances
+    
+    Raises:
+        ConfigurationError: If the file cannot be read or is malformed
+    """
+    path = path or settings.intent.examples_path
+    if not path:
+        return DEFAULT_INTENT_EXAMPLES
+    
+    try:
+        examples = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ConfigurationError(f"Failed to load intent examples {path}: {str(e)}")
+    
+    if not isinstance(examples, dict) or not all(
+        isinstance(v, list) and v for v in examples.values()
+    ):
+        raise ConfigurationError(f"Intent examples {path} must map intents to non-empty lists")
+    return examples
+
+
+def normalize_intent_text(text: str) -> str:
+    """Normalize text for intent cache lookup (case-folded, whitespace collapsed)."""
+    return " ".join(text.casefold().split())
+
+
 @dataclass
 class Intent:
     """Intent prediction result."""
@@ -26,8 +117,22 @@ class Intent:
             self.metadata = {}
 
 
+def _copy_intent(intent: Intent) -> Intent:
+    """Copy an intent with its nested metadata (e.g. `all_scores`)."""
+    return replace(intent, metadata=copy.deepcopy(intent.metadata))
+
+
 class IntentClassifier(ABC):
-    """Base class for intent classification."""
+    """
+    Base class for intent classification.
+    
+    Predictions are kept in a bounded LRU cache keyed on normalized text
+    (`settings.intent.cache_size` entries, 0 disables it). The cache is
+    dropped whenever the model fingerprint changes, i.e. when the model
+    object or the supported label set is replaced. The fingerprint is
+    computed once per loaded model rather than on every lookup, and cached
+    predictions are deep-copied in and out so callers cannot alter them.
+    """
     
     def __init__(self, model_name: str = None):
         """
@@ -39,7 +144,14 @@ class IntentClassifier(ABC):
         self.model_name = model_name or settings.intent.model_name
         self.model = None
         self.tokenizer = None
+        self.cache_size = settings.intent.cache_size
+        self._cache: "OrderedDict[str, Intent]" = OrderedDict()
+        self._cache_fingerprint = None
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
         self._load_model()
+        self._refresh_fingerprint()
     
     @abstractmethod
     def _load_model(self):
@@ -51,6 +163,64 @@ class IntentClassifier(ABC):
         """Internal prediction method."""
         pass
     
+    def _fingerprint(self) -> Hashable:
+        """Identify the model and labels that cached predictions came from."""
+        return (id(self.model), self.model_name, tuple(self.get_supported_intents()))
+    
+    def _refresh_fingerprint(self):
+        """Recompute the fingerprint after loading a model or changing labels."""
+        self._fingerprinted_model = self.model
+        self._model_fingerprint = self._fingerprint()
+    
+    def _current_fingerprint(self) -> Hashable:
+        """Return the stored fingerprint, refreshing it if the model was replaced."""
+        if self.model is not self._fingerprinted_model:
+            self._refresh_fingerprint()
+        return self._model_fingerprint
+    
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+    
+    def clear_cache(self):
+        """Drop all cached predictions."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _cache_get(self, key: str, fingerprint: Hashable) -> Optional[Intent]:
+        if not self.cache_size:
+            return None
+        with self._cache_lock:
+            if fingerprint != self._cache_fingerprint:
+                self._cache.clear()
+                self._cache_fingerprint = fingerprint
+            intent = self._cache.get(key)
+            if intent is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
+            rate = self.cache_hit_rate
+        
+        classifier = type(self).__name__
+        result = "miss" if intent is None else "hit"
+        metrics.counter("intent_cache_total", classifier=classifier, result=result).inc()
+        metrics.gauge("intent_cache_hit_rate", classifier=classifier).set(rate)
+        return None if intent is None else _copy_intent(intent)
+    
+    def _cache_put(self, key: str, intent: Intent, fingerprint: Hashable):
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            if fingerprint != self._cache_fingerprint:
+                return  # the model changed while predicting
+            self._cache[key] = _copy_intent(intent)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
     def classify(self, text: str) -> Intent:
         """
         Classify intent of the given text.
@@ -66,7 +236,12 @@ class IntentClassifier(ABC):
         """
         try:
             text = validate_text(text)
-            intent = self._predict(text)
+            key = normalize_intent_text(text)
+            fingerprint = self._current_fingerprint() if self.cache_size else None
+            intent = self._cache_get(key, fingerprint)
+            if intent is None:
+                intent = self._predict(text)
+                self._cache_put(key, intent, fingerprint)
             
             logger.info(
                 f"Intent classification result",
@@ -82,17 +257,95 @@ class IntentClassifier(ABC):
             logger.error(f"Intent classification failed: {str(e)}")
             raise ProcessingError(f"Intent classification failed: {str(e)}")
     
-    def batch_classify(self, texts: List[str]) -> List[Intent]:
+    def _predict_batch(self, texts: List[str]) -> List[Intent]:
+        """Predict intents for a batch of validated texts (override to batch)."""
+        return [self._predict(text) for text in texts]
+    
+    def batch_classify(self, texts: List[str], batch_size: int = None) -> List[Intent]:
         """
         Classify intents for multiple texts.
         
+        Texts are validated up front and answered from the cache where
+        possible; the remaining distinct texts are sorted by length so each
+        model batch holds similarly sized inputs (less padding), and
+        predicted in batches of `batch_size`. Results are returned in input
+        order. If a batch fails, its items are retried one by one so a bad
+        input only fails itself.
+        
         Args:
             texts: List of input texts
+            batch_size: Texts per model call (defaults to settings)
         
         Returns:
             List of intent predictions
+        
+        Raises:
+            BatchProcessingError: If any item fails; `results` holds the
+                predictions for the other items and `errors` the failures
         """
-        return [self.classify(text) for text in texts]
+        batch_size = batch_size or settings.intent.batch_size
+        results: List[Intent] = [None] * len(texts)
+        errors = {}
+        
+        fingerprint = self._current_fingerprint() if self.cache_size else None
+        
+        # Distinct uncached texts, each with the input positions it answers
+        pending: Dict[str, Tuple[str, List[int]]] = {}
+        for index, text in enumerate(texts):
+            try:
+                text = validate_text(text)
+            except Exception as e:
+                errors[index] = e
+                continue
+            key = normalize_intent_text(text)
+            if key in pending:
+                pending[key][1].append(index)
+                continue
+            intent = self._cache_get(key, fingerprint)
+            if intent is None:
+                pending[key] = (text, [index])
+            else:
+                results[index] = intent
+        
+        def resolve(key: str, intent: Intent):
+            self._cache_put(key, intent, fingerprint)
+            first, *rest = pending[key][1]
+            results[first] = intent
+            for index in rest:
+                results[index] = _copy_intent(intent)
+        
+        valid = sorted(pending.items(), key=lambda item: len(item[1][0]))
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            try:
+                intents = self._predict_batch([text for _, (text, _) in chunk])
+                for (key, _), intent in zip(chunk, intents):
+                    resolve(key, intent)
+            except Exception as e:
+                logger.warning(f"Intent batch failed, retrying items individually: {str(e)}")
+                for key, (text, indices) in chunk:
+                    try:
+                        resolve(key, self._predict(text))
+                    except Exception as item_error:
+                        for index in indices:
+                            errors[index] = item_error
+        
+        logger.info(
+            f"Batch intent classification completed",
+            extra={
+                "num_texts": len(texts),
+                "batch_size": batch_size,
+                "num_errors": len(errors),
+            }
+        )
+        
+        if errors:
+            raise BatchProcessingError(
+                f"Intent classification failed for {len(errors)} of {len(texts)} texts",
+                results=results,
+                errors=errors,
+            )
+        return results
     
     def get_supported_intents(self) -> List[str]:
         """
@@ -106,69 +359,385 @@ class IntentClassifier(ABC):
 
 
 class TransformerIntentClassifier(IntentClassifier):
-    """Intent classifier using Hugging Face transformers."""
+    """
+    Zero-shot intent classifier using a Hugging Face NLI model.
+    
+    Each candidate label becomes a hypothesis ("This example is {label}.")
+    scored against the message as premise. The hypotheses are tokenized
+    once at load time; per call only the messages are tokenized and the
+    premise/hypothesis pairs for every message and label are assembled
+    into a single padded batch for one forward pass.
+    
+    In single-label mode label scores are a softmax of the entailment
+    logits across labels. In multi-label mode (`settings.intent.multi_label`)
+    each label is scored independently as entailment vs. contradiction,
+    and every label above `confidence_threshold` is reported in the
+    intent metadata.
+    """
     
     def _load_model(self):
-        """Load transformer model and tokenizer."""
+        """Load NLI model and tokenizer, and pre-tokenize label hypotheses."""
         try:
-            from transformers import pipeline
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
             
             logger.info(f"Loading transformer model: {self.model_name}")
-            self.model = pipeline(
-                "zero-shot-classification",
-                model=self.model_name,
-                device=0 if settings.translation.use_gpu else -1,
-            )
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            use_cuda = settings.translation.use_gpu and torch.cuda.is_available()
+            self.device = "cuda" if use_cuda else "cpu"
+            self.model.to(self.device)
+            self.model.eval()
         except ImportError:
             raise ModelNotFoundError(
-                "Transformers library not installed. Install with: pip install transformers"
+                "Transformers library not installed. Install with: pip install transformers torch"
             )
         except Exception as e:
             raise ModelNotFoundError(f"Failed to load model {self.model_name}: {str(e)}")
+        
+        label2id = {k.lower(): v for k, v in self.model.config.label2id.items()}
+        self.entailment_id = next(
+            (v for k, v in label2id.items() if k.startswith("entail")), len(label2id) - 1
+        )
+        self.contradiction_id = next(
+            (v for k, v in label2id.items() if k.startswith("contra")), 0
+        )
+        self._prepare_hypotheses(settings.intent.candidate_labels)
+    
+    def _prepare_hypotheses(self, labels: List[str]):
+        """Tokenize the hypothesis for each label once."""
+        self.labels = list(labels)
+        template = settings.intent.hypothesis_template
+        self.hypothesis_ids = [
+            self.tokenizer.encode(template.format(label), add_special_tokens=False)
+            for label in self.labels
+        ]
+        # Room left for the premise once special tokens and the longest hypothesis fit
+        special = self.tokenizer.num_special_tokens_to_add(pair=True)
+        self.max_premise_tokens = (
+            min(self.tokenizer.model_max_length, 512)
+            - special
+            - max(len(ids) for ids in self.hypothesis_ids)
+        )
+        self._refresh_fingerprint()
+    
+    def _build_pairs(self, texts: List[str]) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Build premise/hypothesis input IDs for every text and label.
+        
+        Args:
+            texts: Premises
+        
+        Returns:
+            Input IDs and token type IDs, one row per (text, label), text-major
+        """
+        input_ids, token_type_ids = [], []
+        for text in texts:
+            premise = self.tokenizer.encode(text, add_special_tokens=False)
+            premise = premise[:self.max_premise_tokens]
+            for hypothesis in self.hypothesis_ids:
+                input_ids.append(
+                    self.tokenizer.build_inputs_with_special_tokens(premise, hypothesis)
+                )
+                token_type_ids.append(
+                    self.tokenizer.create_token_type_ids_from_sequences(premise, hypothesis)
+                )
+        return input_ids, token_type_ids
+    
+    def _scores(self, logits: List[List[List[float]]]) -> List[List[float]]:
+        """
+        Turn NLI logits into label scores.
+        
+        Args:
+            logits: Per text, per label, per NLI class logits
+        
+        Returns:
+            Per text, per label scores in [0, 1]
+        """
+        scores = []
+        for text_logits in logits:
+            if settings.intent.multi_label:
+                row = []
+                for label_logits in text_logits:
+                    entail = label_logits[self.entailment_id]
+                    contradict = label_logits[self.contradiction_id]
+                    row.append(1.0 / (1.0 + math.exp(contradict - entail)))
+            else:
+                entails = [label_logits[self.entailment_id] for label_logits in text_logits]
+                peak = max(entails)
+                exps = [math.exp(value - peak) for value in entails]
+                total = sum(exps)
+                row = [value / total for value in exps]
+            scores.append(row)
+        return scores
     
     def _predict(self, text: str) -> Intent:
         """Predict intent using zero-shot classification."""
-        candidate_labels = settings.intent.entity_types or [
-            "greeting",
-            "question",
-            "request",
-            "statement",
-            "command",
-        ]
+        return self._predict_batch([text])[0]
+    
+    def _predict_batch(self, texts: List[str]) -> List[Intent]:
+        """Predict intents for a batch with one NLI forward pass."""
+        import torch
+        
+        input_ids, token_type_ids = self._build_pairs(texts)
+        width = max(len(ids) for ids in input_ids)
+        pad_id = self.tokenizer.pad_token_id or 0
+        
+        inputs = {
+            "input_ids": torch.tensor(
+                [ids + [pad_id] * (width - len(ids)) for ids in input_ids],
+                device=self.device,
+            ),
+            "attention_mask": torch.tensor(
+                [[1] * len(ids) + [0] * (width - len(ids)) for ids in input_ids],
+                device=self.device,
+            ),
+        }
+        if "token_type_ids" in self.tokenizer.model_input_names:
+            inputs["token_type_ids"] = torch.tensor(
+                [types + [0] * (width - len(types)) for types in token_type_ids],
+                device=self.device,
+            )
+        
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+        logits = logits.view(len(texts), len(self.labels), -1).tolist()
+        
+        intents = []
+        for row in self._scores(logits):
+            ranked = sorted(zip(self.labels, row), key=lambda item: item[1], reverse=True)
+            metadata = {"all_scores": dict(ranked)}
+            if settings.intent.multi_label:
+                metadata["labels"] = [
+                    label for label, score in ranked
+                    if score >= settings.intent.confidence_threshold
+                ]
+            intents.append(Intent(name=ranked[0][0], confidence=ranked[0][1], metadata=metadata))
+        return intents
+    
+    def get_supported_intents(self) -> List[str]:
+        """Get the zero-shot candidate labels."""
+        return list(self.labels)
+
+
+class EmbeddingIntentClassifier(IntentClassifier):
+    """
+    Intent classifier using sentence-embedding centroids.
+    
+    A few example utterances per intent are embedded once at load time and
+    averaged into one unit-length centroid per intent. Classifying a batch
+    then costs a single encoder pass plus a matrix product against the
+    centroids, independent of how many intents there are. Cosine
+    similarities are turned into confidences with a temperature softmax.
+    """
+    
+    def __init__(self, model_name: str = None, examples: Dict[str, List[str]] = None):
+        """
+        Initialize embedding classifier.
+        
+        Args:
+            model_name: Sentence-transformers model (defaults to settings)
+            examples: Example utterances per intent (defaults to the
+                configured examples file, then built-in examples)
+        """
+        self.examples = examples or load_intent_examples()
+        super().__init__(model_name or settings.intent.embedding_model)
+    
+    def _load_encoder(self):
+        """Load the sentence encoder."""
+        from sentence_transformers import SentenceTransformer
         
-        result = self.model(text, candidate_labels)
+        return SentenceTransformer(self.model_name)
+    
+    def _load_model(self):
+        """Load the encoder and compute intent centroids."""
+        try:
+            import numpy as np
+            
+            logger.info(f"Loading intent embedding model: {self.model_name}")
+            self.model = self._load_encoder()
+            
+            self.labels = list(self.examples)
+            centroids = []
+            for label in self.labels:
+                embeddings = self.model.encode(self.examples[label], normalize_embeddings=True)
+                centroid = np.asarray(embeddings, dtype=np.float32).mean(axis=0)
+                centroids.append(centroid / np.linalg.norm(centroid))
+            self.centroids = np.stack(centroids)
+            
+            logger.info(f"Built centroids for {len(self.labels)} intents")
+        except ImportError:
+            raise ModelNotFoundError(
+                "Required libraries not installed. Install with: pip install sentence-transformers"
+            )
+        except Exception as e:
+            raise ModelNotFoundError(f"Failed to load model {self.model_name}: {str(e)}")
+    
+    def _predict(self, text: str) -> Intent:
+        """Predict intent for one text."""
+        return self._predict_batch([text])[0]
+    
+    def _predict_batch(self, texts: List[str]) -> List[Intent]:
+        """Predict intents with one encoder pass and one matrix product."""
+        import numpy as np
         
-        intent = Intent(
-            name=result["labels"][0],
-            confidence=result["scores"][0],
-            metadata={
-                "all_scores": dict(zip(result["labels"], result["scores"])),
-            },
+        embeddings = np.asarray(
+            self.model.encode(texts, normalize_embeddings=True),
+            dtype=np.float32,
         )
+        similarities = embeddings @ self.centroids.T
+        
+        logits = similarities / settings.intent.similarity_temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
         
-        return intent
+        intents = []
+        for row, similarity in zip(probabilities, similarities):
+            best = int(row.argmax())
+            intents.append(
+                Intent(
+                    name=self.labels[best],
+                    confidence=float(row[best]),
+                    metadata={
+                        "all_scores": dict(zip(self.labels, row.tolist())),
+                        "similarity": float(similarity[best]),
+                    },
+                )
+            )
+        return intents
+    
+    def get_supported_intents(self) -> List[str]:
+        """Get intents with example utterances."""
+        return list(self.labels)
 
 
 class DummyIntentClassifier(IntentClassifier):
     """Dummy intent classifier for testing/development."""
     
     def _load_model(self):
-        """Initialize dummy model."""
+        """Compile the keyword rules."""
         logger.info("Using dummy intent classifier")
-        self.model = None
+        self.model = KeywordMatcher(
+            load_keyword_rules(settings.intent.rules_path, DEFAULT_INTENT_KEYWORDS)
+        )
+    
+    def _predict(self, text: str) -> Intent:
+        """Return the highest-priority intent with a keyword match."""
+        labels = self.model.labels_found(text)
+        if labels:
+            rank = self.model.labels.index(labels[0])
+            return Intent(labels[0], max(0.95 - 0.05 * rank, 0.6))
+        # No keyword matched: a guess, below the default confidence threshold
+        return Intent("statement", 0.4)
+    
+    def get_supported_intents(self) -> List[str]:
+        """Get the rule labels plus the fallback."""
+        return self.model.labels + ["statement"]
+
+
+class CascadeIntentClassifier(IntentClassifier):
+    """
+    Two-stage intent classifier.
+    
+    A cheap first stage classifies every message; only messages it is
+    unsure about (confidence below `threshold`) are escalated to the
+    expensive second stage. In batches, all escalated messages go to the
+    second stage in a single call. The share of escalated messages is
+    exported as the `intent_cascade_escalation_rate` gauge.
+    """
+    
+    def __init__(
+        self,
+        first_stage: IntentClassifier = None,
+        second_stage: IntentClassifier = None,
+        threshold: float = None,
+    ):
+        """
+        Initialize cascade classifier.
+        
+        Args:
+            first_stage: Fast classifier (defaults to settings)
+            second_stage: Accurate classifier (defaults to transformer)
+            threshold: Minimum first-stage confidence to accept its answer
+        """
+        self.first_stage = first_stage
+        self.second_stage = second_stage
+        self.threshold = (
+            settings.intent.confidence_threshold if threshold is None else threshold
+        )
+        self.total = 0
+        self.escalated = 0
+        self._lock = threading.Lock()
+        super().__init__()
+    
+    def _load_model(self):
+        """Create default stages."""
+        if self.first_stage is None:
+            first_stage_type = settings.intent.cascade_first_stage
+            if first_stage_type == "cascade":
+                raise ConfigurationError("The cascade classifier cannot be its own first stage")
+            self.first_stage = get_intent_classifier(first_stage_type)
+        if self.second_stage is None:
+            self.second_stage = TransformerIntentClassifier()
+    
+    def _fingerprint(self):
+        """Identify both stages and the threshold."""
+        return (
+            self.first_stage._current_fingerprint(),
+            self.second_stage._current_fingerprint(),
+            self.threshold,
+        )
+    
+    def _current_fingerprint(self):
+        """Combine the stages' stored fingerprints (the cascade has no model of its own)."""
+        return self._fingerprint()
+    
+    @property
+    def escalation_rate(self) -> float:
+        """Share of messages escalated to the second stage."""
+        return self.escalated / self.total if self.total else 0.0
+    
+    def _record(self, total: int, escalated: int):
+        with self._lock:
+            self.total += total
+            self.escalated += escalated
+            rate = self.escalation_rate
+        metrics.counter("intent_cascade_total", stage="first").inc(total - escalated)
+        metrics.counter("intent_cascade_total", stage="second").inc(escalated)
+        metrics.gauge("intent_cascade_escalation_rate").set(rate)
     
     def _predict(self, text: str) -> Intent:
-        """Return dummy prediction based on keywords."""
-        text_lower = text.lower()
+        """Predict with the first stage, escalating when unsure."""
+        return self._predict_batch([text])[0]
+    
+    def _predict_batch(self, texts: List[str]) -> List[Intent]:
+        """Predict a batch, escalating unsure items in one second-stage call."""
+        intents = self.first_stage._predict_batch(texts)
+        unsure = [i for i, intent in enumerate(intents) if intent.confidence < self.threshold]
+        
+        if unsure:
+            escalated = self.second_stage._predict_batch([texts[i] for i in unsure])
+            for i, intent in zip(unsure, escalated):
+                intent.metadata["first_stage"] = {
+                    "name": intents[i].name,
+                    "confidence": intents[i].confidence,
+                }
+                intent.metadata["cascade_stage"] = "second"
+                intents[i] = intent
+        for intent in intents:
+            intent.metadata.setdefault("cascade_stage", "first")
         
-        if any(word in text_lower for word in ["hello", "hi", "hey", "greetings"]):
-            return Intent("greeting", 0.95)
-        elif any(word in text_lower for word in ["what", "when", "where", "how", "why", "?"]):
-            return Intent("question", 0.90)
-        elif any(word in text_lower for word in ["please", "can", "could", "would"]):
-            return Intent("request", 0.85)
-        else:
-            return Intent("statement", 0.75)
+        self._record(len(texts), len(unsure))
+        return intents
+    
+    def get_supported_intents(self) -> List[str]:
+        """Get intents either stage can produce."""
+        supported = list(self.first_stage.get_supported_intents())
+        for name in self.second_stage.get_supported_intents():
+            if name not in supported:
+                supported.append(name)
+        return supported
 
 
 def get_intent_classifier(classifier_type: str = "transformer") -> IntentClassifier:
@@ -176,13 +745,24 @@ def get_intent_classifier(classifier_type: str = "transformer") -> IntentClassif
     Factory function to get intent classifier.
     
     Args:
-        classifier_type: Type of classifier ('transformer' or 'dummy')
+        classifier_type: Type of classifier ('transformer', 'embedding',
+            'linear', 'cascade' or 'dummy')
     
     Returns:
         IntentClassifier instance
     """
     if classifier_type == "transformer":
         return TransformerIntentClassifier()
+    elif classifier_type == "embedding":
+        return EmbeddingIntentClassifier()
+    elif classifier_type == "linear":
+        try:
+            from .linear import LinearIntentClassifier
+        except ImportError:
+            raise ModelNotFoundError("NumPy not installed. Install with: pip install numpy")
+        return LinearIntentClassifier()
+    elif classifier_type == "cascade":
+        return CascadeIntentClassifier()
     elif classifier_type == "dummy":
         return DummyIntentClassifier()
     else:
@@ -0,0 +1,312 @@
+"""Hashed n-gram logistic regression intent model."""
+
+import csv
+import json
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+from .classifier import Intent, IntentClassifier
+from ..utils.logger import get_logger
+from ..utils.exceptions import ConfigurationError, ModelNotFoundError
+from ..config.settings import settings
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+ARTIFACT_VERSION = 1
+
+
+def load_training_data(path: str) -> Tuple[List[str], List[str]]:
+    """
+    Load labeled utterances from CSV or JSONL.
+    
+    CSV files need a header with `text` and `intent` columns; JSONL files
+    hold one {"text": ..., "intent": ...} object per line.
+    
+    Args:
+        path: Path to a .csv or .jsonl file
+    
+    Returns:
+        Texts and their intent labels
+    
+    Raises:
+        ConfigurationError: If the file cannot be read or is malformed
+    """
+    path = Path(path)
+    try:
+        with path.open(encoding="utf-8", newline="") as f:
+            if path.suffix.lower() == ".csv":
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+        texts = [row["text"] for row in rows]
+        labels = [row["intent"] for row in rows]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ConfigurationError(f"Failed to load training data {path}: {str(e)}")
+    
+    if not texts:
+        raise ConfigurationError(f"Training data {path} is empty")
+    return texts, labels
+
+
+class HashedNgramFeaturizer:
+    """
+    Map texts to sparse, L2-normalized hashed n-gram counts.
+    
+    Features are word unigrams and bigrams plus character trigrams of each
+    word, hashed with CRC32 into `n_features` buckets so the vocabulary
+    never needs to be stored and hashing is stable across processes.
+    """
+    
+    def __init__(self, n_features: int = 2 ** 18):
+        """
+        Initialize featurizer.
+        
+        Args:
+            n_features: Number of hash buckets
+        """
+        self.n_features = n_features
+    
+    def _ngrams(self, text: str) -> List[str]:
+        words = text.lower().split()
+        grams = [f"w:{w}" for w in words]
+        grams.extend(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f"<{word}>"
+            grams.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return grams
+    
+    def transform(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Featurize texts.
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            Row IDs, feature indices and values of the non-zero entries
+        """
+        rows, indices, values = [], [], []
+        for row, text in enumerate(texts):
+            counts: Dict[int, float] = {}
+            for gram in self._ngrams(text):
+                index = zlib.crc32(gram.encode("utf-8")) % self.n_features
+                counts[index] = counts.get(index, 0.0) + 1.0
+            if not counts:
+                continue
+            norm = sum(v * v for v in counts.values()) ** 0.5
+            rows.extend([row] * len(counts))
+            indices.extend(counts)
+            values.extend(v / norm for v in counts.values())
+        return (
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(values, dtype=np.float32),
+        )
+
+
+class LinearIntentModel:
+    """Multinomial logistic regression over hashed n-gram features."""
+    
+    def __init__(
+        self,
+        classes: List[str],
+        weights: np.ndarray,
+        bias: np.ndarray,
+        featurizer: HashedNgramFeaturizer,
+    ):
+        """
+        Initialize model.
+        
+        Args:
+            classes: Intent names, one per weight column
+            weights: Dense (n_features, n_classes) weight matrix
+            bias: Per-class bias
+            featurizer: Featurizer the weights were trained with
+        """
+        self.classes = list(classes)
+        self.weights = weights
+        self.bias = bias
+        self.featurizer = featurizer
+    
+    @classmethod
+    def train(
+        cls,
+        texts: List[str],
+        labels: List[str],
+        n_features: int = 2 ** 18,
+        epochs: int = 20,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        batch_size: int = 32,
+        seed: int = 0,
+    ) -> "LinearIntentModel":
+        """
+        Train with mini-batch SGD on the cross-entropy loss.
+        
+        Args:
+            texts: Training utterances
+            labels: Intent label per utterance
+            n_features: Number of hash buckets
+            epochs: Passes over the data
+            learning_rate: SGD step size
+            l2: L2 penalty, applied to the weights touched by each batch
+            batch_size: Utterances per update
+            seed: Shuffling seed
+        
+        Returns:
+            Trained model
+        """
+        featurizer = HashedNgramFeaturizer(n_features)
+        classes = sorted(set(labels))
+        class_ids = {name: i for i, name in enumerate(classes)}
+        targets = np.array([class_ids[label] for label in labels])
+        
+        model = cls(
+            classes,
+            np.zeros((n_features, len(classes)), dtype=np.float32),
+            np.zeros(len(classes), dtype=np.float32),
+            featurizer,
+        )
+        rng = np.random.default_rng(seed)
+        texts = list(texts)
+        
+        for epoch in range(epochs):
+            order = rng.permutation(len(texts))
+            loss = 0.0
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                rows, indices, values = featurizer.transform([texts[i] for i in batch])
+                probs = model._probabilities(len(batch), rows, indices, values)
+                
+                batch_targets = targets[batch]
+                loss -= np.log(probs[np.arange(len(batch)), batch_targets] + 1e-12).sum()
+                grad = probs
+                grad[np.arange(len(batch)), batch_targets] -= 1.0
+                grad /= len(batch)
+                
+                touched = np.unique(indices)
+                model.weights[touched] *= 1.0 - learning_rate * l2
+                np.subtract.at(
+                    model.weights, indices, learning_rate * values[:, None] * grad[rows]
+                )
+                model.bias -= learning_rate * grad.sum(axis=0)
+            logger.debug(f"Epoch {epoch + 1}/{epochs}: loss {loss / len(texts):.4f}")
+        
+        return model
+    
+    def _probabilities(
+        self, n_rows: int, rows: np.ndarray, indices: np.ndarray, values: np.ndarray
+    ) -> np.ndarray:
+        scores = np.tile(self.bias, (n_rows, 1))
+        np.add.at(scores, rows, values[:, None] * self.weights[indices])
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+    
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """
+        Predict class probabilities.
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            (len(texts), n_classes) probability matrix
+        """
+        return self._probabilities(len(texts), *self.featurizer.transform(texts))
+    
+    def save(self, path: str):
+        """
+        Save the model as an .npz artifact.
+        
+        Only weight rows that are non-zero are stored, so the artifact size
+        scales with the n-grams seen in training, not with `n_features`.
+        
+        Args:
+            path: Output file
+        """
+        rows = np.flatnonzero(np.any(self.weights != 0, axis=1))
+        np.savez(
+            path,
+            version=np.array(ARTIFACT_VERSION),
+            classes=np.array(self.classes),
+            n_features=np.array(self.featurizer.n_features),
+            rows=rows.astype(np.int64),
+            weights=self.weights[rows],
+            bias=self.bias,
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> "LinearIntentModel":
+        """
+        Load a model saved with `save`.
+        
+        Args:
+            path: .npz artifact
+        
+        Returns:
+            Loaded model
+        """
+        with np.load(path) as artifact:
+            if int(artifact["version"]) != ARTIFACT_VERSION:
+                raise ModelNotFoundError(
+                    f"Unsupported intent model version {int(artifact['version'])} in {path}"
+                )
+            featurizer = HashedNgramFeaturizer(int(artifact["n_features"]))
+            bias = artifact["bias"]
+            weights = np.zeros((featurizer.n_features, len(bias)), dtype=np.float32)
+            weights[artifact["rows"]] = artifact["weights"]
+            return cls([str(c) for c in artifact["classes"]], weights, bias, featurizer)
+
+
+class LinearIntentClassifier(IntentClassifier):
+    """Intent classifier serving a trained LinearIntentModel artifact."""
+    
+    def __init__(self, model_path: str = None):
+        """
+        Initialize linear classifier.
+        
+        Args:
+            model_path: .npz artifact (defaults to settings)
+        """
+        super().__init__(model_path or settings.intent.linear_model_path)
+    
+    def _load_model(self):
+        """Load the trained model artifact."""
+        if not self.model_name or not Path(self.model_name).is_file():
+            raise ModelNotFoundError(
+                f"Intent model artifact not found: {self.model_name!r}. "
+                "Train one with: python scripts/train_intent.py"
+            )
+        try:
+            self.model = LinearIntentModel.load(self.model_name)
+        except ModelNotFoundError:
+            raise
+        except Exception as e:
+            raise ModelNotFoundError(f"Failed to load model {self.model_name}: {str(e)}")
+        logger.info(f"Loaded linear intent model: {self.model_name}")
+    
+    def _predict(self, text: str) -> Intent:
+        """Predict intent with the linear model."""
+        return self._predict_batch([text])[0]
+    
+    def _predict_batch(self, texts: List[str]) -> List[Intent]:
+        """Predict intents for a batch in one vectorized pass."""
+        probs = self.model.predict_proba(texts)
+        best = probs.argmax(axis=1)
+        return [
+            Intent(
+                name=self.model.classes[index],
+                confidence=float(row[index]),
+                metadata={"all_scores": dict(zip(self.model.classes, row.tolist()))},
+            )
+            for index, row in zip(best, probs)
+        ]
+    
+    def get_supported_intents(self) -> List[str]:
+        """Get the intents the model was trained on."""
+        return list(self.model.classes)
@@ -1,5 +1,6 @@
 """LLM module."""
 
 from .manager import LLMManager, Message, LLMResponse, get_llm_manager
+from .router import RoutingLLMManager
 
-__all__ = ["LLMManager", "Message", "LLMResponse", "get_llm_manager"]
+__all__ = ["LLMManager", "Message", "LLMResponse", "get_llm_manager", "RoutingLLMManager"]
@@ -1,12 +1,13 @@
 """LLM (Large Language Model) integration module."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from ..utils.logger import get_logger
 from ..utils.validators import validate_text
-from ..utils.exceptions import LLMError, ModelNotFoundError
+from ..utils.exceptions import LLMError, ModelNotFoundError, RateLimitError
 from ..config.settings import settings
+from .scheduler import LLMScheduler, get_llm_scheduler
 
 
 logger = get_logger(__name__, level=settings.log_level)
@@ -15,6 +16,7 @@ logger = get_logger(__name__, level=settings.log_level)
 @dataclass
 class Message:
     """Chat message."""
+    __slots__ = ("role", "content")
     role: str  # "user", "assistant", "system"
     content: str
 
@@ -35,15 +37,18 @@ class LLMResponse:
 class LLMManager(ABC):
     """Base class for LLM integration."""
     
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, scheduler: Optional[LLMScheduler] = None):
         """
         Initialize LLM manager.
         
         Args:
             model_name: Name of the model to use
+            scheduler: Optional rate limiter (defaults to the shared scheduler
+                when rate limits are configured)
         """
         self.model_name = model_name or settings.llm.model_name
         self.client = None
+        self.scheduler = scheduler if scheduler is not None else get_llm_scheduler()
         self._load_model()
     
     @abstractmethod
@@ -56,25 +61,65 @@ class LLMManager(ABC):
         """Internal LLM call method."""
         pass
     
+    def estimate_tokens(self, messages: List[Message], **kwargs) -> int:
+        """
+        Estimate tokens a call will count against provider rate limits.
+        
+        Args:
+            messages: List of chat messages
+            **kwargs: Call parameters (max_tokens is included in the estimate)
+        
+        Returns:
+            Estimated prompt plus completion tokens
+        """
+        prompt_tokens = sum(len(msg.content) for msg in messages) // 4 + 1
+        return prompt_tokens + kwargs.get("max_tokens", settings.llm.max_tokens)
+    
     def chat(self, messages: List[Message], **kwargs) -> LLMResponse:
         """
         Send chat messages to LLM.
         
         Args:
             messages: List of chat messages
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters; `priority` ('interactive' or
+                'batch') and `client_id` are used for rate-limit scheduling
         
         Returns:
             LLM response
         
         Raises:
+            RateLimitError: If the local rate limiter rejects the call or its
+                queue wait exceeds the timeout
             LLMError: If LLM call fails
         """
         try:
             if not messages:
                 raise ValueError("Messages list cannot be empty")
             
-            response = self._call(messages, **kwargs)
+            estimated_tokens = 0
+            if self.scheduler is not None:
+                estimated_tokens = self.estimate_tokens(messages, **kwargs)
+                # A deadline-bound call waits for its rate limit only as long as
+                # its timeout, and the provider call gets what is left after that
+                waited = self.scheduler.acquire(
+                    estimated_tokens,
+                    priority=kwargs.get("priority", "interactive"),
+                    client_id=kwargs.get("client_id", "default"),
+                    timeout=kwargs.get("timeout"),
+                )
+                if kwargs.get("timeout") is not None:
+                    kwargs["timeout"] = max(kwargs["timeout"] - waited, 0.001)
+            
+            try:
+                response = self._call(messages, **kwargs)
+            except Exception:
+                if estimated_tokens:
+                    # Failed calls give back the tokens reserved for them
+                    self.scheduler.settle(estimated_tokens, 0)
+                raise
+            
+            if estimated_tokens and response.tokens_used:
+                self.scheduler.settle(estimated_tokens, response.tokens_used)
             
             logger.info(
                 f"LLM call completed",
@@ -86,6 +131,9 @@ class LLMManager(ABC):
             )
             
             return response
+        except RateLimitError as e:
+            logger.warning(f"LLM call rejected by the rate limiter: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"LLM call failed: {str(e)}")
             raise LLMError(f"LLM call failed: {str(e)}")
@@ -116,8 +164,12 @@ class OpenAILLMManager(LLMManager):
             import openai
             
             logger.info(f"Initializing OpenAI LLM: {self.model_name}")
-            openai.api_key = settings.llm.api_key
-            self.client = openai
+            api_key, base_url = settings.llm.credentials("openai")
+            self.client = openai.OpenAI(
+                api_key=api_key or None,
+                base_url=base_url or None,
+                timeout=settings.llm.timeout,
+            )
         except ImportError:
             raise ModelNotFoundError(
                 "OpenAI library not installed. Install with: pip install openai"
@@ -133,18 +185,19 @@ class OpenAILLMManager(LLMManager):
                 for msg in messages
             ]
             
-            response = self.client.ChatCompletion.create(
+            response = self.client.chat.completions.create(
                 model=self.model_name,
                 messages=formatted_messages,
                 temperature=kwargs.get("temperature", settings.llm.temperature),
                 max_tokens=kwargs.get("max_tokens", settings.llm.max_tokens),
                 top_p=kwargs.get("top_p", settings.llm.top_p),
+                timeout=kwargs.get("timeout", settings.llm.timeout),
             )
             
             return LLMResponse(
                 content=response.choices[0].message.content,
                 model=self.model_name,
-                tokens_used=response.usage.total_tokens if hasattr(response, "usage") else 0,
+                tokens_used=response.usage.total_tokens if response.usage else 0,
                 metadata={
                     "finish_reason": response.choices[0].finish_reason,
                 },
@@ -162,7 +215,12 @@ class AnthropicLLMManager(LLMManager):
             import anthropic
             
             logger.info(f"Initializing Anthropic LLM: {self.model_name}")
-            self.client = anthropic.Anthropic(api_key=settings.llm.api_key)
+            api_key, base_url = settings.llm.credentials("anthropic")
+            self.client = anthropic.Anthropic(
+                api_key=api_key or None,
+                base_url=base_url or None,
+                timeout=settings.llm.timeout,
+            )
         except ImportError:
             raise ModelNotFoundError(
                 "Anthropic library not installed. Install with: pip install anthropic"
@@ -170,18 +228,39 @@ class AnthropicLLMManager(LLMManager):
         except Exception as e:
             raise ModelNotFoundError(f"Failed to initialize Anthropic: {str(e)}")
     
+    @staticmethod
+    def _split_system(messages: List[Message]) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Separate system messages from the conversation.
+        
+        The Messages API takes the system prompt as its own parameter and
+        rejects "system" roles in the message list.
+        
+        Args:
+            messages: Chat messages
+        
+        Returns:
+            Joined system prompt and the user/assistant messages
+        """
+        system = "\n\n".join(msg.content for msg in messages if msg.role == "system")
+        conversation = [
+            {"role": msg.role, "content": msg.content}
+            for msg in messages if msg.role in ["user", "assistant"]
+        ]
+        return system, conversation
+    
     def _call(self, messages: List[Message], **kwargs) -> LLMResponse:
         """Call Anthropic API."""
         try:
-            formatted_messages = [
-                {"role": msg.role, "content": msg.content}
-                for msg in messages if msg.role in ["user", "assistant"]
-            ]
+            system, formatted_messages = self._split_system(messages)
+            request = {"system": system} if system else {}
             
             response = self.client.messages.create(
                 model=self.model_name,
                 max_tokens=kwargs.get("max_tokens", settings.llm.max_tokens),
                 messages=formatted_messages,
+                timeout=kwargs.get("timeout", settings.llm.timeout),
+                **request,
             )
             
             return LLMResponse(
@@ -216,21 +295,30 @@ class DummyLLMManager(LLMManager):
         )
 
 
-def get_llm_manager(manager_type: str = "openai") -> LLMManager:
+def get_llm_manager(manager_type: str = "openai", model_name: str = None) -> LLMManager:
     """
     Factory function to get LLM manager.
     
     Args:
-        manager_type: Type of manager ('openai', 'anthropic', or 'dummy')
+        manager_type: Type of manager ('openai', 'anthropic', 'dummy', or 'router')
+        model_name: Optional model name overriding settings
     
     Returns:
         LLMManager instance
     """
     if manager_type == "openai":
-        return OpenAILLMManager()
+        return OpenAILLMManager(model_name)
     elif manager_type == "anthropic":
-        return AnthropicLLMManager()
+        return AnthropicLLMManager(model_name)
     elif manager_type == "dummy":
-        return DummyLLMManager()
+        return DummyLLMManager(model_name)
+    elif manager_type == "router":
+        from .router import RoutingLLMManager
+        
+        backends = {}
+        for spec in settings.llm.routing_providers:
+            provider, _, backend_model = spec.partition(":")
+            backends[spec] = get_llm_manager(provider, backend_model or None)
+        return RoutingLLMManager(backends)
     else:
         raise ValueError(f"Unknown manager type: {manager_type}")
@@ -0,0 +1,376 @@
+"""
+Local mock LLM server for offline load testing.
+
+Speaks the OpenAI chat completions and Anthropic messages HTTP APIs, with
+and without streaming, and simulates provider latency, throughput, errors
+and concurrency limits. Point the OpenAI or Anthropic manager at it with
+LLM_BASE_URL (http://host:port/v1 for OpenAI, http://host:port for
+Anthropic).
+
+Run standalone with:
+    python -m src.llm.mock_server --port 8900 --ttft 0.3 --tokens-per-second 40
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..utils.logger import get_logger
+from ..config.settings import settings
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+VOCABULARY = (
+    "the quick brown fox jumps over a lazy dog while the assistant explains "
+    "how the system works in clear simple terms"
+).split()
+
+
+@dataclass
+class MockLLMProfile:
+    """Simulated provider behaviour."""
+    time_to_first_token: float = 0.2  # seconds
+    tokens_per_second: float = 50.0
+    output_tokens: int = 64
+    error_rate: float = 0.0
+    max_concurrency: int = 0  # 0 means unlimited
+    seed: Optional[int] = None
+
+
+class _MockLLMHandler(BaseHTTPRequestHandler):
+    """Request handler; `server` is a _MockHTTPServer."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        logger.debug(f"Mock LLM server: {format % args}")
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw_body = self.rfile.read(length)
+        
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            api = "openai"
+        elif path.endswith("/messages"):
+            api = "anthropic"
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+        
+        try:
+            body = json.loads(raw_body or b"{}")
+        except ValueError:
+            self._send_error(api, 400, "invalid_request_error", "Body is not valid JSON")
+            return
+        
+        server = self.server
+        if not server.slots.acquire(blocking=False):
+            server.count("rejected")
+            self._send_error(api, 429, "rate_limit_error", "Mock server concurrency limit reached")
+            return
+        
+        try:
+            server.count("requests")
+            if server.should_fail():
+                server.count("errors")
+                time.sleep(server.profile.time_to_first_token)
+                self._send_error(api, 500, "api_error", "Simulated provider error")
+                return
+            
+            prompt_tokens, tokens = server.plan_completion(body)
+            if body.get("stream"):
+                self._stream(api, body, prompt_tokens, tokens)
+            else:
+                server.sleep_for(len(tokens))
+                if api == "openai":
+                    payload = _openai_completion(body, prompt_tokens, tokens)
+                else:
+                    payload = _anthropic_message(body, prompt_tokens, tokens)
+                self._send_json(200, payload)
+        finally:
+            server.slots.release()
+    
+    def _stream(self, api: str, body: Dict, prompt_tokens: int, tokens: List[str]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        
+        profile = self.server.profile
+        events = (
+            _openai_stream_events(body, tokens) if api == "openai"
+            else _anthropic_stream_events(body, prompt_tokens, tokens)
+        )
+        
+        first = True
+        for is_token, event in events:
+            if is_token:
+                if first:
+                    time.sleep(profile.time_to_first_token)
+                    first = False
+                elif profile.tokens_per_second > 0:
+                    time.sleep(1.0 / profile.tokens_per_second)
+            self._write_chunk(event.encode("utf-8"))
+        self._write_chunk(b"")
+    
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+    
+    def _send_json(self, status: int, payload: Dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _send_error(self, api: str, status: int, error_type: str, message: str):
+        if api == "anthropic":
+            payload = {"type": "error", "error": {"type": error_type, "message": message}}
+        else:
+            payload = {"error": {"type": error_type, "message": message, "code": None}}
+        self._send_json(status, payload)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    """HTTP server holding the simulation profile and counters."""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], profile: MockLLMProfile):
+        super().__init__(address, _MockLLMHandler)
+        self.profile = profile
+        # A zero limit is modelled as an effectively unbounded semaphore
+        self.slots = threading.BoundedSemaphore(profile.max_concurrency or 1_000_000)
+        self.random = random.Random(profile.seed)
+        self.stats = {"requests": 0, "errors": 0, "rejected": 0}
+        self._lock = threading.Lock()
+    
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.random.random() < self.profile.error_rate
+    
+    def plan_completion(self, body: Dict) -> Tuple[int, List[str]]:
+        """Return prompt token estimate and the tokens to generate."""
+        text = _prompt_text(body)
+        prompt_tokens = max(1, len(text) // 4)
+        limit = body.get("max_tokens") or body.get("max_completion_tokens")
+        count = min(self.profile.output_tokens, limit or self.profile.output_tokens)
+        tokens = [VOCABULARY[i % len(VOCABULARY)] for i in range(max(1, count))]
+        return prompt_tokens, tokens
+    
+    def sleep_for(self, num_tokens: int):
+        """Simulate generation time for a non-streaming response."""
+        duration = self.profile.time_to_first_token
+        if self.profile.tokens_per_second > 0:
+            duration += (num_tokens - 1) / self.profile.tokens_per_second
+        time.sleep(duration)
+
+
+def _prompt_text(body: Dict) -> str:
+    parts = []
+    system = body.get("system")
+    if isinstance(system, str):
+        parts.append(system)
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = " ".join(
+                block.get("text", "") for block in content if isinstance(block, dict)
+            )
+        parts.append(content)
+    return "\n".join(parts)
+
+
+def _openai_completion(body: Dict, prompt_tokens: int, tokens: List[str]) -> Dict:
+    return {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock-model"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": " ".join(tokens)},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        },
+    }
+
+
+def _anthropic_message(body: Dict, prompt_tokens: int, tokens: List[str]) -> Dict:
+    return {
+        "id": f"msg_mock_{uuid.uuid4().hex[:12]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "mock-model"),
+        "content": [{"type": "text", "text": " ".join(tokens)}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": prompt_tokens, "output_tokens": len(tokens)},
+    }
+
+
+def _sse(data: Dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+def _openai_stream_events(body: Dict, tokens: List[str]) -> Iterator[Tuple[bool, str]]:
+    """Yield (is_token, event) pairs for an OpenAI streaming response."""
+    base = {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "mock-model"),
+    }
+    
+    def chunk(delta: Dict, finish_reason: str = None) -> str:
+        choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+        return _sse({**base, "choices": [choice]})
+    
+    yield False, chunk({"role": "assistant", "content": ""})
+    for i, token in enumerate(tokens):
+        yield True, chunk({"content": token if i == 0 else f" {token}"})
+    yield False, chunk({}, finish_reason="stop")
+    yield False, "data: [DONE]\n\n"
+
+
+def _anthropic_stream_events(
+    body: Dict,
+    prompt_tokens: int,
+    tokens: List[str],
+) -> Iterator[Tuple[bool, str]]:
+    """Yield (is_token, event) pairs for an Anthropic streaming response."""
+    message = _anthropic_message(body, prompt_tokens, [])
+    message["content"] = []
+    message["stop_reason"] = None
+    message["usage"]["output_tokens"] = 0
+    
+    yield False, _sse({"type": "message_start", "message": message}, "message_start")
+    yield False, _sse(
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        "content_block_start",
+    )
+    for i, token in enumerate(tokens):
+        delta = {"type": "text_delta", "text": token if i == 0 else f" {token}"}
+        yield True, _sse(
+            {"type": "content_block_delta", "index": 0, "delta": delta},
+            "content_block_delta",
+        )
+    yield False, _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+    yield False, _sse(
+        {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(tokens)},
+        },
+        "message_delta",
+    )
+    yield False, _sse({"type": "message_stop"}, "message_stop")
+
+
+class MockLLMServer:
+    """Background-thread mock LLM server."""
+    
+    def __init__(self, profile: MockLLMProfile = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize mock server.
+        
+        Args:
+            profile: Latency, throughput and error profile
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.profile = profile or MockLLMProfile()
+        self._server = _MockHTTPServer((host, port), self.profile)
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL of the server (append /v1 for the OpenAI client)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Request, error and rejection counters."""
+        return dict(self._server.stats)
+    
+    def start(self) -> "MockLLMServer":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="mock-llm-server",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Mock LLM server listening on {self.url}")
+        return self
+    
+    def stop(self):
+        """Stop the server and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Anthropic LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--ttft", type=float, default=0.2, help="Time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    profile = MockLLMProfile(
+        time_to_first_token=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+    )
+    server = MockLLMServer(profile, host=args.host, port=args.port)
+    print(f"Mock LLM server on {server.url} (OpenAI base URL: {server.url}/v1)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
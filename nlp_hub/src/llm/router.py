@@ -0,0 +1,298 @@
+"""Latency-aware routing across multiple LLM providers."""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+from dataclasses import dataclass
+from .manager import LLMManager, LLMResponse, Message
+from ..utils.logger import get_logger
+from ..utils.exceptions import LLMError, RateLimitError
+from ..config.settings import settings
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+@dataclass
+class BackendStats:
+    """Rolling health statistics for a routed backend."""
+    ewma_latency: Optional[float] = None  # seconds, None until first sample
+    ewma_error_rate: float = 0.0
+    in_flight: int = 0
+    total_requests: int = 0
+    total_failures: int = 0
+    
+    def record(self, latency: float, success: bool, alpha: float):
+        """Fold one request outcome into the moving averages."""
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = alpha * latency + (1 - alpha) * self.ewma_latency
+        
+        error = 0.0 if success else 1.0
+        self.ewma_error_rate = alpha * error + (1 - alpha) * self.ewma_error_rate
+        self.total_requests += 1
+        if not success:
+            self.total_failures += 1
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open probe."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        failure_threshold: int = None,
+        recovery_timeout: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds to wait before probing an open circuit
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold or settings.llm.circuit_failure_threshold
+        self.recovery_timeout = (
+            settings.llm.circuit_recovery_timeout if recovery_timeout is None else recovery_timeout
+        )
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+    
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent through this circuit."""
+        if self.state == self.CLOSED:
+            return True
+        
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        
+        # Half-open: let exactly one probe through
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+    
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def release(self):
+        """Return an allowed request that never reached the provider."""
+        self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Count a failure and open the circuit when the threshold is hit."""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+
+
+@dataclass
+class RoutedBackend:
+    """An LLM manager registered with the router."""
+    name: str
+    manager: LLMManager
+    weight: float
+    stats: BackendStats
+    breaker: CircuitBreaker
+
+
+class RoutingLLMManager(LLMManager):
+    """
+    LLM manager that load-balances requests towards the fastest healthy backend.
+    
+    Each backend's score is its EWMA latency, inflated by its EWMA error
+    rate and current in-flight requests. A request goes to a backend drawn
+    with probability proportional to weight / score, so faster and heavier
+    weighted backends take most of the traffic while the others keep
+    receiving enough to track their recovery. Backends without samples are
+    tried first so every provider gets probed. Failed calls fail over to
+    the remaining backends in score order within what is left of the
+    call's timeout, and repeated failures open a per-backend circuit
+    breaker. Rejections by the local rate limiter fail over too, but are
+    not held against the backend.
+    """
+    
+    def __init__(
+        self,
+        backends: Union[Dict[str, LLMManager], List[LLMManager]],
+        weights: Dict[str, float] = None,
+        alpha: float = None,
+        error_penalty: float = None,
+        failure_threshold: int = None,
+        recovery_timeout: float = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random = None,
+    ):
+        """
+        Initialize routing manager.
+        
+        Args:
+            backends: Backend managers, keyed by name (or a list, named by model)
+            weights: Optional relative weight per backend name (default 1.0)
+            alpha: EWMA smoothing factor in (0, 1]
+            error_penalty: Latency multiplier applied per unit of error rate
+            failure_threshold: Consecutive failures before a circuit opens
+            recovery_timeout: Seconds before an open circuit is probed again
+            clock: Monotonic time source (injectable for tests)
+            rng: Random source for backend selection (injectable for tests)
+        """
+        if isinstance(backends, list):
+            backends = {manager.model_name: manager for manager in backends}
+        if not backends:
+            raise ValueError("RoutingLLMManager requires at least one backend")
+        
+        weights = weights if weights is not None else settings.llm.routing_weights
+        self.alpha = alpha or settings.llm.routing_ewma_alpha
+        self.error_penalty = (
+            settings.llm.routing_error_penalty if error_penalty is None else error_penalty
+        )
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self.backends: List[RoutedBackend] = [
+            RoutedBackend(
+                name=name,
+                manager=manager,
+                weight=float(weights.get(name, 1.0)),
+                stats=BackendStats(),
+                breaker=CircuitBreaker(failure_threshold, recovery_timeout, clock=clock),
+            )
+            for name, manager in backends.items()
+        ]
+        
+        super().__init__(model_name="router")
+        # Backends apply their own rate limits; scheduling here would double count
+        self.scheduler = None
+    
+    def _load_model(self):
+        """Routing manager has no client of its own."""
+        logger.info(
+            f"Using routing LLM manager over: {', '.join(b.name for b in self.backends)}"
+        )
+        self.client = None
+    
+    def _score(self, backend: RoutedBackend) -> float:
+        """Expected cost of a request on the backend (lower is better)."""
+        stats = backend.stats
+        if stats.ewma_latency is None:
+            return 0.0
+        
+        penalty = 1.0 + self.error_penalty * stats.ewma_error_rate
+        return max(stats.ewma_latency, 1e-9) * penalty * (1 + stats.in_flight)
+    
+    def _ranked_backends(self) -> List[RoutedBackend]:
+        """Backends in the order to try them: the sampled choice, then failovers."""
+        with self._lock:
+            scores = {backend.name: self._score(backend) for backend in self.backends}
+        
+        unprobed = [b for b in self.backends if scores[b.name] == 0.0]
+        if unprobed:
+            first = unprobed[0]
+        else:
+            shares = [max(b.weight, 0.0) / scores[b.name] for b in self.backends]
+            if sum(shares) > 0:
+                first = self.rng.choices(self.backends, weights=shares)[0]
+            else:
+                first = self.backends[0]
+        
+        rest = sorted(
+            (b for b in self.backends if b is not first),
+            key=lambda b: scores[b.name] / max(b.weight, 1e-9),
+        )
+        return [first] + rest
+    
+    def _call(self, messages: List[Message], **kwargs) -> LLMResponse:
+        """Send the request to a backend, failing over on errors."""
+        errors = []
+        timeout = kwargs.get("timeout")
+        deadline = self.clock() + timeout if timeout is not None else None
+        
+        for backend in self._ranked_backends():
+            if deadline is not None:
+                # Failovers share the caller's timeout rather than restarting it
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    errors.append(f"{backend.name}: not tried, timeout exhausted")
+                    break
+                kwargs["timeout"] = remaining
+            
+            with self._lock:
+                if not backend.breaker.allow_request():
+                    continue
+                backend.stats.in_flight += 1
+            
+            start = self.clock()
+            try:
+                response = backend.manager.chat(messages, **kwargs)
+            except RateLimitError as e:
+                # Local back-pressure says nothing about the provider's health
+                with self._lock:
+                    backend.stats.in_flight -= 1
+                    backend.breaker.release()
+                logger.warning(f"LLM backend '{backend.name}' rate limited, failing over: {str(e)}")
+                errors.append(f"{backend.name}: {str(e)}")
+                continue
+            except Exception as e:
+                latency = self.clock() - start
+                with self._lock:
+                    backend.stats.in_flight -= 1
+                    backend.stats.record(latency, success=False, alpha=self.alpha)
+                    backend.breaker.record_failure()
+                
+                logger.warning(f"LLM backend '{backend.name}' failed, failing over: {str(e)}")
+                errors.append(f"{backend.name}: {str(e)}")
+                continue
+            
+            latency = self.clock() - start
+            with self._lock:
+                backend.stats.in_flight -= 1
+                backend.stats.record(latency, success=True, alpha=self.alpha)
+                backend.breaker.record_success()
+            
+            response.metadata["backend"] = backend.name
+            response.metadata["backend_latency"] = latency
+            return response
+        
+        if not errors:
+            raise LLMError("No healthy LLM backend available (all circuits open)")
+        raise LLMError(f"All LLM backends failed: {'; '.join(errors)}")
+    
+    def get_backend_stats(self) -> Dict[str, Dict]:
+        """
+        Get routing statistics per backend.
+        
+        Returns:
+            Mapping of backend name to its latency, error rate and circuit state
+        """
+        with self._lock:
+            return {
+                backend.name: {
+                    "weight": backend.weight,
+                    "ewma_latency": backend.stats.ewma_latency,
+                    "ewma_error_rate": backend.stats.ewma_error_rate,
+                    "in_flight": backend.stats.in_flight,
+                    "total_requests": backend.stats.total_requests,
+                    "total_failures": backend.stats.total_failures,
+                    "circuit_state": backend.breaker.state,
+                }
+                for backend in self.backends
+            }
@@ -0,0 +1,245 @@
+"""Client-side rate limiting and priority scheduling for LLM calls."""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional
+from ..utils.logger import get_logger
+from ..utils.exceptions import RateLimitError
+from ..utils.metrics import metrics
+from ..config.settings import settings
+
+
+logger = get_logger(__name__, level=settings.log_level)
+
+
+# Lower value is served first
+PRIORITY_CLASSES = {
+    "interactive": 0,
+    "batch": 1,
+}
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+    
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate_per_minute: Refill rate (0 or less disables the limit)
+            capacity: Maximum burst size (defaults to one minute of refill)
+            clock: Monotonic time source
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+    
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        # Requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        deficit = amount - self.tokens
+        return max(0.0, deficit / self.rate)
+    
+    def consume(self, amount: float):
+        """Take tokens from the bucket; the balance may go negative."""
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens -= amount
+
+
+class LLMScheduler:
+    """
+    Rate limiter and priority queue in front of LLM provider calls.
+    
+    Each call waits until both the request bucket and the token bucket can
+    cover it. Waiting calls are served strictly by priority class, and
+    round-robin across clients within a class, from a bounded queue.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        max_queue_size: int = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize scheduler.
+        
+        Args:
+            requests_per_minute: Request rate limit (0 disables)
+            tokens_per_minute: Token rate limit (0 disables)
+            max_queue_size: Maximum number of waiting calls
+            clock: Monotonic time source
+        """
+        if requests_per_minute is None:
+            requests_per_minute = settings.llm.requests_per_minute
+        if tokens_per_minute is None:
+            tokens_per_minute = settings.llm.tokens_per_minute
+        
+        self.request_bucket = TokenBucket(requests_per_minute, clock=clock)
+        self.token_bucket = TokenBucket(tokens_per_minute, clock=clock)
+        self.max_queue_size = max_queue_size or settings.llm.scheduler_max_queue
+        self.clock = clock
+        
+        self._cond = threading.Condition()
+        self._queues: Dict[int, "OrderedDict[str, deque]"] = {
+            level: OrderedDict() for level in sorted(set(PRIORITY_CLASSES.values()))
+        }
+        self._queued = 0
+    
+    def _head(self) -> Optional[object]:
+        """Ticket that should be served next."""
+        for clients in self._queues.values():
+            for tickets in clients.values():
+                return tickets[0]
+        return None
+    
+    def _pop_head(self, level: int, client_id: str):
+        clients = self._queues[level]
+        tickets = clients[client_id]
+        tickets.popleft()
+        if tickets:
+            clients.move_to_end(client_id)
+        else:
+            del clients[client_id]
+        self._queued -= 1
+    
+    def _remove(self, level: int, client_id: str, ticket: object):
+        clients = self._queues[level]
+        tickets = clients.get(client_id)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+            if not tickets:
+                del clients[client_id]
+            self._queued -= 1
+    
+    def acquire(
+        self,
+        estimated_tokens: int,
+        priority: str = "interactive",
+        client_id: str = "default",
+        timeout: float = None,
+    ) -> float:
+        """
+        Block until a call may be sent to the provider.
+        
+        Args:
+            estimated_tokens: Estimated tokens the call will consume
+            priority: Priority class name
+            client_id: Caller identity used for fair dequeue
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        
+        Returns:
+            Seconds spent waiting in the queue
+        
+        Raises:
+            RateLimitError: If the queue is full or the wait times out
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        level = PRIORITY_CLASSES[priority]
+        ticket = object()
+        enqueued_at = self.clock()
+        
+        with self._cond:
+            if self._queued >= self.max_queue_size:
+                metrics.counter("llm_scheduler_rejected_total", priority=priority).inc()
+                raise RateLimitError(f"LLM scheduler queue is full ({self.max_queue_size} waiting)")
+            
+            self._queues[level].setdefault(client_id, deque()).append(ticket)
+            self._queued += 1
+            
+            try:
+                while True:
+                    wait = None
+                    if self._head() is ticket:
+                        wait = max(
+                            self.request_bucket.time_until(1),
+                            self.token_bucket.time_until(estimated_tokens),
+                        )
+                        if wait <= 0:
+                            self.request_bucket.consume(1)
+                            self.token_bucket.consume(estimated_tokens)
+                            self._pop_head(level, client_id)
+                            self._cond.notify_all()
+                            break
+                    
+                    if timeout is not None:
+                        remaining = timeout - (self.clock() - enqueued_at)
+                        if remaining <= 0:
+                            raise RateLimitError("Timed out waiting for LLM rate limit")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    
+                    self._cond.wait(wait)
+            except BaseException:
+                self._remove(level, client_id, ticket)
+                self._cond.notify_all()
+                raise
+        
+        waited = self.clock() - enqueued_at
+        metrics.histogram("llm_scheduler_queue_wait_seconds", priority=priority).observe(waited)
+        return waited
+    
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """
+        Correct the token bucket once the real usage is known.
+        
+        Args:
+            estimated_tokens: Tokens reserved in `acquire`
+            actual_tokens: Tokens reported by the provider (0 refunds the
+                whole reservation, e.g. for a call that failed)
+        """
+        with self._cond:
+            self.token_bucket.consume(actual_tokens - estimated_tokens)
+            self._cond.notify_all()
+    
+    @property
+    def queue_size(self) -> int:
+        """Number of calls currently waiting."""
+        return self._queued
+
+
+_default_scheduler: Optional[LLMScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> Optional[LLMScheduler]:
+    """
+    Get the process-wide scheduler shared by all LLM managers.
+    
+    Returns:
+        LLMScheduler instance, or None if no rate limits are configured
+    """
+    global _default_scheduler
+    
+    if settings.llm.requests_per_minute <= 0 and settings.llm.tokens_per_minute <= 0:
+        return None
+    
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = LLMScheduler()
+        return _default_scheduler
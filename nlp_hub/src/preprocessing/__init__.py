@@ -1,5 +1,6 @@
 """Preprocessing module."""
 
 from .preprocessor import TextPreprocessor
+from .keywords import KeywordMatch, KeywordMatcher, load_keyword_rules
 
-__all__ = ["TextPreprocessor"]
+__all__ = ["TextPreprocessor", "KeywordMatch", "KeywordMatcher", "load_keyword_rules"]
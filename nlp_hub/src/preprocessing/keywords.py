@@ -0,0 +1,177 @@
+"""Compiled multi-pattern keyword matching (Aho-Corasick)."""
+
+import json
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+from ..utils.exceptions import ConfigurationError
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """A keyword occurrence in a text."""
+    label: str
+    keyword: str
+    start: int
+    end: int
+
+
+def load_keyword_rules(path: str, default: Dict[str, List[str]] = None) -> Dict[str, List[str]]:
+    """
+    Load keyword rules from a JSON file mapping labels to keyword lists.
+    
+    Args:
+        path: Rules file (the default rules are returned when empty)
+        default: Rules used when no path is given
+    
+    Returns:
+        Dictionary of label to keywords, in file order
+    
+    Raises:
+        ConfigurationError: If the file cannot be read or is malformed
+    """
+    if not path:
+        return default or {}
+    
+    try:
+        rules = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ConfigurationError(f"Failed to load keyword rules {path}: {str(e)}")
+    
+    if not isinstance(rules, dict) or not all(
+        isinstance(v, list) and all(isinstance(k, str) for k in v) for v in rules.values()
+    ):
+        raise ConfigurationError(f"Keyword rules {path} must map labels to lists of strings")
+    return rules
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher for many keywords at once.
+    
+    All keywords are compiled into one Aho-Corasick automaton, so a text
+    is scanned once regardless of how many keywords there are. Keywords
+    that begin or end with a word character only match at word
+    boundaries ("hi" does not match inside "this"); punctuation keywords
+    such as "?" match anywhere.
+    """
+    
+    def __init__(self, rules: Dict[str, Iterable[str]]):
+        """
+        Compile the automaton.
+        
+        Args:
+            rules: Mapping of label to keywords
+        """
+        self.labels = list(rules)
+        self._patterns: List[Tuple[str, str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+        
+        for label, keywords in rules.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                node = 0
+                for char in keyword:
+                    next_node = self._goto[node].get(char)
+                    if next_node is None:
+                        next_node = len(self._goto)
+                        self._goto[node][char] = next_node
+                        self._goto.append({})
+                        self._output.append([])
+                    node = next_node
+                self._output[node].append(len(self._patterns))
+                self._patterns.append((label, keyword))
+        
+        self._build_links()
+    
+    def _build_links(self):
+        """Compute failure links and links to the next node with output."""
+        self._fail = [0] * len(self._goto)
+        self._next_output = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._next_output[child] = fail if self._output[fail] else self._next_output[fail]
+                queue.append(child)
+    
+    def __len__(self) -> int:
+        return len(self._patterns)
+    
+    def find_all(self, text: str, overlapping: bool = True) -> List[KeywordMatch]:
+        """
+        Find keyword occurrences in one pass over the text.
+        
+        Args:
+            text: Input text
+            overlapping: Return every match; otherwise keep the leftmost,
+                longest non-overlapping matches
+        
+        Returns:
+            Matches ordered by start offset (longest first at equal starts)
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Some characters lowercase to several; keep offsets aligned
+            lowered = "".join(char.lower()[0] for char in text)
+        
+        matches = []
+        goto, fail, output, next_output = self._goto, self._fail, self._output, self._next_output
+        node = 0
+        for end, char in enumerate(lowered, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            hit = node if output[node] else next_output[node]
+            while hit:
+                for pattern_id in output[hit]:
+                    label, keyword = self._patterns[pattern_id]
+                    start = end - len(keyword)
+                    if self._at_boundary(lowered, keyword, start, end):
+                        matches.append(KeywordMatch(label, keyword, start, end))
+                hit = next_output[hit]
+        
+        matches.sort(key=lambda m: (m.start, m.start - m.end))
+        if overlapping:
+            return matches
+        
+        selected, last_end = [], 0
+        for match in matches:
+            if match.start >= last_end:
+                selected.append(match)
+                last_end = match.end
+        return selected
+    
+    @staticmethod
+    def _at_boundary(text: str, keyword: str, start: int, end: int) -> bool:
+        if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(keyword[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+    
+    def labels_found(self, text: str) -> List[str]:
+        """
+        Get the labels with at least one match, in rule order.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Matched labels
+        """
+        found = {match.label for match in self.find_all(text)}
+        return [label for label in self.labels if label in found]
@@ -38,6 +38,7 @@ class RAGRetriever(ABC):
         self.embedding_model = embedding_model or settings.rag.embedding_model
         self.embeddings = None
         self.vector_store = None
+        self.corpus_version = 0  # incremented whenever documents change
         self._load_model()
     
     @abstractmethod
@@ -55,6 +56,10 @@ class RAGRetriever(ABC):
         """Retrieve relevant documents."""
         pass
     
+    def retrieve_many(self, queries: List[str], top_k: int = None) -> List[List[RetrievalResult]]:
+        """Retrieve relevant documents for several queries (override to batch)."""
+        return [self.retrieve(query, top_k) for query in queries]
+    
     def search(self, query: str, top_k: int = None) -> List[RetrievalResult]:
         """
         Search for relevant documents.
@@ -87,6 +92,39 @@ class RAGRetriever(ABC):
         except Exception as e:
             logger.error(f"RAG retrieval failed: {str(e)}")
             raise RAGError(f"RAG retrieval failed: {str(e)}")
+    
+    def search_many(self, queries: List[str], top_k: int = None) -> List[List[RetrievalResult]]:
+        """
+        Search for relevant documents for several queries at once.
+        
+        Args:
+            queries: Search queries
+            top_k: Number of results to return per query
+        
+        Returns:
+            Retrieved documents for each query, in query order
+        
+        Raises:
+            RAGError: If retrieval fails
+        """
+        try:
+            queries = [validate_text(query) for query in queries]
+            top_k = top_k or settings.rag.top_k
+            
+            results = self.retrieve_many(queries, top_k)
+            
+            logger.info(
+                f"RAG batch retrieval completed",
+                extra={
+                    "num_queries": len(queries),
+                    "num_results": sum(len(r) for r in results),
+                }
+            )
+            
+            return results
+        except Exception as e:
+            logger.error(f"RAG batch retrieval failed: {str(e)}")
+            raise RAGError(f"RAG batch retrieval failed: {str(e)}")
 
 
 class FAISSRetriever(RAGRetriever):
@@ -130,6 +168,7 @@ class FAISSRetriever(RAGRetriever):
             
             self.documents = documents
             self.metadata_list = metadata or [{} for _ in documents]
+            self.corpus_version += 1
             
             logger.info(f"Added {len(documents)} documents to FAISS index")
         except Exception as e:
@@ -137,40 +176,47 @@ class FAISSRetriever(RAGRetriever):
     
     def retrieve(self, query: str, top_k: int = None) -> List[RetrievalResult]:
         """Retrieve documents using FAISS similarity search."""
+        return self.retrieve_many([query], top_k)[0]
+    
+    def retrieve_many(self, queries: List[str], top_k: int = None) -> List[List[RetrievalResult]]:
+        """Retrieve documents for all queries with one encode and one index search."""
         if self.vector_store is None or not self.documents:
-            return []
+            return [[] for _ in queries]
         
         top_k = top_k or settings.rag.top_k
         
         try:
             import numpy as np
             
-            # Embed query
-            query_embedding = self.embeddings.encode([query])
+            # Embed queries
+            query_embeddings = self.embeddings.encode(queries)
             
             # Search in FAISS
             distances, indices = self.vector_store.search(
-                np.array(query_embedding).astype("float32"),
+                np.array(query_embeddings).astype("float32"),
                 k=min(top_k, len(self.documents)),
             )
             
-            results = []
-            for distance, idx in zip(distances[0], indices[0]):
-                if idx >= 0:  # Valid index
-                    # Convert L2 distance to similarity score
-                    score = 1 / (1 + distance)
-                    
-                    if score >= settings.rag.similarity_threshold:
-                        results.append(
-                            RetrievalResult(
-                                content=self.documents[idx],
-                                source=self.metadata_list[idx].get("source", "unknown"),
-                                score=score,
-                                metadata=self.metadata_list[idx],
+            all_results = []
+            for query_distances, query_indices in zip(distances, indices):
+                results = []
+                for distance, idx in zip(query_distances, query_indices):
+                    if idx >= 0:  # Valid index
+                        # Convert L2 distance to similarity score
+                        score = 1 / (1 + distance)
+                        
+                        if score >= settings.rag.similarity_threshold:
+                            results.append(
+                                RetrievalResult(
+                                    content=self.documents[idx],
+                                    source=self.metadata_list[idx].get("source", "unknown"),
+                                    score=score,
+                                    metadata=self.metadata_list[idx],
+                                )
                             )
-                        )
+                all_results.append(results)
             
-            return results
+            return all_results
         except Exception as e:
             raise RAGError(f"Retrieval failed: {str(e)}")
 
@@ -188,6 +234,7 @@ class DummyRetriever(RAGRetriever):
         """Store documents in memory."""
         self.documents = documents
         self.metadata_list = metadata or [{} for _ in documents]
+        self.corpus_version += 1
         logger.info(f"Added {len(documents)} documents to dummy retriever")
     
     def retrieve(self, query: str, top_k: int = None) -> List[RetrievalResult]:
@@ -26,6 +26,15 @@ class ProcessingError(NLPHubException):
     pass
 
 
+class BatchProcessingError(ProcessingError):
+    """Raised when some items of a batch fail; carries the partial results."""
+    
+    def __init__(self, message: str, results: list = None, errors: dict = None):
+        super().__init__(message)
+        self.results = results or []  # per-item results, None where the item failed
+        self.errors = errors or {}  # item index -> exception
+
+
 class IntegrationError(NLPHubException):
     """Raised when external service integration fails."""
     pass
@@ -51,6 +60,11 @@ class LLMError(NLPHubException):
     pass
 
 
+class RateLimitError(LLMError):
+    """Raised when the local LLM rate limiter rejects or times out a call."""
+    pass
+
+
 class ChatbotError(NLPHubException):
     """Raised when chatbot operations fail."""
     pass
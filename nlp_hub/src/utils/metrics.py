@@ -0,0 +1,169 @@
+"""Lightweight in-process metrics for NLP Hub."""
+
+import threading
+from collections import deque
+from typing import Dict
+
+
+class Counter:
+    """Monotonically increasing counter."""
+    
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0):
+        """Increment the counter."""
+        with self._lock:
+            self._value += amount
+    
+    @property
+    def value(self) -> float:
+        """Current counter value."""
+        return self._value
+    
+    def snapshot(self) -> Dict:
+        """Get counter value as a dictionary."""
+        return {"value": self._value}
+
+
+class Gauge:
+    """Value that can go up and down."""
+    
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+    
+    def set(self, value: float):
+        """Set the gauge."""
+        with self._lock:
+            self._value = value
+    
+    def inc(self, amount: float = 1.0):
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+    
+    def dec(self, amount: float = 1.0):
+        """Decrease the gauge."""
+        with self._lock:
+            self._value -= amount
+    
+    @property
+    def value(self) -> float:
+        """Current gauge value."""
+        return self._value
+    
+    def snapshot(self) -> Dict:
+        """Get gauge value as a dictionary."""
+        return {"value": self._value}
+
+
+class Histogram:
+    """Summary of observed values with percentiles over recent samples."""
+    
+    def __init__(self, max_samples: int = 1024):
+        """
+        Initialize histogram.
+        
+        Args:
+            max_samples: Number of recent samples kept for percentiles
+        """
+        self._samples = deque(maxlen=max_samples)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        """Record an observation."""
+        with self._lock:
+            self._samples.append(value)
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+    
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self._count
+    
+    def percentile(self, q: float) -> float:
+        """
+        Get a percentile over recent samples.
+        
+        Args:
+            q: Percentile in [0, 100]
+        
+        Returns:
+            Percentile value (0.0 if nothing was observed)
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))
+        return samples[index]
+    
+    def snapshot(self) -> Dict:
+        """Get histogram summary as a dictionary."""
+        return {
+            "count": self._count,
+            "sum": self._sum,
+            "mean": self._sum / self._count if self._count else 0.0,
+            "max": self._max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRegistry:
+    """Registry of named, optionally labelled metrics."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> str:
+        if not labels:
+            return name
+        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{label_str}}}"
+    
+    def _get_or_create(self, name: str, labels: Dict[str, str], factory):
+        key = self._key(name, labels)
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = factory()
+                self._metrics[key] = metric
+            return metric
+    
+    def counter(self, name: str, **labels) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(name, labels, Counter)
+    
+    def gauge(self, name: str, **labels) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(name, labels, Gauge)
+    
+    def histogram(self, name: str, **labels) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(name, labels, Histogram)
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Get all metric values keyed by metric name and labels."""
+        with self._lock:
+            items = list(self._metrics.items())
+        return {key: metric.snapshot() for key, metric in items}
+    
+    def reset(self):
+        """Remove all metrics."""
+        with self._lock:
+            self._metrics.clear()
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -2,13 +2,64 @@
 Integration tests for ChatbotManager.
 """
 
+import time
 import pytest
-from src.chatbot import ChatbotManager
+from src.chatbot import ChatbotManager, ChatContext, ChatMessage
+from src.config.settings import settings
+from src.chatbot.pipeline import ChatPipeline, StageCondition
+from src.utils.exceptions import ChatbotError, ConfigurationError
 from src.intent import get_intent_classifier
 from src.entity import get_entity_extractor
+from src.intent.classifier import DummyIntentClassifier, Intent
+from src.entity.extractor import DummyEntityExtractor
+from src.rag.retriever import DummyRetriever
 from src.llm import get_llm_manager
 
 
+STAGE_DELAY = 0.2
+
+
+class SlowIntentClassifier(DummyIntentClassifier):
+    """Dummy classifier with a fixed model latency."""
+    
+    def _predict(self, text):
+        time.sleep(STAGE_DELAY)
+        return super()._predict(text)
+
+
+class SlowEntityExtractor(DummyEntityExtractor):
+    """Dummy extractor with a fixed model latency."""
+    
+    def _extract(self, text):
+        time.sleep(STAGE_DELAY)
+        return super()._extract(text)
+
+
+class SlowRetriever(DummyRetriever):
+    """Dummy retriever with a fixed search latency."""
+    
+    def retrieve(self, query, top_k=None):
+        time.sleep(STAGE_DELAY)
+        return super().retrieve(query, top_k)
+
+
+class FailingIntentClassifier(DummyIntentClassifier):
+    """Intent classifier whose model always fails."""
+    
+    def classify(self, text):
+        raise RuntimeError("intent model unavailable")
+
+
+class CountingIntentClassifier(DummyIntentClassifier):
+    """Intent classifier that records batch sizes."""
+    
+    batch_sizes = ()
+    
+    def batch_classify(self, texts):
+        self.batch_sizes = list(self.batch_sizes) + [len(texts)]
+        return super().batch_classify(texts)
+
+
 class TestChatbotIntegration:
     """Integration tests for chatbot."""
     
@@ -48,6 +99,229 @@ class TestChatbotIntegration:
         history = chatbot.get_conversation_history(conv_id)
         
         assert len(history) >= 2  # At least user and assistant message
+    
+    def test_history_window(self):
+        """Test history is trimmed in place and passed to the LLM as-is."""
+        context = ChatContext("window")
+        for i in range(settings.chatbot.max_history + 3):
+            context.add_message(ChatMessage(role="user", content=f"message {i}"))
+        
+        history = context.get_conversation_history()
+        assert len(history) == settings.chatbot.max_history
+        assert history[0].content == "message 3"
+        assert history[-1] is context.messages[-1]
+        assert context.messages[0].timestamp.year >= 2024
+        assert context.messages[0]._metadata is None
+    
+    def test_stages_run_concurrently(self):
+        """Test pre-LLM latency is the slowest stage, not the sum."""
+        retriever = SlowRetriever()
+        retriever.add_documents(["NLP Hub supports RAG."])
+        chatbot = ChatbotManager(
+            intent_classifier=SlowIntentClassifier(),
+            entity_extractor=SlowEntityExtractor(),
+            rag_retriever=retriever,
+        )
+        conv_id = chatbot.create_conversation()
+        
+        chatbot.process_user_message(conv_id, "Hello John, what is RAG?")
+        timings = chatbot.conversations[conv_id].metadata["stage_timings_ms"]
+        chatbot.close()
+        
+        assert {"intent", "entities", "rag", "llm"} <= set(timings)
+        assert min(timings[s] for s in ("intent", "entities", "rag")) >= STAGE_DELAY * 1000
+        assert timings["pre_llm"] < 2 * STAGE_DELAY * 1000
+    
+    
+    def test_pipeline_rule_skips_stages(self):
+        """Test a confident greeting skips entities, RAG and the LLM."""
+        pipeline = ChatPipeline.from_dict({
+            "rules": [{
+                "name": "greeting",
+                "when": {"intents": ["greeting"], "min_confidence": 0.9},
+                "skip": ["entities", "rag", "llm"],
+                "response": "Hi there!",
+            }]
+        })
+        chatbot = ChatbotManager(pipeline=pipeline)
+        conv_id = chatbot.create_conversation()
+        
+        response = chatbot.process_user_message(conv_id, "Hello!")
+        context = chatbot.conversations[conv_id]
+        
+        assert response == "Hi there!"
+        assert context.metadata["skipped_stages"] == ["entities", "rag", "llm"]
+        assert set(context.metadata["stage_timings_ms"]) == {"intent", "pre_llm"}
+        
+        # Non-matching intents still run the full pipeline
+        response = chatbot.process_user_message(conv_id, "Tell me about Paris")
+        assert response != "Hi there!"
+        assert context.metadata["skipped_stages"] == []
+    
+    def test_pipeline_rule_does_not_delay_other_stages(self):
+        """Test gated stages start alongside intent and are dropped on a match."""
+        pipeline = ChatPipeline.from_dict({
+            "rules": [{
+                "name": "greeting",
+                "when": {"intents": ["greeting"], "min_confidence": 0.9},
+                "skip": ["entities", "rag"],
+            }]
+        })
+        retriever = SlowRetriever()
+        retriever.add_documents(["NLP Hub supports RAG."])
+        chatbot = ChatbotManager(
+            intent_classifier=SlowIntentClassifier(),
+            entity_extractor=SlowEntityExtractor(),
+            rag_retriever=retriever,
+            pipeline=pipeline,
+        )
+        
+        chatbot.process_user_message("a", "Tell me about Paris")
+        timings = chatbot.conversations["a"].metadata["stage_timings_ms"]
+        assert {"intent", "entities", "rag"} <= set(timings)
+        assert timings["pre_llm"] < 2 * STAGE_DELAY * 1000
+        
+        chatbot.process_user_message("b", "Hello!")
+        context = chatbot.conversations["b"]
+        chatbot.close()
+        
+        assert context.metadata["skipped_stages"] == ["entities", "rag"]
+        assert context.metadata["degradations"] == []
+        assert {"entities", "rag"}.isdisjoint(context.metadata["stage_timings_ms"])
+    
+    def test_failed_intent_drops_gated_stages(self):
+        """Test gated stages started alongside a failing intent stage are tracked."""
+        pipeline = ChatPipeline.from_dict({
+            "rules": [{"name": "greeting", "when": {"intents": ["greeting"]}, "skip": ["rag"]}]
+        })
+        retriever = SlowRetriever()
+        retriever.add_documents(["NLP Hub supports RAG."])
+        chatbot = ChatbotManager(
+            intent_classifier=FailingIntentClassifier(),
+            entity_extractor=SlowEntityExtractor(),
+            rag_retriever=retriever,
+            pipeline=pipeline,
+        )
+        
+        start = time.perf_counter()
+        with pytest.raises(ChatbotError):
+            chatbot.process_user_message("a", "Hello John, what is RAG?")
+        assert time.perf_counter() - start < STAGE_DELAY
+        assert chatbot._abandoned_stages == 2
+        
+        time.sleep(STAGE_DELAY * 1.5)
+        assert chatbot._abandoned_stages == 0
+        chatbot.close()
+    
+    def test_min_confidence_is_inclusive(self):
+        """Test an intent at exactly min_confidence matches the rule."""
+        condition = StageCondition(intents=["greeting"], min_confidence=0.9)
+        assert condition.matches(Intent(name="greeting", confidence=0.9))
+        assert not condition.matches(Intent(name="greeting", confidence=0.89))
+    
+    def test_slow_stages_degrade_at_deadline(self):
+        """Test stages that miss their deadline share are dropped."""
+        retriever = SlowRetriever()
+        retriever.add_documents(["NLP Hub supports RAG."])
+        chatbot = ChatbotManager(
+            entity_extractor=SlowEntityExtractor(),
+            rag_retriever=retriever,
+        )
+        conv_id = chatbot.create_conversation()
+        
+        # 0.3 of a 0.3s deadline leaves less than STAGE_DELAY for the stages
+        start = time.perf_counter()
+        response = chatbot.process_user_message(conv_id, "Hello John, what is RAG?", timeout=0.3)
+        elapsed = time.perf_counter() - start
+        context = chatbot.conversations[conv_id]
+        chatbot.close()
+        
+        assert response
+        assert elapsed < STAGE_DELAY
+        assert {"entities", "rag", "llm_max_tokens"} <= set(context.metadata["degradations"])
+        assert context.intent is not None
+        assert context.entities == {}
+    
+    def test_abandoned_stages_are_bounded(self, monkeypatch):
+        """Test abandoned stages neither leak timings nor queue up new work."""
+        monkeypatch.setattr(settings.chatbot, "stage_workers", 2)
+        retriever = SlowRetriever()
+        retriever.add_documents(["NLP Hub supports RAG."])
+        chatbot = ChatbotManager(
+            entity_extractor=SlowEntityExtractor(),
+            rag_retriever=retriever,
+        )
+        
+        chatbot.process_user_message("a", "Hello John, what is RAG?", timeout=0.3)
+        timings = dict(chatbot.conversations["a"].metadata["stage_timings_ms"])
+        
+        # Both workers still hold the abandoned stages: nothing is queued behind them
+        chatbot.process_user_message("b", "Hello again", timeout=0.3)
+        assert set(chatbot.conversations["b"].metadata["degradations"]) >= {
+            "intent", "entities", "rag",
+        }
+        
+        time.sleep(STAGE_DELAY * 1.5)
+        assert "entities" not in timings and "rag" not in timings
+        assert chatbot.conversations["a"].metadata["stage_timings_ms"] == timings
+        chatbot.process_user_message("c", "Hello", timeout=60)
+        assert chatbot.conversations["c"].metadata["degradations"] == []
+        chatbot.close()
+    
+    def test_failing_stage_does_not_leak_running_stages(self):
+        """Test stages still running when another stage raises are tracked."""
+        retriever = SlowRetriever()
+        retriever.add_documents(["NLP Hub supports RAG."])
+        chatbot = ChatbotManager(
+            intent_classifier=FailingIntentClassifier(),
+            entity_extractor=SlowEntityExtractor(),
+            rag_retriever=retriever,
+        )
+        
+        with pytest.raises(ChatbotError):
+            chatbot.process_user_message("a", "Hello John, what is RAG?", timeout=0.3)
+        assert chatbot._abandoned_stages == 2
+        
+        time.sleep(STAGE_DELAY * 1.5)
+        assert chatbot._abandoned_stages == 0
+        chatbot.close()
+    
+    def test_no_degradation_within_deadline(self):
+        """Test the default deadline runs every stage at full max_tokens."""
+        chatbot = ChatbotManager()
+        conv_id = chatbot.create_conversation()
+        
+        chatbot.process_user_message(conv_id, "Hello John")
+        assert chatbot.conversations[conv_id].metadata["degradations"] == []
+    
+    def test_process_batch(self):
+        """Test batch processing keeps input order and per-conversation turns."""
+        classifier = CountingIntentClassifier()
+        chatbot = ChatbotManager(intent_classifier=classifier)
+        items = [
+            ("a", "Hello there"),
+            ("b", "What is NLP?"),
+            ("a", "Please summarize"),
+            ("c", ""),
+        ]
+        
+        results = chatbot.process_batch(items, use_rag=False)
+        chatbot.close()
+        
+        assert classifier.batch_sizes == [3]
+        assert [r.conversation_id for r in results] == ["a", "b", "a", "c"]
+        assert results[0].intent == "greeting"
+        assert results[2].intent == "request"
+        assert results[3].error is not None
+        assert all(r.response for r in results[:3])
+        history = chatbot.get_conversation_history("a")
+        user_messages = [m.content for m in history if m.role == "user"]
+        assert user_messages == ["Hello there", "Please summarize"]
+    
+    def test_pipeline_rule_requires_template(self):
+        """Test skipping the LLM without a response template is rejected."""
+        with pytest.raises(ConfigurationError):
+            ChatPipeline.from_dict({"rules": [{"name": "bad", "skip": ["llm"]}]})
 
 
 if __name__ == "__main__":
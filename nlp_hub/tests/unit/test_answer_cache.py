@@ -0,0 +1,103 @@
+"""Unit tests for the first-turn answer cache."""
+
+import pytest
+from src.chatbot import ChatbotManager
+from src.chatbot.answer_cache import AnswerCache, normalize_message
+from src.config.settings import settings
+from src.llm.manager import DummyLLMManager
+from src.rag.retriever import DummyRetriever
+
+
+class CountingLLMManager(DummyLLMManager):
+    """Dummy LLM that counts calls."""
+    
+    calls = 0
+    
+    def _call(self, messages, **kwargs):
+        self.calls += 1
+        return super()._call(messages, **kwargs)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestAnswerCache:
+    """Test answer cache behaviour."""
+    
+    def test_normalize_message(self):
+        """Test case, whitespace and trailing punctuation are ignored."""
+        assert normalize_message("  What is   NLP? ") == normalize_message("what is nlp")
+    
+    def test_ttl(self):
+        """Test answers expire."""
+        clock = FakeClock()
+        cache = AnswerCache(ttl=10, max_entries=10, clock=clock)
+        key = AnswerCache.make_key("What is NLP?", "question", [], "professional")
+        cache.put(key, "answer")
+        assert cache.get(key) == "answer"
+        clock.now = 11
+        assert cache.get(key) is None
+    
+    def test_key_includes_entities(self):
+        """Test turns with different extracted entities do not share answers."""
+        cache = AnswerCache(ttl=10, max_entries=10)
+        paris = AnswerCache.make_key(
+            "Weather tomorrow?", "question", [], "professional", {"LOCATION": "Paris"}
+        )
+        tokyo = AnswerCache.make_key(
+            "Weather tomorrow?", "question", [], "professional", {"LOCATION": "Tokyo"}
+        )
+        cache.put(paris, "Sunny in Paris")
+        assert cache.get(paris) == "Sunny in Paris"
+        assert cache.get(tokyo) is None
+    
+    def test_first_turns_reuse_answers(self):
+        """Test repeated first turns skip the LLM, later turns do not."""
+        llm = CountingLLMManager()
+        retriever = DummyRetriever()
+        retriever.add_documents(["NLP is natural language processing."])
+        chatbot = ChatbotManager(
+            llm_manager=llm,
+            rag_retriever=retriever,
+            answer_cache=AnswerCache(ttl=60, max_entries=10),
+        )
+        
+        first = chatbot.process_user_message("a", "What is NLP?")
+        second = chatbot.process_user_message("b", "what is nlp")
+        assert second == first
+        assert llm.calls == 1
+        assert chatbot.conversations["b"].metadata["answer_cache"] == "hit"
+        assert len(chatbot.get_conversation_history("b")) == 2
+        
+        # Follow-up turns always reach the LLM
+        chatbot.process_user_message("b", "What is NLP?")
+        assert llm.calls == 2
+        
+        # Changing the corpus invalidates cached answers
+        retriever.add_documents(["NLP is a field of AI."])
+        chatbot.process_user_message("c", "What is NLP?")
+        assert llm.calls == 3
+        chatbot.close()
+    
+    def test_shortened_answers_are_not_cached(self, monkeypatch):
+        """Test a turn whose LLM output was cut to meet the deadline is not cached."""
+        monkeypatch.setattr(settings.chatbot, "llm_tokens_per_second", 1.0)
+        cache = AnswerCache(ttl=60, max_entries=10)
+        chatbot = ChatbotManager(llm_manager=CountingLLMManager(), answer_cache=cache)
+        
+        chatbot.process_user_message("a", "What is NLP?")
+        chatbot.close()
+        
+        assert chatbot.conversations["a"].metadata["degradations"] == ["llm_max_tokens"]
+        assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,6 +2,53 @@
 
 import pytest
 from src.entity import Entity, ExtractionResult, get_entity_extractor
+from src.entity.extractor import (
+    DummyEntityExtractor,
+    HybridEntityExtractor,
+    RegexEntityExtractor,
+    TransformerEntityExtractor,
+)
+from src.utils.exceptions import BatchProcessingError
+
+
+class FakeNERPipeline:
+    """Aggregated NER pipeline stand-in that tags capitalized words."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, texts, batch_size=None):
+        self.calls.append((list(texts), batch_size))
+        outputs = []
+        for text in texts:
+            spans, offset = [], 0
+            for word in text.split():
+                start = text.index(word, offset)
+                offset = start + len(word)
+                if word[0].isupper():
+                    score = 0.3 if word.startswith("Low") else 0.9
+                    spans.append({
+                        "entity_group": "PER", "word": word.lower(),
+                        "start": start, "end": offset, "score": score,
+                    })
+            outputs.append(spans)
+        return outputs
+
+
+class FakeTransformerEntityExtractor(TransformerEntityExtractor):
+    """Transformer extractor backed by FakeNERPipeline."""
+    
+    def _load_model(self):
+        self.model = FakeNERPipeline()
+
+
+class FailingEntityExtractor(DummyEntityExtractor):
+    """Dummy extractor that fails on 'boom'."""
+    
+    def _extract(self, text):
+        if "boom" in text:
+            raise RuntimeError("model failure")
+        return super()._extract(text)
 
 
 class TestEntity:
@@ -43,5 +90,208 @@ class TestDummyEntityExtractor:
         assert all(isinstance(r, ExtractionResult) for r in results)
 
 
+class TestBatchExtract:
+    """Test length-bucketed batch extraction."""
+    
+    def test_buckets_and_offsets(self):
+        """Test inputs are batched by length and spans map back per input."""
+        pytest.importorskip("numpy")
+        extractor = FakeTransformerEntityExtractor()
+        texts = ["a much longer sentence about Ada Lovelace", "hi Bob", "met Carol and Lowscore"]
+        
+        results = extractor.batch_extract(texts, batch_size=2)
+        
+        assert extractor.model.calls == [
+            (["hi Bob", "met Carol and Lowscore"], 2),
+            (["a much longer sentence about Ada Lovelace"], 1),
+        ]
+        assert [[e.text for e in r.entities] for r in results] == [
+            ["Ada", "Lovelace"], ["Bob"], ["Carol"],
+        ]
+        ada = results[0].entities[0]
+        assert texts[0][ada.start:ada.end] == "Ada"
+    
+    def test_per_item_errors(self):
+        """Test one failing input does not fail the batch."""
+        extractor = FailingEntityExtractor()
+        
+        with pytest.raises(BatchProcessingError) as excinfo:
+            extractor.batch_extract(["John is here", "", "boom", "Mary too"])
+        
+        error = excinfo.value
+        assert sorted(error.errors) == [1, 2]
+        assert error.results[0].entities[0].text == "John"
+        assert error.results[3].entities[0].text == "Mary"
+
+
+class TestLongDocuments:
+    """Test sliding-window extraction over long documents."""
+    
+    DOCUMENT = " ".join(["John met Mary in New York ."] * 600)
+    
+    def spans(self, entities):
+        return [(e.label, e.start, e.end) for e in entities]
+    
+    def test_beyond_validation_limit(self):
+        """Test documents longer than the per-text limit are fully covered."""
+        extractor = get_entity_extractor("dummy")
+        result = extractor.extract_document(self.DOCUMENT, window_tokens=50, overlap_tokens=10)
+        entities = result.entities
+        
+        assert len(self.DOCUMENT) > 10000
+        assert len(entities) == 1800
+        assert all(self.DOCUMENT[e.start:e.end].lower() == e.text.lower() for e in entities)
+    
+    def test_overlaps_deduplicated_and_cut_spans_merged(self):
+        """Test tiny windows give the same spans as one large window."""
+        extractor = get_entity_extractor("dummy")
+        expected = self.spans(extractor.stream_entities(self.DOCUMENT, window_tokens=100000))
+        
+        for window, overlap in [(7, 3), (2, 1), (5, 2)]:
+            found = self.spans(extractor.stream_entities(
+                self.DOCUMENT, window_tokens=window, overlap_tokens=overlap, batch_size=4,
+            ))
+            assert found == expected
+    
+    def test_merged_text_matches_document(self):
+        """Test entity text is the document text at the offsets, even when cut by windows."""
+        class PaddedSpanExtractor(DummyEntityExtractor):
+            """Spans include the preceding space but the text is stripped."""
+            
+            def _extract(self, text):
+                return ExtractionResult(text, [
+                    Entity(e.text, e.label, max(e.start - 1, 0), e.end, e.confidence)
+                    for e in super()._extract(text).entities
+                ])
+        
+        extractor = PaddedSpanExtractor()
+        document = self.DOCUMENT[:2000]
+        
+        for window, overlap in [(2, 1), (3, 1), (5, 2)]:
+            entities = list(extractor.stream_entities(
+                document, window_tokens=window, overlap_tokens=overlap,
+            ))
+            assert entities
+            assert all(e.text == document[e.start:e.end] for e in entities)
+    
+    def test_zero_overlap_aligned_windows(self):
+        """Test windows without overlap when the text fills them exactly."""
+        extractor = get_entity_extractor("dummy")
+        
+        entities = list(extractor.stream_entities("john x x x", window_tokens=3, overlap_tokens=0))
+        chunked = list(extractor.stream_entities(
+            iter(["john x ", "x x ", "mary y"]), window_tokens=3, overlap_tokens=0,
+        ))
+        
+        assert self.spans(entities) == [("PERSON", 0, 4)]
+        assert self.spans(chunked) == [("PERSON", 0, 4), ("PERSON", 11, 15)]
+        assert extractor.extract_document("john x x x", window_tokens=3, overlap_tokens=0).entities
+    
+    def test_streams_chunked_input(self):
+        """Test an iterable of small pieces gives document offsets."""
+        extractor = get_entity_extractor("dummy")
+        pieces = (self.DOCUMENT[i:i + 5] for i in range(0, 2000, 5))
+        
+        entities = list(extractor.stream_entities(pieces, window_tokens=6, overlap_tokens=2))
+        
+        assert entities[2].text == "New York"
+        last = entities[-1]
+        assert self.DOCUMENT[last.start:last.end].lower() == last.text.lower()
+
+
+class TestStructuredEntities:
+    """Test regex pre-extraction and merging with a model."""
+    
+    def found(self, result):
+        return [(e.label, e.text) for e in result.entities]
+    
+    def test_english_patterns(self):
+        """Test each structured type with document offsets."""
+        extractor = RegexEntityExtractor(locale="en-US")
+        text = (
+            "Mail bob@example.com, pay $1,200.50 by March 5th, 2024 at 3:30 pm "
+            "for 5 kg. See www.example.com."
+        )
+        
+        result = extractor.extract(text)
+        
+        assert self.found(result) == [
+            ("EMAIL", "bob@example.com"),
+            ("MONEY", "$1,200.50"),
+            ("DATE", "March 5th, 2024"),
+            ("TIME", "3:30 pm"),
+            ("QUANTITY", "5 kg"),
+            ("URL", "www.example.com"),
+        ]
+        assert all(text[e.start:e.end] == e.text for e in result.entities)
+    
+    def test_locales(self):
+        """Test French and German number, date and time formats."""
+        french = RegexEntityExtractor(locale="fr").extract("Le 5 mars 2024 à 14h30 : 1 234,56 €")
+        german = RegexEntityExtractor(locale="de").extract("Am 5. März um 14:30 Uhr: 1.234,56 EUR")
+        
+        assert self.found(french) == [
+            ("DATE", "5 mars 2024"), ("TIME", "14h30"), ("MONEY", "1 234,56 €"),
+        ]
+        assert self.found(german) == [
+            ("DATE", "5. März"), ("TIME", "14:30 Uhr"), ("MONEY", "1.234,56 EUR"),
+        ]
+    
+    @pytest.mark.parametrize("locale", ["en", "de"])
+    @pytest.mark.parametrize("text", [
+        "Upgrade to version 1.2.10 now",
+        "Tag v2.10.12 is out",
+        "Host 10.12.1.2 is down",
+        "Build 3/4/5/6 failed",
+        "Invalid 31/31/2024 and 2024-13-01",
+    ])
+    def test_version_strings_are_not_dates(self, locale, text):
+        """Test dotted and slashed number sequences are not dates or times."""
+        extractor = RegexEntityExtractor(locale=locale, labels=["DATE", "TIME"])
+        assert extractor.extract(text).entities == []
+    
+    def test_numeric_dates(self):
+        """Test slashed, dashed, dotted and ISO dates still match."""
+        extractor = RegexEntityExtractor(locale="en", labels=["DATE"])
+        result = extractor.extract("On 12/05/24, 5-3-2024, 05.01.2024 and 2024-01-02")
+        assert [e.text for e in result.entities] == [
+            "12/05/24", "5-3-2024", "05.01.2024", "2024-01-02",
+        ]
+    
+    def test_merged_with_model(self):
+        """Test model and pattern spans are merged without overlaps."""
+        extractor = HybridEntityExtractor(DummyEntityExtractor(), labels=["PERSON", "GPE", "DATE"])
+        
+        result = extractor.extract("John flies to Paris on 2024-05-01 at 10:00")
+        
+        assert self.found(result) == [("PERSON", "John"), ("GPE", "Paris"), ("DATE", "2024-05-01")]
+    
+    def test_model_limited_to_requested_unstructured_labels(self):
+        """Test model spans with unrequested or structured labels are dropped."""
+        class FakeModel(DummyEntityExtractor):
+            def _extract(self, text):
+                return ExtractionResult(text, [
+                    Entity("John", "PERSON", 0, 4, 0.9),
+                    Entity("Acme", "ORG", 14, 18, 0.9),
+                    Entity("on 2024-05-01", "DATE", 19, 32, 0.99),
+                ])
+        
+        extractor = HybridEntityExtractor(FakeModel(), labels=["PERSON", "DATE"])
+        
+        result = extractor.extract("John works at Acme on 2024-05-01")
+        
+        assert self.found(result) == [("PERSON", "John"), ("DATE", "2024-05-01")]
+    
+    def test_structured_only_skips_model(self):
+        """Test the model is not used when only structured types are requested."""
+        model = FailingEntityExtractor()
+        extractor = HybridEntityExtractor(model, labels=["MONEY", "DATE"])
+        
+        result = extractor.extract("boom: John owes 30 dollars since yesterday")
+        
+        assert extractor.model is None
+        assert self.found(result) == [("MONEY", "30 dollars"), ("DATE", "yesterday")]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
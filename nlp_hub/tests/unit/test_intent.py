@@ -2,6 +2,34 @@
 
 import pytest
 from src.intent import Intent, get_intent_classifier
+from src.intent.classifier import (
+    CascadeIntentClassifier,
+    DummyIntentClassifier,
+    EmbeddingIntentClassifier,
+    TransformerIntentClassifier,
+)
+from src.preprocessing import KeywordMatcher
+from src.utils.exceptions import BatchProcessingError
+from src.utils.metrics import metrics
+
+
+class RecordingIntentClassifier(DummyIntentClassifier):
+    """Dummy classifier that records model batches."""
+    
+    def _load_model(self):
+        super()._load_model()
+        self.batches = []
+    
+    def _predict_batch(self, texts):
+        self.batches.append(list(texts))
+        if any("boom" in text for text in texts):
+            raise RuntimeError("model failure")
+        return super()._predict_batch(texts)
+    
+    def _predict(self, text):
+        if "boom" in text:
+            raise RuntimeError("model failure")
+        return super()._predict(text)
 
 
 class TestIntent:
@@ -49,5 +77,310 @@ class TestDummyIntentClassifier:
         assert all(isinstance(r, Intent) for r in results)
 
 
+
+class TestBatchClassify:
+    """Test batched intent classification."""
+    
+    def test_batches_sorted_by_length(self):
+        """Test texts are batched by length and returned in input order."""
+        classifier = RecordingIntentClassifier()
+        texts = ["Please could you summarize the document", "Hello", "What time?", "Hey"]
+        
+        intents = classifier.batch_classify(texts, batch_size=2)
+        
+        assert classifier.batches == [["Hey", "Hello"], ["What time?", texts[0]]]
+        assert [i.name for i in intents] == ["request", "greeting", "question", "greeting"]
+    
+    def test_per_item_errors(self):
+        """Test failing items do not fail the rest of the batch."""
+        classifier = RecordingIntentClassifier()
+        
+        with pytest.raises(BatchProcessingError) as exc_info:
+            classifier.batch_classify(["Hello", "", "boom", "Hey there"], batch_size=4)
+        
+        error = exc_info.value
+        assert set(error.errors) == {1, 2}
+        assert error.results[0].name == "greeting"
+        assert error.results[3].name == "greeting"
+        assert error.results[1] is None and error.results[2] is None
+
+
+
+class BagOfWordsEncoder:
+    """Tiny stand-in for a sentence encoder."""
+    
+    VOCAB = ["hello", "hi", "what", "how", "please", "send"]
+    
+    def encode(self, texts, normalize_embeddings=True):
+        import numpy as np
+        
+        vectors = np.array(
+            [
+                [float(word in text.lower().split()) for word in self.VOCAB] + [0.01]
+                for text in texts
+            ]
+        )
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class FakeEmbeddingIntentClassifier(EmbeddingIntentClassifier):
+    """Embedding classifier with a bag-of-words encoder."""
+    
+    def _load_encoder(self):
+        return BagOfWordsEncoder()
+
+
+class TestEmbeddingIntentClassifier:
+    """Test centroid-based intent classification."""
+    
+    def test_classify_by_centroid(self):
+        """Test messages are assigned to the nearest intent centroid."""
+        pytest.importorskip("numpy")
+        classifier = FakeEmbeddingIntentClassifier(examples={
+            "greeting": ["hello", "hi there"],
+            "question": ["what is it", "how does it work"],
+            "request": ["please send it"],
+        })
+        
+        intents = classifier.batch_classify(["hello friend", "how are you", "please send"])
+        
+        assert [i.name for i in intents] == ["greeting", "question", "request"]
+        assert all(0.0 <= i.confidence <= 1.0 for i in intents)
+        assert classifier.get_supported_intents() == ["greeting", "question", "request"]
+
+
+class TestIntentCache:
+    """Test the prediction cache in the base class."""
+    
+    def test_normalized_hits(self):
+        """Test case and whitespace variants share one prediction."""
+        metrics.reset()
+        classifier = RecordingIntentClassifier()
+        
+        first = classifier.classify("Hello  there")
+        second = classifier.classify("hello there ")
+        second.metadata["touched"] = True
+        
+        assert first.name == second.name == "greeting"
+        assert classifier.cache_hits == 1 and classifier.cache_misses == 1
+        assert "touched" not in classifier.classify("HELLO THERE").metadata
+        rate = metrics.gauge("intent_cache_hit_rate", classifier="RecordingIntentClassifier")
+        assert rate.value == pytest.approx(2 / 3)
+    
+    def test_nested_metadata_not_shared(self):
+        """Test mutating nested metadata of a result does not leak into later hits."""
+        classifier = RecordingIntentClassifier()
+        classifier.classify("hello")
+        classifier._cache["hello"].metadata["all_scores"] = {"greeting": 1.0}
+        
+        classifier.classify("hello").metadata["all_scores"]["greeting"] = 0.0
+        intents = classifier.batch_classify(["hello", "Hello"])
+        intents[0].metadata["all_scores"]["greeting"] = 0.0
+        
+        assert intents[1].metadata["all_scores"] == {"greeting": 1.0}
+        assert classifier.classify("hello").metadata["all_scores"] == {"greeting": 1.0}
+    
+    def test_fingerprint_computed_once(self, monkeypatch):
+        """Test lookups reuse the fingerprint until the model is replaced."""
+        classifier = RecordingIntentClassifier()
+        calls = []
+        original = classifier._fingerprint
+        monkeypatch.setattr(classifier, "_fingerprint", lambda: calls.append(1) or original())
+        
+        classifier.classify("hi")
+        classifier.batch_classify(["hi", "yes"])
+        assert calls == []
+        
+        classifier.model = KeywordMatcher({"greeting": ["hi"]})
+        classifier.classify("hi")
+        assert calls == [1]
+    
+    def test_batch_uses_cache_and_dedupes(self):
+        """Test cached and repeated texts are not sent to the model."""
+        classifier = RecordingIntentClassifier()
+        classifier.classify("thanks")
+        
+        intents = classifier.batch_classify(["Thanks", "yes", "YES", "why?"])
+        
+        assert classifier.batches == [["yes", "why?"]]
+        assert [i.name for i in intents] == ["statement", "statement", "statement", "question"]
+    
+    def test_invalidated_when_labels_change(self):
+        """Test replacing the model or labels drops cached predictions."""
+        classifier = RecordingIntentClassifier()
+        assert classifier.classify("hola").name == "statement"
+        
+        classifier.model = KeywordMatcher({"greeting": ["hola"]})
+        
+        assert classifier.classify("hola").name == "greeting"
+        assert classifier.cache_hits == 0
+    
+    def test_disabled(self, monkeypatch):
+        """Test a zero cache size disables caching."""
+        from src.config.settings import settings
+        
+        monkeypatch.setattr(settings.intent, "cache_size", 0)
+        classifier = RecordingIntentClassifier()
+        classifier.batch_classify(["hi"])
+        classifier.batch_classify(["hi"])
+        
+        assert classifier.batches == [["hi"], ["hi"]]
+        assert classifier.cache_hits == 0 and len(classifier._cache) == 0
+
+
+class TestCascadeIntentClassifier:
+    """Test first-stage acceptance and escalation."""
+    
+    def test_escalates_only_low_confidence(self):
+        """Test unsure messages go to the second stage in one batch."""
+        metrics.reset()
+        second = RecordingIntentClassifier()
+        cascade = CascadeIntentClassifier(DummyIntentClassifier(), second, threshold=0.5)
+        
+        intents = cascade.batch_classify(["Hello", "I like trains", "Why now?", "Nice day"])
+        
+        assert second.batches == [["Nice day", "I like trains"]]
+        stages = [i.metadata["cascade_stage"] for i in intents]
+        assert stages == ["first", "second", "first", "second"]
+        assert intents[1].metadata["first_stage"]["name"] == "statement"
+        assert cascade.escalation_rate == 0.5
+        assert metrics.gauge("intent_cascade_escalation_rate").value == 0.5
+        assert metrics.counter("intent_cascade_total", stage="second").value == 2
+    
+    def test_single_classify(self):
+        """Test classify uses the first stage when it is confident."""
+        second = RecordingIntentClassifier()
+        cascade = CascadeIntentClassifier(DummyIntentClassifier(), second)
+        
+        assert cascade.classify("Hello there").name == "greeting"
+        assert second.batches == []
+    
+    def test_rejects_cascade_first_stage(self, monkeypatch):
+        """Test a cascade cannot nest itself as its first stage."""
+        from src.config.settings import settings
+        from src.utils.exceptions import ConfigurationError
+        
+        monkeypatch.setattr(settings.intent, "cascade_first_stage", "cascade")
+        with pytest.raises(ConfigurationError):
+            CascadeIntentClassifier(second_stage=RecordingIntentClassifier())
+
+
+class TestLinearIntentClassifier:
+    """Test the trainable hashed n-gram model."""
+    
+    TRAINING = {
+        "greeting": ["hello", "hi there", "good morning", "hey friend"],
+        "question": ["what is this", "how does it work", "why is it late", "what time is it"],
+        "command": ["cancel my order", "stop the timer", "delete my account", "turn off alerts"],
+    }
+    
+    def train(self):
+        from src.intent.linear import LinearIntentModel
+        
+        texts = [t for examples in self.TRAINING.values() for t in examples]
+        labels = [name for name, examples in self.TRAINING.items() for _ in examples]
+        return LinearIntentModel.train(texts, labels, n_features=2 ** 12, epochs=30)
+    
+    def test_train_save_and_serve(self, tmp_path):
+        """Test a trained artifact round-trips and classifies in batches."""
+        pytest.importorskip("numpy")
+        from src.intent.linear import LinearIntentClassifier
+        
+        path = tmp_path / "intent.npz"
+        self.train().save(path)
+        classifier = LinearIntentClassifier(str(path))
+        
+        intents = classifier.batch_classify(["hello there", "how is it", "cancel the timer"])
+        
+        assert [i.name for i in intents] == ["greeting", "question", "command"]
+        assert classifier.get_supported_intents() == ["command", "greeting", "question"]
+        assert sum(intents[0].metadata["all_scores"].values()) == pytest.approx(1.0)
+    
+    def test_load_training_data(self, tmp_path):
+        """Test CSV and JSONL training files."""
+        pytest.importorskip("numpy")
+        from src.intent.linear import load_training_data
+        from src.utils.exceptions import ConfigurationError
+        
+        csv_path = tmp_path / "data.csv"
+        csv_path.write_text('text,intent\n"hi, you",greeting\n')
+        jsonl_path = tmp_path / "data.jsonl"
+        jsonl_path.write_text('{"text": "stop", "intent": "command"}\n\n')
+        
+        assert load_training_data(csv_path) == (["hi, you"], ["greeting"])
+        assert load_training_data(jsonl_path) == (["stop"], ["command"])
+        with pytest.raises(ConfigurationError):
+            load_training_data(tmp_path / "missing.csv")
+    
+    def test_missing_artifact(self, tmp_path):
+        """Test a missing artifact raises ModelNotFoundError."""
+        pytest.importorskip("numpy")
+        from src.intent.linear import LinearIntentClassifier
+        from src.utils.exceptions import ModelNotFoundError
+        
+        with pytest.raises(ModelNotFoundError):
+            LinearIntentClassifier(str(tmp_path / "missing.npz"))
+
+
+class WordTokenizer:
+    """Whitespace tokenizer with BERT-style pair layout."""
+    
+    model_max_length = 16
+    
+    def encode(self, text, add_special_tokens=False):
+        return [len(word) for word in text.split()]
+    
+    def num_special_tokens_to_add(self, pair=False):
+        return 3
+    
+    def build_inputs_with_special_tokens(self, first, second):
+        return [101] + first + [102] + second + [102]
+    
+    def create_token_type_ids_from_sequences(self, first, second):
+        return [0] * (len(first) + 2) + [1] * (len(second) + 1)
+
+
+class FakeNLIClassifier(TransformerIntentClassifier):
+    """Zero-shot classifier with a fake tokenizer and no model."""
+    
+    def _load_model(self):
+        self.tokenizer = WordTokenizer()
+        self.entailment_id = 2
+        self.contradiction_id = 0
+        self._prepare_hypotheses(["greeting", "question"])
+
+
+class TestTransformerIntentClassifier:
+    """Test zero-shot input construction and scoring."""
+    
+    def test_pairs_reuse_pretokenized_hypotheses(self):
+        """Test each text is paired with every cached hypothesis."""
+        classifier = FakeNLIClassifier()
+        input_ids, token_type_ids = classifier._build_pairs(["hi there", "why"])
+        
+        assert len(input_ids) == 4
+        assert input_ids[0] == [101, 2, 5, 102] + classifier.hypothesis_ids[0] + [102]
+        assert input_ids[3] == [101, 3, 102] + classifier.hypothesis_ids[1] + [102]
+        assert all(len(ids) == len(types) for ids, types in zip(input_ids, token_type_ids))
+    
+    def test_premise_truncated_to_fit(self):
+        """Test long premises leave room for the hypothesis."""
+        classifier = FakeNLIClassifier()
+        input_ids, _ = classifier._build_pairs(["a " * 50])
+        assert max(len(ids) for ids in input_ids) <= WordTokenizer.model_max_length
+    
+    def test_single_and_multi_label_scores(self, monkeypatch):
+        """Test softmax across labels vs. independent per-label scores."""
+        from src.config.settings import settings
+        
+        classifier = FakeNLIClassifier()
+        logits = [[[0.0, 0.0, 3.0], [0.0, 0.0, 3.0]]]
+        
+        assert classifier._scores(logits)[0] == pytest.approx([0.5, 0.5])
+        monkeypatch.setattr(settings.intent, "multi_label", True)
+        multi = classifier._scores(logits)[0]
+        assert multi[0] == multi[1] and multi[0] > 0.9
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""Unit tests for compiled keyword matching."""
+
+import pytest
+from src.entity import get_entity_extractor
+from src.preprocessing import KeywordMatcher, load_keyword_rules
+from src.utils.exceptions import ConfigurationError
+
+
+class TestKeywordMatcher:
+    """Test the Aho-Corasick matcher."""
+    
+    def test_finds_all_matches_with_offsets(self):
+        """Test overlapping keywords are all reported with offsets."""
+        matcher = KeywordMatcher({"GPE": ["new york", "york"], "ORG": ["new york times"]})
+        text = "I read the New York Times"
+        
+        matches = matcher.find_all(text)
+        
+        assert [(m.label, text[m.start:m.end]) for m in matches] == [
+            ("ORG", "New York Times"),
+            ("GPE", "New York"),
+            ("GPE", "York"),
+        ]
+    
+    def test_longest_non_overlapping(self):
+        """Test non-overlapping mode keeps the leftmost longest match."""
+        matcher = KeywordMatcher({"GPE": ["new york", "york"], "ORG": ["new york times"]})
+        matches = matcher.find_all("New York Times and York", overlapping=False)
+        assert [(m.label, m.start) for m in matches] == [("ORG", 0), ("GPE", 19)]
+    
+    def test_word_boundaries(self):
+        """Test word keywords do not match inside words; punctuation does."""
+        matcher = KeywordMatcher({"greeting": ["hi"], "question": ["?"]})
+        assert matcher.labels_found("What is this?") == ["question"]
+        assert matcher.labels_found("hi, anyone?") == ["greeting", "question"]
+    
+    def test_large_gazetteer(self):
+        """Test many shared-prefix terms compile and match."""
+        matcher = KeywordMatcher({"TERM": [f"term{i}" for i in range(20000)]})
+        assert len(matcher) == 20000
+        assert [m.keyword for m in matcher.find_all("see term123 and term19999")] == [
+            "term123", "term19999",
+        ]
+    
+    def test_load_rules(self, tmp_path):
+        """Test rules files are validated."""
+        path = tmp_path / "rules.json"
+        path.write_text('{"PERSON": ["ada"]}')
+        assert load_keyword_rules(str(path)) == {"PERSON": ["ada"]}
+        assert load_keyword_rules("", {"X": ["y"]}) == {"X": ["y"]}
+        
+        path.write_text('{"PERSON": "ada"}')
+        with pytest.raises(ConfigurationError):
+            load_keyword_rules(str(path))
+
+
+class TestDummyEntityGazetteer:
+    """Test the dummy extractor on the compiled gazetteer."""
+    
+    def test_every_occurrence_with_source_text(self):
+        """Test repeated entities are all found with their original casing."""
+        extractor = get_entity_extractor("dummy")
+        result = extractor.extract("John met Mary; John left for New York")
+        
+        assert [(e.text, e.start) for e in result.entities] == [
+            ("John", 0), ("Mary", 9), ("John", 15), ("New York", 29),
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
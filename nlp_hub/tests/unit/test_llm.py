@@ -0,0 +1,371 @@
+"""Unit tests for LLM integration."""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+import pytest
+from src.config.settings import LLMConfig
+from src.llm import Message, LLMResponse, RoutingLLMManager, get_llm_manager
+from src.llm.manager import AnthropicLLMManager, DummyLLMManager
+from src.llm.scheduler import LLMScheduler, TokenBucket
+from src.llm.mock_server import MockLLMProfile, MockLLMServer
+from src.utils.exceptions import LLMError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class StandInLLMManager(DummyLLMManager):
+    """Local stand-in backend with simulated latency and failures."""
+    
+    def __init__(self, name: str, clock: FakeClock, latency: float, fail: bool = False):
+        self.clock = clock
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        super().__init__(model_name=name)
+    
+    def _call(self, messages, **kwargs) -> LLMResponse:
+        self.calls += 1
+        self.clock.now += self.latency
+        if self.fail:
+            raise RuntimeError(f"{self.model_name} unavailable")
+        return LLMResponse(content=f"from {self.model_name}", model=self.model_name)
+
+
+MESSAGES = [Message(role="user", content="Hello")]
+
+
+class TestDummyLLMManager:
+    """Test dummy LLM manager."""
+    
+    def test_chat(self):
+        """Test chat returns a response."""
+        manager = get_llm_manager("dummy")
+        response = manager.chat(MESSAGES)
+        assert isinstance(response, LLMResponse)
+        assert "Hello" in response.content
+
+
+class TestAnthropicLLMManager:
+    """Test Anthropic request formatting."""
+    
+    def test_system_prompt_uses_system_parameter(self):
+        """Test system messages are sent as the system parameter, not dropped."""
+        requests = []
+        
+        class FakeMessages:
+            def create(self, **kwargs):
+                requests.append(kwargs)
+                return SimpleNamespace(
+                    content=[SimpleNamespace(text="hi")],
+                    usage=SimpleNamespace(output_tokens=1),
+                )
+        
+        class FakeAnthropicLLMManager(AnthropicLLMManager):
+            def _load_model(self):
+                self.client = SimpleNamespace(messages=FakeMessages())
+        
+        manager = FakeAnthropicLLMManager("claude")
+        manager.chat([Message(role="system", content="Be brief.")] + MESSAGES)
+        manager.chat(MESSAGES)
+        
+        assert requests[0]["system"] == "Be brief."
+        assert requests[0]["messages"] == [{"role": "user", "content": "Hello"}]
+        assert "system" not in requests[1]
+
+
+class TestRoutingLLMManager:
+    """Test latency-aware routing."""
+    
+    def test_routes_to_fastest_backend(self):
+        """Test that most traffic goes to the lowest-latency backend."""
+        clock = FakeClock()
+        fast = StandInLLMManager("fast", clock, latency=0.1)
+        slow = StandInLLMManager("slow", clock, latency=2.0)
+        router = RoutingLLMManager({"slow": slow, "fast": fast}, clock=clock, rng=random.Random(0))
+        
+        for _ in range(200):
+            router.chat(MESSAGES)
+        
+        # Both are probed, then traffic splits 1/0.1 : 1/2.0 (about 5% stays on slow)
+        assert 2 <= slow.calls <= 20
+        assert fast.calls == 200 - slow.calls
+        assert router.get_backend_stats()["fast"]["ewma_latency"] == pytest.approx(0.1)
+    
+    def test_weight_shifts_traffic(self):
+        """Test traffic is split in proportion to weight over latency."""
+        clock = FakeClock()
+        a = StandInLLMManager("a", clock, latency=0.1)
+        b = StandInLLMManager("b", clock, latency=0.15)
+        router = RoutingLLMManager(
+            {"a": a, "b": b}, weights={"b": 2.0}, clock=clock, rng=random.Random(0)
+        )
+        
+        for _ in range(1000):
+            router.chat(MESSAGES)
+        
+        # 2 / 0.15 : 1 / 0.1 puts 4/7 of the traffic on b
+        assert b.calls / 1000 == pytest.approx(4 / 7, abs=0.05)
+    
+    def test_failover_and_circuit_breaker(self):
+        """Test failover to a healthy backend and circuit recovery."""
+        clock = FakeClock()
+        broken = StandInLLMManager("broken", clock, latency=0.01, fail=True)
+        healthy = StandInLLMManager("healthy", clock, latency=0.5)
+        router = RoutingLLMManager(
+            {"broken": broken, "healthy": healthy},
+            failure_threshold=1,
+            recovery_timeout=10.0,
+            clock=clock,
+            rng=random.Random(0),
+        )
+        
+        response = router.chat(MESSAGES)
+        assert response.metadata["backend"] == "healthy"
+        assert router.get_backend_stats()["broken"]["circuit_state"] == "open"
+        
+        router.chat(MESSAGES)
+        assert broken.calls == 1
+        
+        # After the recovery timeout a single probe is let through
+        clock.now += 10.0
+        broken.fail = False
+        router.chat(MESSAGES)
+        assert broken.calls == 2
+        assert router.get_backend_stats()["broken"]["circuit_state"] == "closed"
+    
+    def test_failover_shares_the_timeout(self):
+        """Test a failover backend only gets what is left of the timeout."""
+        clock = FakeClock()
+        timeouts = []
+        
+        class TimedStandIn(StandInLLMManager):
+            def _call(self, messages, **kwargs):
+                timeouts.append(kwargs["timeout"])
+                return super()._call(messages, **kwargs)
+        
+        def make_router():
+            return RoutingLLMManager(
+                [TimedStandIn("a", clock, latency=3.0, fail=True), TimedStandIn("b", clock, 1.0)],
+                clock=clock,
+            )
+        
+        make_router().chat(MESSAGES, timeout=10.0)
+        assert timeouts == [10.0, pytest.approx(7.0)]
+        
+        # Nothing is left for a failover once the first backend used the whole timeout
+        with pytest.raises(LLMError):
+            make_router().chat(MESSAGES, timeout=3.0)
+        assert len(timeouts) == 3
+    
+    def test_rate_limit_rejection_is_not_a_backend_failure(self):
+        """Test local rate-limit rejections fail over without tripping the circuit."""
+        clock = FakeClock()
+        limited = StandInLLMManager("limited", clock, latency=0.1)
+        limited.scheduler = LLMScheduler(requests_per_minute=1, tokens_per_minute=0)
+        limited.scheduler.acquire(1)
+        other = StandInLLMManager("other", clock, latency=0.5)
+        router = RoutingLLMManager([limited, other], failure_threshold=1, clock=clock)
+        
+        response = router.chat(MESSAGES, timeout=0.05)
+        
+        assert response.metadata["backend"] == "other"
+        stats = router.get_backend_stats()["limited"]
+        assert stats["circuit_state"] == "closed"
+        assert stats["total_failures"] == 0
+    
+    def test_all_backends_failing(self):
+        """Test error when every backend fails."""
+        clock = FakeClock()
+        router = RoutingLLMManager(
+            [StandInLLMManager("x", clock, latency=0.1, fail=True)],
+            clock=clock,
+        )
+        with pytest.raises(LLMError):
+            router.chat(MESSAGES)
+    
+    def test_per_provider_credentials(self):
+        """Test each provider gets its own key and endpoint, falling back to the shared ones."""
+        config = LLMConfig(
+            api_key="shared-key",
+            base_url="",
+            provider_api_keys={"openai": "", "anthropic": "anthropic-key"},
+            provider_base_urls={"openai": "http://openai.local", "anthropic": ""},
+        )
+        assert config.credentials("openai") == ("shared-key", "http://openai.local")
+        assert config.credentials("anthropic") == ("anthropic-key", "")
+
+
+
+class TestLLMScheduler:
+    """Test client-side rate limiting and priority scheduling."""
+    
+    def test_token_bucket_refill(self):
+        """Test bucket waits for refill once exhausted."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_minute=60, capacity=2, clock=clock)
+        bucket.consume(2)
+        assert bucket.time_until(1) == pytest.approx(1.0)
+        clock.now += 1.0
+        assert bucket.time_until(1) == 0.0
+    
+    def test_interactive_served_before_batch(self):
+        """Test waiting interactive calls jump ahead of queued batch calls."""
+        scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=0)
+        scheduler.request_bucket = TokenBucket(rate_per_minute=600, capacity=1)
+        scheduler.request_bucket.consume(1)
+        order = []
+        
+        def call(priority, name):
+            scheduler.acquire(1, priority=priority, client_id=name)
+            order.append(name)
+        
+        threads = [threading.Thread(target=call, args=("batch", "batch-1"))]
+        threads[0].start()
+        time.sleep(0.02)
+        threads.append(threading.Thread(target=call, args=("interactive", "chat")))
+        threads[1].start()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert order == ["chat", "batch-1"]
+    
+    def test_bounded_queue(self):
+        """Test calls are rejected when the queue is full."""
+        scheduler = LLMScheduler(requests_per_minute=1, tokens_per_minute=0, max_queue_size=1)
+        scheduler.acquire(1)
+        errors = []
+        
+        def wait_for_slot():
+            try:
+                scheduler.acquire(1, timeout=0.2)
+            except LLMError as e:
+                errors.append(e)
+        
+        waiter = threading.Thread(target=wait_for_slot)
+        waiter.start()
+        time.sleep(0.05)
+        with pytest.raises(LLMError):
+            scheduler.acquire(1)
+        waiter.join()
+        assert len(errors) == 1
+        assert scheduler.queue_size == 0
+    
+    def test_manager_uses_scheduler(self):
+        """Test LLM calls pass through the scheduler."""
+        scheduler = LLMScheduler(requests_per_minute=60, tokens_per_minute=0)
+        manager = DummyLLMManager(scheduler=scheduler)
+        manager.chat(MESSAGES, priority="batch")
+        assert scheduler.request_bucket.tokens == pytest.approx(59, abs=0.1)
+    
+    def test_queue_wait_bounded_by_call_timeout(self):
+        """Test a rate-limited call gives up at its timeout instead of queueing past it."""
+        scheduler = LLMScheduler(requests_per_minute=1, tokens_per_minute=0)
+        manager = DummyLLMManager(scheduler=scheduler)
+        manager.chat(MESSAGES)
+        
+        start = time.monotonic()
+        with pytest.raises(LLMError, match="rate limit"):
+            manager.chat(MESSAGES, timeout=0.1)
+        assert time.monotonic() - start < 1
+    
+    def test_failed_call_refunds_tokens(self):
+        """Test tokens reserved for a failed call are given back."""
+        scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=6000)
+        manager = StandInLLMManager("broken", FakeClock(), latency=0, fail=True)
+        manager.scheduler = scheduler
+        
+        with pytest.raises(LLMError):
+            manager.chat(MESSAGES, max_tokens=100)
+        assert scheduler.token_bucket.tokens == pytest.approx(6000, abs=1)
+
+
+
+def post_json(url: str, payload: dict):
+    """POST JSON and return (status, raw body)."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+class TestMockLLMServer:
+    """Test the local mock LLM server."""
+    
+    PAYLOAD = {"model": "mock", "max_tokens": 5, "messages": [{"role": "user", "content": "Hi"}]}
+    
+    def test_openai_and_anthropic_endpoints(self):
+        """Test both chat APIs return well-formed completions."""
+        profile = MockLLMProfile(time_to_first_token=0.0, tokens_per_second=0)
+        with MockLLMServer(profile) as server:
+            status, body = post_json(f"{server.url}/v1/chat/completions", self.PAYLOAD)
+            assert status == 200
+            completion = json.loads(body)
+            assert completion["usage"]["completion_tokens"] == 5
+            assert completion["choices"][0]["message"]["content"]
+            
+            status, body = post_json(f"{server.url}/v1/messages", self.PAYLOAD)
+            assert status == 200
+            message = json.loads(body)
+            assert message["type"] == "message"
+            assert message["usage"]["output_tokens"] == 5
+    
+    def test_streaming_respects_time_to_first_token(self):
+        """Test streaming emits one delta per token after the TTFT delay."""
+        profile = MockLLMProfile(time_to_first_token=0.1, tokens_per_second=1000)
+        with MockLLMServer(profile) as server:
+            start = time.monotonic()
+            status, body = post_json(
+                f"{server.url}/v1/chat/completions",
+                {**self.PAYLOAD, "stream": True},
+            )
+            elapsed = time.monotonic() - start
+        
+        events = [line[len("data: "):] for line in body.splitlines() if line.startswith("data: ")]
+        deltas = [
+            json.loads(event)["choices"][0]["delta"].get("content")
+            for event in events[:-1]
+        ]
+        assert status == 200
+        assert events[-1] == "[DONE]"
+        assert len([d for d in deltas if d]) == 5
+        assert elapsed >= 0.1
+    
+    def test_error_rate_and_concurrency_limit(self):
+        """Test simulated errors and concurrency rejections."""
+        with MockLLMServer(MockLLMProfile(time_to_first_token=0.0, error_rate=1.0)) as server:
+            status, _ = post_json(f"{server.url}/v1/messages", self.PAYLOAD)
+            assert status == 500
+        
+        profile = MockLLMProfile(time_to_first_token=0.3, tokens_per_second=0, max_concurrency=1)
+        with MockLLMServer(profile) as server:
+            url = f"{server.url}/v1/chat/completions"
+            slow = threading.Thread(target=post_json, args=(url, self.PAYLOAD))
+            slow.start()
+            time.sleep(0.1)
+            status, _ = post_json(url, self.PAYLOAD)
+            slow.join()
+            assert status == 429
+            assert server.stats["rejected"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""Unit tests for chatbot prompt assembly."""
+
+import pytest
+from src.chatbot import PromptBuilder, get_tokenizer
+from src.chatbot.prompt import ApproximateTokenizer
+from src.chatbot.templates import get_system_prompt_template
+from src.llm import Message
+from src.rag import RetrievalResult
+
+
+def make_history(num_messages: int, length: int = 40):
+    """Alternating user/assistant history ending with a user turn."""
+    roles = ["user", "assistant"]
+    return [
+        Message(role=roles[(num_messages - 1 - i) % 2], content=f"m{i} " + "x" * length)
+        for i in range(num_messages)
+    ]
+
+
+class TestApproximateTokenizer:
+    """Test approximate tokenizer."""
+    
+    def test_count_and_truncate(self):
+        """Test counting and word-boundary truncation."""
+        tokenizer = get_tokenizer("approximate")
+        assert tokenizer.count_tokens("abcdefgh") == 2
+        truncated = tokenizer.truncate("one two three four five six", 2)
+        assert truncated == "one two"
+        assert tokenizer.count_tokens(truncated) <= 2
+
+
+class TestPromptBuilder:
+    """Test token-budgeted prompt assembly."""
+    
+    def test_everything_fits(self):
+        """Test all parts are kept when under budget."""
+        builder = PromptBuilder(ApproximateTokenizer(), token_budget=1000, max_history_messages=10)
+        history = make_history(3)
+        docs = [RetrievalResult(content="doc one", source="a", score=0.9)]
+        
+        result = builder.build("system", history, docs, turn_notes="The user's intent is: question")
+        
+        assert [m.role for m in result.messages] == ["system", "user", "assistant", "user"]
+        assert result.messages[0].content == "system"
+        latest = result.messages[-1].content
+        assert latest.index("intent is: question") < latest.index("Source: a\ndoc one")
+        assert latest.endswith(history[-1].content)
+        assert result.dropped == {"rag": 0, "history": 0}
+        assert result.total_tokens <= 1000
+    
+    def test_per_turn_context_follows_history(self):
+        """Test the system message and history are unchanged by per-turn context."""
+        builder = PromptBuilder(ApproximateTokenizer(), token_budget=1000, max_history_messages=10)
+        history = make_history(3)
+        
+        first = builder.build(
+            "system", history, [RetrievalResult(content="doc one", source="a", score=0.9)],
+            turn_notes="The user's intent is: greeting",
+        )
+        second = builder.build(
+            "system", history, [RetrievalResult(content="doc two", source="b", score=0.8)],
+            turn_notes="The user's intent is: question",
+        )
+        
+        stable = [Message(role="system", content="system")] + history[:-1]
+        assert first.messages[:-1] == second.messages[:-1] == stable
+        assert first.messages[-1] != second.messages[-1]
+    
+    def test_drops_oldest_history_first(self):
+        """Test older history is dropped before RAG and the latest turn."""
+        builder = PromptBuilder(ApproximateTokenizer(), token_budget=60, max_history_messages=10)
+        history = make_history(5)
+        
+        result = builder.build("system", history)
+        
+        assert result.messages[-1] == history[-1]
+        assert result.messages[1:-1] == history[-3:-1]
+        assert result.dropped["history"] == 2
+        assert result.total_tokens <= 60
+    
+    def test_truncates_then_drops_rag_chunks(self):
+        """Test lower-ranked RAG chunks are truncated or dropped deterministically."""
+        builder = PromptBuilder(ApproximateTokenizer(), token_budget=120, min_chunk_tokens=8)
+        docs = [
+            RetrievalResult(content="word " * 40, source=f"doc{i}", score=0.9)
+            for i in range(3)
+        ]
+        
+        first = builder.build("system", make_history(1), docs)
+        second = builder.build("system", make_history(1), docs)
+        
+        assert first.messages == second.messages
+        assert "Source: doc0" in first.messages[-1].content
+        assert "Source: doc2" not in first.messages[-1].content
+        assert first.dropped["rag"] >= 1
+        assert first.total_tokens <= 120
+    
+    def test_context_window_limits_history(self):
+        """Test the number of older history messages is capped."""
+        builder = PromptBuilder(ApproximateTokenizer(), token_budget=10000, max_history_messages=2)
+        result = builder.build("system", make_history(6))
+        assert len(result.messages) == 4
+        assert result.dropped["history"] == 3
+
+
+
+class TestSystemPromptTemplate:
+    """Test precompiled system prompt templates."""
+    
+    def test_stable_prefix_across_turns(self):
+        """Test the summary never changes the prompt prefix and turn notes stay out of it."""
+        template = get_system_prompt_template("friendly")
+        first = template.render()
+        second = template.render(summary="Talked about Paris")
+        
+        prefix = template.stable_prefix_length
+        assert first == second[:prefix] == template.stable_prefix
+        assert "friendly" in template.stable_prefix
+        assert second.endswith("Talked about Paris")
+        
+        notes = template.render_turn_notes("greeting", {"PERSON": "John"})
+        assert notes == "The user's intent is: greeting\nExtracted entities: {'PERSON': 'John'}"
+        assert template.render_turn_notes() == ""
+    
+    def test_unknown_personality(self):
+        """Test unknown personalities fall back to professional."""
+        template = get_system_prompt_template("pirate")
+        assert template == get_system_prompt_template("professional")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
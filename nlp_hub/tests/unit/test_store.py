@@ -0,0 +1,252 @@
+"""Unit tests for conversation stores."""
+
+import threading
+import pytest
+from src.chatbot import ChatbotManager, ChatContext, ChatMessage
+from src.chatbot.store import (
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+    TieredConversationStore,
+    get_conversation_store,
+)
+from src.utils.metrics import metrics
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_store(clock=None, **kwargs):
+    options = {"max_conversations": 0, "max_bytes": 0, "idle_ttl": 0, "sweep_interval": 60}
+    options.update(kwargs)
+    return InMemoryConversationStore(clock=clock or FakeClock(), **options)
+
+
+class TestInMemoryConversationStore:
+    """Test bounded in-memory store."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched conversation is evicted at capacity."""
+        evicted = []
+        store = make_store(max_conversations=2, on_evict=evicted.append)
+        store["a"] = ChatContext("a")
+        store["b"] = ChatContext("b")
+        store["a"]  # touch
+        store["c"] = ChatContext("c")
+        
+        assert set(store) == {"a", "c"}
+        assert evicted == ["b"]
+    
+    def test_idle_ttl_expiry(self):
+        """Test idle conversations expire lazily and on sweep."""
+        clock = FakeClock()
+        store = make_store(clock, idle_ttl=10)
+        store["a"] = ChatContext("a")
+        store["b"] = ChatContext("b")
+        
+        clock.now = 5
+        store["a"]
+        clock.now = 12
+        assert "b" not in store
+        assert store.get("a") is not None
+        
+        clock.now = 30
+        assert store.sweep() == 1
+        assert len(store) == 0
+    
+    def test_max_bytes(self):
+        """Test size accounting is refreshed on save and enforced."""
+        store = make_store(max_bytes=4000)
+        first = ChatContext("first")
+        store["first"] = first
+        first.add_message(ChatMessage(role="user", content="x" * 3000))
+        store.save("first", first)
+        assert store.total_bytes > 3000
+        
+        store["second"] = ChatContext("second")
+        store.save("second", store["second"])
+        second = store["second"]
+        second.add_message(ChatMessage(role="user", content="y" * 1000))
+        store.save("second", second)
+        
+        assert list(store) == ["second"]
+        assert store.total_bytes < 4000
+    
+    def test_unknown_store_type(self):
+        """Test unknown store type raises."""
+        with pytest.raises(ValueError):
+            get_conversation_store("unknown")
+    
+    def test_drop_in_for_manager(self):
+        """Test the manager creates and evicts conversations through the store."""
+        chatbot = ChatbotManager(conversation_store=make_store(max_conversations=1))
+        chatbot.process_user_message("one", "Hello", use_rag=False)
+        chatbot.process_user_message("two", "Hello again", use_rag=False)
+        chatbot.close()
+        
+        assert chatbot.get_conversation_history("one") == []
+        assert len(chatbot.get_conversation_history("two")) == 2
+
+
+class TestSQLiteConversationStore:
+    """Test the shared SQLite store."""
+    
+    def test_context_round_trip(self):
+        """Test contexts survive serialization."""
+        context = ChatContext("c1", intent="question", entities={"PERSON": "John"})
+        context.add_message(ChatMessage(role="user", content="Hi", metadata={"k": 1}))
+        context.summary = "Earlier chat"
+        
+        restored = ChatContext.from_dict(context.to_dict())
+        assert restored == context
+    
+    def test_workers_share_state(self, tmp_path):
+        """Test a write from one worker is seen by another."""
+        path = tmp_path / "conversations.db"
+        worker_a = SQLiteConversationStore(path, flush_interval=0)
+        worker_b = SQLiteConversationStore(path, flush_interval=0)
+        
+        context = ChatContext("c1")
+        context.add_message(ChatMessage(role="user", content="first"))
+        worker_a["c1"] = context
+        assert [m.content for m in worker_b["c1"].messages] == ["first"]
+        
+        # B's cached copy is refreshed when A writes a newer version
+        context.add_message(ChatMessage(role="assistant", content="second"))
+        worker_a.save("c1", context)
+        assert [m.content for m in worker_b["c1"].messages] == ["first", "second"]
+        
+        del worker_b["c1"]
+        assert "c1" not in worker_a
+        worker_a.close()
+        worker_b.close()
+    
+    def test_group_commit(self, tmp_path):
+        """Test concurrent saves are committed in shared transactions."""
+        metrics.reset()
+        store = SQLiteConversationStore(tmp_path / "conversations.db", flush_interval=0.05)
+        threads = [
+            threading.Thread(target=store.save, args=(f"c{i}", ChatContext(f"c{i}")))
+            for i in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(store) == 10
+        assert metrics.counter("chatbot_store_commits_total").value < 10
+        store.close()
+    
+    def test_read_during_commit_sees_latest_write(self, tmp_path):
+        """Test a read while the writer is committing returns the new context."""
+        store = SQLiteConversationStore(
+            tmp_path / "conversations.db", flush_interval=0, synchronous=False
+        )
+        context = ChatContext("c1")
+        context.add_message(ChatMessage(role="user", content="first"))
+        store.save("c1", context)
+        store.flush()
+        
+        committing, release = threading.Event(), threading.Event()
+        commit = store._commit
+        
+        def paused_commit(pending, batch):
+            committing.set()
+            release.wait(5)
+            commit(pending, batch)
+        
+        store._commit = paused_commit
+        newer = ChatContext("c1")
+        newer.add_message(ChatMessage(role="user", content="first"))
+        newer.add_message(ChatMessage(role="assistant", content="second"))
+        store.save("c1", newer)
+        
+        # The writer has taken the write off the queue but not stored its version
+        assert committing.wait(5)
+        assert len(store["c1"].messages) == 2
+        release.set()
+        store.flush()
+        assert len(store["c1"].messages) == 2
+        store.close()
+    
+    def test_managers_share_conversations(self, tmp_path):
+        """Test consecutive turns can land on different managers."""
+        path = tmp_path / "conversations.db"
+        first = ChatbotManager(conversation_store=SQLiteConversationStore(path))
+        second = ChatbotManager(conversation_store=SQLiteConversationStore(path))
+        
+        first.process_user_message("conv", "Hello", use_rag=False)
+        second.process_user_message("conv", "Hello again", use_rag=False)
+        history = first.get_conversation_history("conv")
+        first.close()
+        second.close()
+        
+        assert [m.content for m in history if m.role == "user"] == ["Hello", "Hello again"]
+
+
+class TestTieredConversationStore:
+    """Test idle compression and spill-to-disk."""
+    
+    def make_context(self, conversation_id):
+        context = ChatContext(conversation_id)
+        context.add_message(ChatMessage(role="user", content="hello " * 50))
+        return context
+    
+    def test_idle_conversations_are_compressed(self, tmp_path):
+        """Test idle conversations move to the warm tier and rehydrate."""
+        clock = FakeClock()
+        store = TieredConversationStore(
+            hot_idle=10, warm_max_bytes=0, sweep_interval=1,
+            spill_path=tmp_path / "spill.db", clock=clock,
+        )
+        store["a"] = self.make_context("a")
+        store["b"] = self.make_context("b")
+        
+        clock.now = 5
+        store["b"]
+        clock.now = 12
+        assert store.sweep() == 1
+        assert store.stats()["hot"] == 1 and store.stats()["warm"] == 1
+        assert store.stats()["warm_bytes"] < 300
+        
+        restored = store["a"]
+        assert restored.messages[0].content == "hello " * 50
+        assert store.stats()["warm"] == 0
+        assert len(store) == 2
+    
+    def test_spill_to_disk(self, tmp_path):
+        """Test the warm tier spills to disk past its byte budget."""
+        store = TieredConversationStore(
+            max_conversations=1, hot_idle=0, warm_max_bytes=1,
+            spill_path=tmp_path / "spill.db",
+        )
+        for conversation_id in ("a", "b", "c"):
+            store[conversation_id] = self.make_context(conversation_id)
+        
+        assert store.stats() == {
+            "hot": 1, "warm": 0, "warm_bytes": 0, "cold": 2, "compression": "zlib",
+        }
+        assert set(store) == {"a", "b", "c"}
+        assert store["a"].conversation_id == "a"
+        
+        del store["b"]
+        assert "b" not in store
+        assert len(store) == 2
+        store.close()
+    
+    def test_factory_accepts_manager_options(self, tmp_path):
+        """Test the factory builds a tiered store from the options the manager passes."""
+        store = get_conversation_store(
+            "tiered", on_evict=lambda conversation_id: None, spill_path=tmp_path / "spill.db",
+        )
+        assert isinstance(store, TieredConversationStore)
+        store.close()
+        with pytest.raises(TypeError):
+            TieredConversationStore(on_evict=lambda conversation_id: None)
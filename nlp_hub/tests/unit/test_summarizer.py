@@ -0,0 +1,62 @@
+"""Unit tests for rolling conversation summarization."""
+
+import pytest
+from src.chatbot import ChatbotManager
+from src.chatbot.summarizer import ConversationSummarizer
+from src.llm import LLMResponse
+from src.llm.manager import DummyLLMManager
+
+
+class RecordingLLMManager(DummyLLMManager):
+    """Dummy LLM that records prompts and writes fixed summaries."""
+    
+    def __init__(self):
+        self.chat_prompts = []
+        super().__init__()
+    
+    def _call(self, messages, **kwargs) -> LLMResponse:
+        if kwargs.get("priority") == "batch":
+            return LLMResponse(content="SUMMARY", model="dummy-model")
+        self.chat_prompts.append(messages)
+        return super()._call(messages, **kwargs)
+
+
+class TestConversationSummarizer:
+    """Test summarization of older turns."""
+    
+    def test_compacts_older_turns(self):
+        """Test older turns are replaced by a running summary."""
+        llm = RecordingLLMManager()
+        summarizer = ConversationSummarizer(llm, trigger_tokens=20, keep_recent=2)
+        chatbot = ChatbotManager(llm_manager=llm, summarizer=summarizer)
+        conv_id = chatbot.create_conversation()
+        
+        chatbot.process_user_message(conv_id, "Tell me about the first topic", use_rag=False)
+        chatbot.process_user_message(conv_id, "Now tell me about another topic", use_rag=False)
+        pending = summarizer._pending[conv_id][0]
+        pending.result(timeout=5)
+        
+        chatbot.process_user_message(conv_id, "And a third one", use_rag=False)
+        context = chatbot.conversations[conv_id]
+        
+        assert context.summary == "SUMMARY"
+        assert len(context.messages) == 4
+        assert "SUMMARY" in llm.chat_prompts[-1][0].content
+        summarizer.shutdown()
+    
+    def test_below_threshold_does_nothing(self):
+        """Test short conversations are not summarized."""
+        llm = RecordingLLMManager()
+        summarizer = ConversationSummarizer(llm, trigger_tokens=10000, keep_recent=2)
+        chatbot = ChatbotManager(llm_manager=llm, summarizer=summarizer)
+        conv_id = chatbot.create_conversation()
+        
+        chatbot.process_user_message(conv_id, "Hello!", use_rag=False)
+        
+        assert conv_id not in summarizer._pending
+        assert chatbot.conversations[conv_id].summary is None
+        summarizer.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])